@@ -0,0 +1,82 @@
+# Architecture-diagram registry for the DNN sweep
+#   The 21875 models of the hp grid have only a few distinct layer layouts
+#   (get_dir_hp_dnn_*.py); plot_model (pydot + graphviz) is run ONCE per
+#   layout and the diagrams are kept in a registry folder, e.g.,
+#	1_InvDNNModel_ss_th/Architectures/117-50-20-1/Full-Fwd-DNN-Model-a.png
+#   Model folders get symbolic links to the diagrams of their layout
+#   (a small text file with the registry path if links are not supported)
+#   Layouts are keyed by the units of the layers (117 -> neurons -> 1);
+#   LeakyReLU alpha and dropout rate do not change the diagrams
+#
+# Usage (inside get_trained_models):
+#	arch_files = get_arch_diagrams(fwd_model, path_models + "Architectures/", [117] + neurons + [1])
+#	link_arch_diagrams(path_fl_sav, arch_files)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import tensorflow as tf
+
+_arch_cache = {} #{layout key: {diagram name: path}} of this process
+
+#======================================================;
+#  Function-1: Registry key of a layout (layer units)  ;
+#======================================================;
+def get_arch_key(layer_units):
+
+    return "-".join([str(int(units)) for units in layer_units]) #e.g., '117-50-20-1'
+
+#=====================================================================;
+#  Function-2: Diagrams of a layout (rendered if not registered)      ;
+#              (a --> show_shapes = True, b --> show_shapes = False)  ;
+#=====================================================================;
+def get_arch_diagrams(model, path_registry, layer_units):
+
+    #----------------------------------------------------------;
+    #  Atomic write (temporary file + rename); concurrent      ;
+    #  workers may render a new layout twice but never leave   ;
+    #  a partial file. Missing pydot/graphviz --> no diagrams  ;
+    #----------------------------------------------------------;
+    arch_key = get_arch_key(layer_units)
+    if arch_key in _arch_cache:
+        return _arch_cache[arch_key]
+    #
+    path_arch  = path_registry + arch_key + "/"
+    os.makedirs(path_arch, exist_ok = True)
+    arch_files = {}
+    #
+    for fl_name, show_shapes in [("Full-Fwd-DNN-Model-a.png", True), \
+                                    ("Full-Fwd-DNN-Model-b.png", False)]:
+        if not os.path.exists(path_arch + fl_name):
+            tmp_name = path_arch + str(os.getpid()) + "_" + fl_name #Same extension (png)
+            try:
+                tf.keras.utils.plot_model(model, tmp_name, show_shapes = show_shapes)
+            except Exception as error: #pydot/graphviz not installed
+                print('No architecture diagram: ' + arch_key, error)
+            if os.path.exists(tmp_name):
+                os.replace(tmp_name, path_arch + fl_name)
+        if os.path.exists(path_arch + fl_name):
+            arch_files[fl_name] = path_arch + fl_name
+    #
+    _arch_cache[arch_key] = arch_files #Also when empty (no retries in this process)
+
+    return arch_files
+
+#=================================================================;
+#  Function-3: Link the diagrams of a layout from a model folder  ;
+#=================================================================;
+def link_arch_diagrams(path_fl_sav, arch_files):
+
+    #-----------------------------------------------------------;
+    #  Relative symbolic links (registry and model folders can  ;
+    #  be moved together); text file if links are not allowed   ;
+    #-----------------------------------------------------------;
+    for fl_name, fl_arch in arch_files.items():
+        fl_link = path_fl_sav + fl_name
+        if os.path.lexists(fl_link):
+            continue
+        try:
+            os.symlink(os.path.relpath(fl_arch, path_fl_sav), fl_link)
+        except OSError:
+            with open(fl_link[:-4] + ".txt", 'w') as fl_id:
+                fl_id.write(fl_arch + "\n")
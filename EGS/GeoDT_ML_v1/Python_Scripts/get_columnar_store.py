@@ -0,0 +1,100 @@
+# Binary columnar store for GeoDT data (memory-mappable *.npy column groups)
+#   Raw GeoDT csv data is parsed ONCE (get_inp_out.py) and each column group
+#   (params/npv/hpro/pout) is saved as a typed, C-contiguous *.npy block
+#   Downstream scripts read column groups with np.load(mmap_mode = 'r'),
+#   i.e., no text parsing
+#
+# Store layout (e.g., Data/Columnar_Data/):
+#	params.npy --> (4078, 117) and params.json --> 117 column names
+#	npv.npy    --> (4078, 1)   and npv.json    --> 1 column name
+#	hpro.npy   --> (4078, 40)  and hpro.json   --> 40 column names (time-steps)
+#	pout.npy   --> (4078, 40)  and pout.json   --> 40 column names (time-steps)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import json
+import pandas as pd
+import numpy as np
+
+#============================================================;
+#  Function-1: Save a column group (*.npy and column names)  ;
+#============================================================;
+def save_column_group(path_store, name, x_data, column_names, dtype = np.float64):
+
+    #-----------------------------------------------------------;
+    #  Write to temporary files and rename (safe for readers),  ;
+    #  *.npy is renamed last, so it marks a complete group      ;
+    #-----------------------------------------------------------;
+    if not os.path.exists(path_store): #Create if they dont exist
+        os.makedirs(path_store, exist_ok = True)
+    #
+    x_data   = np.ascontiguousarray(np.asarray(x_data, dtype = dtype))
+    if x_data.ndim == 1:
+        x_data = x_data.reshape(-1, 1) #e.g., npv (4078, 1)
+    #
+    tmp_name = path_store + name + ".json." + str(os.getpid()) + ".tmp"
+    with open(tmp_name, 'w') as fl_id:
+        json.dump({'columns': [str(col) for col in column_names], \
+                   'shape': list(x_data.shape), \
+                   'dtype': x_data.dtype.str}, fl_id, indent = 1)
+    os.replace(tmp_name, path_store + name + ".json")
+    #
+    tmp_name = path_store + name + ".npy." + str(os.getpid()) + ".tmp"
+    with open(tmp_name, 'wb') as fl_id:
+        np.save(fl_id, x_data)
+    os.replace(tmp_name, path_store + name + ".npy")
+
+#==================================================================;
+#  Function-2: Save column groups of a raw GeoDT dataframe         ;
+#              (column_groups = {name: list of column positions})  ;
+#==================================================================;
+def save_column_groups(path_store, df, column_groups):
+
+    #------------------------------------------;
+    #  One *.npy block per named column group  ;
+    #------------------------------------------;
+    for name, col_ids in column_groups.items():
+        df_group = df.iloc[:,list(col_ids)] #Always a dataframe (num_realz, num_cols)
+        save_column_group(path_store, name, df_group.values, df_group.columns.to_list())
+
+#=================================================;
+#  Function-3: Check if a column group is stored  ;
+#=================================================;
+def is_column_group(path_store, name):
+
+    return os.path.exists(path_store + name + ".npy") and \
+            os.path.exists(path_store + name + ".json")
+
+#=============================================================;
+#  Function-4: Load a column group (memory-mapped, no parse)  ;
+#=============================================================;
+def load_column_group(path_store, name, mmap_mode = 'r'):
+
+    #-------------------------------------------;
+    #  Values (memory-mapped) and column names  ;
+    #-------------------------------------------;
+    if not is_column_group(path_store, name):
+        raise FileNotFoundError(path_store + name + '.npy not found (run get_inp_out.py)')
+    #
+    with open(path_store + name + ".json", 'r') as fl_id:
+        column_names = json.load(fl_id)['columns']
+    #
+    x_data = np.load(path_store + name + ".npy", mmap_mode = mmap_mode)
+
+    return x_data, column_names
+
+#=================================================================;
+#  Function-5: Load a column group, converting a *.csv file once  ;
+#              (for csv data not ingested by get_inp_out.py)      ;
+#=================================================================;
+def load_csv_column_group(path_store, name, csv_name, mmap_mode = 'r'):
+
+    #------------------------------------------------------;
+    #  Parse the *.csv only if column group is not stored  ;
+    #------------------------------------------------------;
+    if not is_column_group(path_store, name):
+        df = pd.read_csv(csv_name, index_col = 0)
+        save_column_group(path_store, name, df.values, df.columns.to_list())
+
+    return load_column_group(path_store, name, mmap_mode = mmap_mode)
@@ -0,0 +1,217 @@
+# Process-level dataset cache for DNN training (get_trained_models)
+#   Pre-processing models (*.sav), GeoDT params names (columnar store), and
+#   train/val/test data (split views, get_split_views.py) are loaded ONCE per MPI rank or pool worker
+#   and handed to every model trained on that process as read-only arrays
+#   Outliers are removed with the persisted non-outlier masks (get_outlier_mask.py)
+#
+# Cache key:
+#   (path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test)
+#
+# Shared dataset (one copy per node):
+#   The runner publishes the arrays ONCE as *.npy files in a node-local
+#   memory-backed folder (/dev/shm/GeoDT_dataset_<hash of cache key>/); workers
+#   then memory-map them read-only (zero-copy; page cache shared by all workers)
+#   instead of loading their own copy. Without a published copy, the dataset is
+#   loaded from the Data/ folder as before
+#   Dataset.pkl holds a source stamp (format version, mtime and size of the
+#   Data/ files it was made from); a copy left by an older run or older data
+#   (e.g., a crashed sweep) is not attached, the dataset is loaded instead
+#	path_shared = publish_shared_dataset(path, "ss", "npv_", 4078, 3278, 400, 400)
+#	... pool/ranks call get_cached_dataset(path, "ss", "npv_", 4078, 3278, 400, 400) ...
+#	remove_shared_dataset(path_shared)
+#
+# Usage (inside get_trained_models):
+#   from get_dataset_cache import get_cached_dataset
+#   dataset = get_cached_dataset(path, "ss", "npv_", 4078, 3278, 400, 400)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import shutil
+import pickle
+import hashlib
+import tempfile
+import numpy as np
+#
+from get_outlier_mask import load_outlier_mask
+from get_columnar_store import load_csv_column_group
+from get_split_views import load_split_views
+
+_dataset_cache = {} #Process-level cache (one entry per scaler/target/split sizes)
+_shared_format = 1 #Version of the shared copy layout (part of the source stamp)
+_shared_root   = '/dev/shm/' if os.path.isdir('/dev/shm') else tempfile.gettempdir() + '/' #Node-local (memory-backed)
+
+#=====================================================;
+#  Function-1: Make a numpy array read-only (shared)  ;
+#=====================================================;
+def get_read_only(x):
+
+    #-------------------------------------------------------;
+    #  Models sharing the cache must not modify the arrays  ;
+    #-------------------------------------------------------;
+    x.flags.writeable = False
+
+    return x
+
+#==========================================================;
+#  Function-2: Load pre-processed data (all realizations)  ;
+#==========================================================;
+def load_dataset(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test):
+
+    #-------------------------------------;
+    #  Paths for data and pre-processors  ;
+    #-------------------------------------;
+    path_geodt     = path + 'Data/' #GeoDT data
+    path_ind       = path + 'Data/Train_Val_Test_Indices/' #Train/Val/Test indices (and non-outlier masks)
+    path_pp_models = path + 'Data/PreProcess_Models/' #Pre-processing models for standardization
+    path_pp_data   = path + 'Data/PreProcessed_Data/' #Pre-processed data
+    path_store     = path + 'Data/Columnar_Data/' #Binary columnar store (get_inp_out.py)
+    #
+    p_name         = path_pp_models + "p_" + sclr_name + "_" + str(num_train) + ".sav" #GeoDT-params pre-processor
+    q_name         = path_pp_models + geodt_out + sclr_name + "_" + str(num_train) + ".sav" #q-data pre-processor
+
+    #--------------------------------------------------;
+    #  Pre-processing models and GeoDT params (names)  ;
+    #--------------------------------------------------;
+    with open(p_name, 'rb') as fl_id:
+        pp_scalar = pickle.load(fl_id) #Load already created GeoDT pre-processing model
+    with open(q_name, 'rb') as fl_id:
+        qq_scalar = pickle.load(fl_id) #Load already created q-data pre-processing model
+    #
+    _, p_list      = load_csv_column_group(path_store, 'params', \
+                        path_geodt + 'geodt_params.csv') #117 GeoDT params (column names only)
+
+    #------------------------------------------------------------;
+    #  Train/val/test split views -- One of the 7-preprocessors  ;
+    #  (only non-outlier data, row order of each split is kept)  ;
+    #------------------------------------------------------------;
+    dataset = {'pp_scalar': pp_scalar, \
+               'qq_scalar': qq_scalar, \
+               'p_list': p_list}
+    #
+    q_views = load_split_views(path_pp_data + sclr_name + "_" + geodt_out + str(num_realz) + ".npy", \
+                                num_realz, num_train, num_val, num_test) #q-data memmap views, e.g., (4078, 1)
+    p_views = load_split_views(path_pp_data + sclr_name + "_p_" + str(num_realz) + ".npy", \
+                                num_realz, num_train, num_val, num_test) #p-data memmap views, e.g., (4078, 117)
+    #
+    for split_name, num_split in zip(['train', 'val', 'test'], [num_train, num_val, num_test]):
+        mask = load_outlier_mask(path_ind, split_name, sclr_name, geodt_out, \
+                                num_split, q_views[split_name]) #Non-outlier mask (NPV > -1)
+        #
+        dataset[split_name + '_mask'] = get_read_only(mask) #(num_split,)
+        dataset[split_name + '_q']    = get_read_only(q_views[split_name][mask,:]) #e.g., train (3264, 1)
+        dataset[split_name + '_p']    = get_read_only(p_views[split_name][mask,:]) #e.g., train (3264, 117)
+
+    return dataset
+
+#============================================================;
+#  Function-3: Get cached dataset (loaded once per process)  ;
+#============================================================;
+def get_cached_dataset(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test):
+
+    #-------------------------------------------;
+    #  Load only on the first call per process  ;
+    #-------------------------------------------;
+    key         = (path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test)
+    path_shared = get_shared_path(*key)
+    #
+    if key not in _dataset_cache and os.path.exists(path_shared + "Dataset.pkl"): #Published copy (this node)
+        _dataset_cache[key] = load_shared_dataset(path_shared, get_source_stamp(*key)) #None if stale
+    if _dataset_cache.get(key) is None:
+        _dataset_cache[key] = load_dataset(path, sclr_name, geodt_out, \
+                                            num_realz, num_train, num_val, num_test)
+
+    return _dataset_cache[key]
+
+#=========================================================;
+#  Function-4: Folder of the shared dataset (node-local)  ;
+#              (one folder per cache key)                 ;
+#=========================================================;
+def get_shared_path(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test):
+
+    key = (path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test)
+
+    return _shared_root + "GeoDT_dataset_" + hashlib.md5(repr(key).encode()).hexdigest()[0:12] + "/"
+
+#====================================================================;
+#  Function-5: Source stamp of a dataset (format version and         ;
+#              [mtime_ns, size] of each Data/ file it is made from)  ;
+#====================================================================;
+def get_source_stamp(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test):
+
+    path_pp_models = path + 'Data/PreProcess_Models/'
+    path_pp_data   = path + 'Data/PreProcessed_Data/'
+    fl_list        = [path_pp_models + "p_" + sclr_name + "_" + str(num_train) + ".sav", \
+                      path_pp_models + geodt_out + sclr_name + "_" + str(num_train) + ".sav", \
+                      path_pp_data + sclr_name + "_" + geodt_out + str(num_realz) + ".npy", \
+                      path_pp_data + sclr_name + "_p_" + str(num_realz) + ".npy", \
+                      path + 'Data/geodt_params.csv']
+    fl_stats       = {fl_name: os.stat(fl_name) for fl_name in fl_list if os.path.exists(fl_name)}
+
+    return {'format': _shared_format, \
+            'files': {fl_name: [st.st_mtime_ns, st.st_size] for fl_name, st in fl_stats.items()}}
+
+#===============================================================;
+#  Function-6: Publish the dataset once per node (*.npy files)  ;
+#              (arrays first; Dataset.pkl last = complete)      ;
+#===============================================================;
+def publish_shared_dataset(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test):
+
+    #----------------------------------------------------------;
+    #  Loaded from Data/ (not cached in the publishing rank);  ;
+    #  an older copy of the same key is replaced               ;
+    #----------------------------------------------------------;
+    path_shared = get_shared_path(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test)
+    stamp       = get_source_stamp(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test)
+    dataset     = load_dataset(path, sclr_name, geodt_out, num_realz, num_train, num_val, num_test)
+    remove_shared_dataset(path_shared)
+    os.makedirs(path_shared, exist_ok = True)
+    #
+    others      = {}
+    for name, value in dataset.items():
+        if isinstance(value, np.ndarray):
+            tmp_name = path_shared + name + "." + str(os.getpid()) + ".tmp.npy"
+            np.save(tmp_name, np.ascontiguousarray(value))
+            os.replace(tmp_name, path_shared + name + ".npy")
+        else:
+            others[name] = value #Pre-processing models and GeoDT params names
+    #
+    others['array_names']  = [name for name in dataset.keys() if name not in others]
+    others['source_stamp'] = stamp #Taken before loading (a later change of Data/ --> stale)
+    tmp_name    = path_shared + "Dataset." + str(os.getpid()) + ".tmp"
+    with open(tmp_name, 'wb') as fl_id:
+        pickle.dump(others, fl_id)
+    os.replace(tmp_name, path_shared + "Dataset.pkl")
+    print('Shared dataset: ' + path_shared)
+
+    return path_shared
+
+#=================================================================;
+#  Function-7: Attach the shared dataset (read-only memmaps)      ;
+#              (source_stamp given and different --> None, i.e.,  ;
+#               stale copy; the caller loads from Data/)          ;
+#=================================================================;
+def load_shared_dataset(path_shared, source_stamp = None):
+
+    with open(path_shared + "Dataset.pkl", 'rb') as fl_id:
+        dataset = pickle.load(fl_id)
+    #
+    if source_stamp is not None and dataset.pop('source_stamp', None) != source_stamp:
+        print('Stale shared dataset (not attached): ' + path_shared)
+        return None
+    dataset.pop('source_stamp', None)
+    for name in dataset.pop('array_names'):
+        dataset[name] = np.load(path_shared + name + ".npy", mmap_mode = 'r') #Read-only (no copy)
+
+    return dataset
+
+#============================================================;
+#  Function-8: Remove the shared dataset (end of the sweep)  ;
+#============================================================;
+def remove_shared_dataset(path_shared):
+
+    #---------------------------------------------------------;
+    #  Workers that already attached keep their mapped pages  ;
+    #---------------------------------------------------------;
+    if path_shared is not None:
+        shutil.rmtree(path_shared, ignore_errors = True)
@@ -1,8 +1,9 @@
-# Create directories and hyperparameter input files for DNN-based forward models
+# Create the hyperparameter table for DNN-based forward models
 # (Create directories on TH)
-# Total number of DNN models trained = 21875
-#  Sanity check:
-#	https://stackoverflow.com/questions/14798220/how-can-i-search-sub-folders-using-glob-glob-module
+# Total number of DNN models trained = 21875 (or a random/LHS subsample)
+#  One table for all models (see get_hp_inputs.py):
+#	1_InvDNNModel_ss_th/HP_Table.npy --> one row per model (model_id = 1 to 21875)
+#  Model folders (i_model/) are created by the runners when outputs are written
 #
 # module load texlive
 # module load python/3.9-anaconda-2021.11
@@ -14,11 +15,13 @@
 # AUTHOR: Maruti Kumar Mudunuru
 
 import numpy as np
-import glob
 import os
 import time
 import subprocess
-import itertools
+
+from get_hp_inputs import save_hp_table, load_hp_table, get_hp
+from get_hp_grid import hp_grid_spec, get_block_sizes, get_block_offsets, \
+						iter_hp_grid, get_hp_subsample
 
 if __name__ == '__main__':
 
@@ -40,215 +43,48 @@ if __name__ == '__main__':
 	if not os.path.exists(dir_path): #Create if they dont exist
 		os.makedirs(dir_path)
 
-	num_dnn_folders = 21875
-	#
-	for i in range(1,num_dnn_folders+1):
-		dir_path    = path + "1_InvDNNModel_ss_th/" + str(i) + "_model/"
-		print(dir_path)
-		#
-		if not os.path.exists(dir_path): #Create if they dont exist
-			os.makedirs(dir_path)
-
-	#---------------------------------------------------------;
-	#  2a. Create hyperparameters (1-DNN-layer): 9375 models  ;
-	#---------------------------------------------------------;
-	num_models         = 9375 # 3*3125
-	num_layers         = 1 #number of hidden layers 
-	neurons_list       = [1000, 500, 250] #3
-	dropout_value_list = [0.0, 0.1, 0.2, 0.3, 0.4] #5
-	alpha_value_list   = [0.0, 0.1, 0.2, 0.3, 0.4] #5
-	lr_values_list     = [1e-6, 1e-5, 1e-4, 1e-3, 1e-2] #5
-	epochs_list        = [100, 200, 300, 400, 500] #5
-	batch_sizes_list   = [4, 8, 16, 32, 64] #5
-	#
-	counter      = 1
-	hp_1dnn_list = [] #9375
-	#
-	for neurons in neurons_list:
-		for dropout_value in dropout_value_list:
-			for alpha_value in alpha_value_list:
-				for lr_values in lr_values_list:
-					for epochs in epochs_list:
-						for batch_size in batch_sizes_list:
-							hp_1dnn_list.append([counter, \
-													num_layers, \
-													neurons, \
-													dropout_value, \
-													alpha_value, \
-													lr_values, \
-													epochs, \
-													batch_size])
-							print(counter)
-							counter = counter + 1
-
-	for i in range(0,num_models):
-		counter, num_layers, neurons, \
-		dropout_value, alpha_value, \
-		lr_values, epochs, batch_size = hp_1dnn_list[i]
-		#
-		path_fl_sav = path + "1_InvDNNModel_ss_th/" + str(counter) + "_model/hp_input_deck.txt"
-		print(path_fl_sav)
-		f = open(path_fl_sav,'w+')
-		f.write('num_layers    = ' + str(num_layers))
-		f.write('\n')
-		f.write('neurons       = ' + str(neurons))
-		f.write('\n')
-		f.write('dropout_value = ' + str(dropout_value))
-		f.write('\n')
-		f.write('alpha_value   = ' + str(alpha_value))
-		f.write('\n')
-		f.write('lr_values     = ' + str(lr_values))
-		f.write('\n')
-		f.write('epochs        = ' + str(epochs))
-		f.write('\n')
-		f.write('batch_size    = ' + str(batch_size))
-		f.close()
+	#------------------------------------------------------------------;
+	#  2a. Hyperparameter grid (1, 2, and 3-DNN-layers): 21875 models  ;
+	#      (declarative grid spec; see get_hp_grid.py)                 ;
+	#------------------------------------------------------------------;
+	grid_spec     = hp_grid_spec #9375 + 9375 + 3125
+	print(get_block_sizes(grid_spec), get_block_offsets(grid_spec)) #[9375, 9375, 3125] [1, 9376, 18751]
 
-	#---------------------------------------------------------;
-	#  2b. Create hyperparameters (2-DNN-layer): 9375 models  ;
-	#---------------------------------------------------------;
-	num_models         = 9375 # 3*3125
-	num_layers         = 2 #number of hidden layers 
-	neurons_list       = [[1000, 500], \
-							[1000, 250], \
-							[500, 250]] #3
-	dropout_value_list = [0.0, 0.1, 0.2, 0.3, 0.4] #5
-	alpha_value_list   = [0.0, 0.1, 0.2, 0.3, 0.4] #5
-	lr_values_list     = [1e-6, 1e-5, 1e-4, 1e-3, 1e-2] #5
-	epochs_list        = [100, 200, 300, 400, 500] #5
-	batch_sizes_list   = [4, 8, 16, 32, 64] #5
-	#
-	counter      = 9376
-	hp_2dnn_list = [] #9375
-	#
-	for neurons in neurons_list:
-		for dropout_value in dropout_value_list:
-			for alpha_value in alpha_value_list:
-				for lr_values in lr_values_list:
-					for epochs in epochs_list:
-						for batch_size in batch_sizes_list:
-							hp_2dnn_list.append([counter, \
-													num_layers, \
-													neurons, \
-													dropout_value, \
-													alpha_value, \
-													lr_values, \
-													epochs, \
-													batch_size])
-							print(counter)
-							counter = counter + 1
-
-	for i in range(0,num_models):
-		counter, num_layers, neurons, \
-		dropout_value, alpha_value, \
-		lr_values, epochs, batch_size = hp_2dnn_list[i]
-		#
-		path_fl_sav = path + "1_InvDNNModel_ss_th/" + str(counter) + "_model/hp_input_deck.txt"
-		print(path_fl_sav)
-		f = open(path_fl_sav,'w+')
-		f.write('num_layers    = ' + str(num_layers))
-		f.write('\n')
-		f.write('neurons       = ' + str(neurons[0]) + ', ' + str(neurons[1]))
-		f.write('\n')
-		f.write('dropout_value = ' + str(dropout_value))
-		f.write('\n')
-		f.write('alpha_value   = ' + str(alpha_value))
-		f.write('\n')
-		f.write('lr_values     = ' + str(lr_values))
-		f.write('\n')
-		f.write('epochs        = ' + str(epochs))
-		f.write('\n')
-		f.write('batch_size    = ' + str(batch_size))
-		f.close()
-
-	#---------------------------------------------------------;
-	#  2c. Create hyperparameters (3-DNN-layer): 3125 models  ;
-	#---------------------------------------------------------;
-	num_models         = 3125 # 3125
-	num_layers         = 3 #number of hidden layers 
-	neurons_list       = [[1000, 500, 250]] #1
-	dropout_value_list = [0.0, 0.1, 0.2, 0.3, 0.4] #5
-	alpha_value_list   = [0.0, 0.1, 0.2, 0.3, 0.4] #5
-	lr_values_list     = [1e-6, 1e-5, 1e-4, 1e-3, 1e-2] #5
-	epochs_list        = [100, 200, 300, 400, 500] #5
-	batch_sizes_list   = [4, 8, 16, 32, 64] #5
-	#
-	counter      = 18751
-	hp_3dnn_list = [] #3125
+	#-----------------------------------------------------------;
+	#  2b. All models or a subsample of the grid                ;
+	#      (e.g., num_subsample = 2000 when cluster time is     ;
+	#       tight; subsampled models keep their full-grid ids)  ;
+	#-----------------------------------------------------------;
+	num_subsample = None #None --> all 21875 models
+	subsample     = 'lhs' #'random' or 'lhs' (Latin-hypercube)
 	#
-	for neurons in neurons_list:
-		for dropout_value in dropout_value_list:
-			for alpha_value in alpha_value_list:
-				for lr_values in lr_values_list:
-					for epochs in epochs_list:
-						for batch_size in batch_sizes_list:
-							hp_3dnn_list.append([counter, \
-													num_layers, \
-													neurons, \
-													dropout_value, \
-													alpha_value, \
-													lr_values, \
-													epochs, \
-													batch_size])
-							print(counter)
-							counter = counter + 1
+	if num_subsample is None:
+		hp_list = list(iter_hp_grid(grid_spec)) #21875
+	else:
+		hp_list = get_hp_subsample(grid_spec, num_subsample, method = subsample, seed = 1337)
 
-	for i in range(0,num_models):
-		counter, num_layers, neurons, \
-		dropout_value, alpha_value, \
-		lr_values, epochs, batch_size = hp_3dnn_list[i]
-		#
-		path_fl_sav = path + "1_InvDNNModel_ss_th/" + str(counter) + "_model/hp_input_deck.txt"
-		print(path_fl_sav)
-		f = open(path_fl_sav,'w+')
-		f.write('num_layers    = ' + str(num_layers))
-		f.write('\n')
-		f.write('neurons       = ' + str(neurons[0]) + ', ' + str(neurons[1]) \
-									+ ', ' + str(neurons[2]))
-		f.write('\n')
-		f.write('dropout_value = ' + str(dropout_value))
-		f.write('\n')
-		f.write('alpha_value   = ' + str(alpha_value))
-		f.write('\n')
-		f.write('lr_values     = ' + str(lr_values))
-		f.write('\n')
-		f.write('epochs        = ' + str(epochs))
-		f.write('\n')
-		f.write('batch_size    = ' + str(batch_size))
-		f.close()
+	#-------------------------------------------------------------------;
+	#  2c. Save the HP table (one file instead of 21875 hp .txt files)  ;
+	#-------------------------------------------------------------------;
+	fl_name  = path + "1_InvDNNModel_ss_th/HP_Table.npy"
+	hp_table = save_hp_table(fl_name, hp_list) #21875 (or num_subsample)
+	print(fl_name, hp_table.shape)
 
 	#--------------------------;
 	#  3. Test some scenarios  ;
 	#--------------------------;
-	counter_list  = [1, 9376, 18751]
+	hp_table      = load_hp_table(fl_name)
+	counter_list  = [int(i) for i in hp_table['model_id'][0:3]] if num_subsample else get_block_offsets(grid_spec)
 	#
 	for counter in counter_list:
-		path_fl_sav   = path + "1_InvDNNModel_ss_th/" + str(counter) + "_model/hp_input_deck.txt"
-		print(path_fl_sav)
-		fl_id         = open(path_fl_sav) #Read the hp file line by line
-		#
-		hp_line_list  = fl_id.readlines()
-		#
-		num_layers    = int(hp_line_list[0].strip().split(" = ", 1)[1])
-		neurons       = [int(i) for i in hp_line_list[1].strip().split(" = ", 1)[1].split(",")]
-		dropout_value = float(hp_line_list[2].strip().split(" = ", 1)[1])
-		alpha_value   = float(hp_line_list[3].strip().split(" = ", 1)[1])
-		lr_values     = float(hp_line_list[4].strip().split(" = ", 1)[1])
-		epochs        = int(hp_line_list[5].strip().split(" = ", 1)[1])
-		batch_size    = int(hp_line_list[6].strip().split(" = ", 1)[1])
-		#
-		print(num_layers, neurons, dropout_value, alpha_value, lr_values, epochs, batch_size)
-		#
-		for hp_line in hp_line_list:
-			temp = hp_line.strip().split(" = ", 1)
-			print(temp, len(temp))
-		fl_id.close()
+		hp = get_hp(hp_table, counter) #O(1) lookup by model id
+		print(counter, hp['num_layers'], hp['neurons'], hp['dropout_value'], hp['alpha_value'], \
+			hp['lr_values'], hp['epochs'], hp['batch_size'])
 
-	#-----------------------------------------------;
-	#  4. Sanity check on hp .txt files using glob  ;
-	#-----------------------------------------------;
-	hp_glob_txt_list = glob.glob(path + '1_InvDNNModel_ss_th/**/*.txt', recursive = True) #21875
-	print(len(hp_glob_txt_list))
+	#------------------------------------------------;
+	#  4. Sanity check on model ids in the HP table  ;
+	#------------------------------------------------;
+	print(len(hp_table), len(np.unique(hp_table['hp_hash']))) #21875, 21875 (unique content-hash ids)
 
 	#======================;
 	# End processing time  ;
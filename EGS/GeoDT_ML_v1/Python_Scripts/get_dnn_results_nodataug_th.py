@@ -29,6 +29,8 @@
 
 import multiprocessing
 import os
+import shutil
+import functools
 import copy
 import time
 import yaml
@@ -39,8 +41,6 @@ import pickle
 import pandas as pd
 import numpy as np
 import seaborn as sns
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
 #
 import sklearn #'1.0.2'
 from sklearn.preprocessing import MinMaxScaler
@@ -55,7 +55,16 @@ import tensorflow.keras.backend as K
 from tensorflow.keras.models import *
 from tensorflow.keras.layers import *
 from tensorflow.keras.optimizers import *
-from tensorflow.keras.callbacks import CSVLogger
+from tensorflow.keras.callbacks import EarlyStopping
+#
+from get_dataset_cache import get_cached_dataset
+from get_hp_inputs import load_hp_table, get_hp, get_model_dir
+from get_input_pipeline import get_train_dataset, get_eval_dataset, predict_splits
+from get_plot_renderer import save_diagnostics, render_model_plots
+from get_arch_registry import get_arch_diagrams, link_arch_diagrams
+from get_results_store import save_model_result, get_r2_score
+from get_train_history import BestEpochHistory, load_history
+from get_sweep_runner import get_sweep_config, run_pool_sweep
 
 #=========================;
 #  Start processing time  ;
@@ -87,87 +96,18 @@ def get_dnn_model(geodt_out_comps, geodt_p_comps, \
 
     return model
 
-#=========================================================;
-#  Function-2: Plot training and validation loss ('mse')  ; 
-#=========================================================;
-def plot_tv_loss(hist, epochs, path_fl_sav):
-
-	#---------------------;
-	#  Plot loss ('mse')  ;
-	#---------------------;
-	legend_properties = {'weight':'bold'}
-	fig               = plt.figure()
-	#
-	#plt.rc('text', usetex = True)
-	plt.rcParams['font.family']     = ['sans-serif']
-	plt.rcParams['font.sans-serif'] = ['Lucida Grande']
-	plt.rc('legend', fontsize = 14)
-	ax = fig.add_subplot(111)
-	ax.set_xlabel('Epoch', fontsize = 24, fontweight = 'bold')
-	ax.set_ylabel('Loss (MSE)', fontsize = 24, fontweight = 'bold')
-	#plt.grid(True)
-	ax.tick_params(axis = 'both', which = 'major', labelsize = 20, length = 6, width = 2)
-	ax.set_xlim([0, epochs])
-	#ax.set_ylim([0.35, 1])
-	e_list = [i for i in range(0,epochs)]
-	ax.plot(e_list, hist['loss'], linestyle = 'solid', linewidth = 1.5, \
-					color = 'b', label = 'Training') #Training loss
-	ax.plot(e_list, hist['val_loss'], linestyle = 'solid', linewidth = 1.5, \
-					color = 'm', label = 'Validation') #Validation loss
-	#tick_spacing = 100
-	#ax.xaxis.set_major_locator(ticker.MultipleLocator(tick_spacing))
-	ax.legend(loc = 'upper right')
-	fig.tight_layout()
-	#fig.savefig(path_fl_sav + 'Loss.pdf')
-	fig.savefig(path_fl_sav + 'Loss.png')
-	plt.close(fig)
-
-#======================================================================;
-#  Function-3: Plot one-to-one for train/val/test (All GeoDT outputs)  ; 
-#======================================================================;
-def plot_gt_pred(x, y, param_id, fl_name, str_x_label, str_y_label):
-
-	#------------------------------------------------;
-	#  Plot one-to-one (ground truth vs. predicted)  ;
-	#------------------------------------------------;
-	legend_properties = {'weight':'bold'}
-	fig               = plt.figure()
-	#
-	#plt.rc('text', usetex = True)   
-	plt.rcParams['font.family']     = ['sans-serif']
-	plt.rcParams['font.sans-serif'] = ['Lucida Grande']
-	plt.rc('legend', fontsize = 14)
-	ax = fig.add_subplot(111)
-	ax.set_xlabel(str_x_label, fontsize = 14, fontweight = 'bold')
-	ax.set_ylabel(str_y_label, fontsize = 14, fontweight = 'bold')
-	#plt.grid(True)
-	ax.tick_params(axis = 'both', which = 'major', labelsize = 20, length = 6, width = 2)
-	min_val = np.min(x)
-	max_val = np.max(x)
-	ax.set_xlim([min_val, max_val])
-	ax.set_ylim([min_val, max_val])
-	ax.plot([min_val, max_val], [min_val, max_val], \
-					linestyle = 'solid', linewidth = 1.5, \
-					color = 'r') #One-to-One line
-	ax.scatter(x, y, color = 'b', marker = 'o')
-	#tick_spacing = 100
-	#ax.xaxis.set_major_locator(ticker.MultipleLocator(tick_spacing))
-	#ax.legend(loc = 'upper right')
-	ax.set_aspect(1./ax.get_data_ratio())
-	fig.tight_layout()
-	#fig.savefig(fl_name + str(param_id) + '.pdf')
-	fig.savefig(fl_name + str(param_id) + '.png')
-	plt.close(fig)
-
 #=============================================================================;
-#  Function-4: Train individual models (multiprocessing calls this function)  ; 
+#  Function-2: Train individual models (multiprocessing calls this function)  ; 
 #=============================================================================;
-def get_trained_models(args_inp_list):
+def get_trained_models(args_inp_list, patience = None, mixup_ratio = 0.0):
 
-	#---------------------------------;
-	#  0. Unzip input arguments list  ;
-	#---------------------------------;
-	random_seed, counter = args_inp_list
+	#-----------------------------------------------------------------;
+	#  0. Unzip input arguments list                                  ;
+	#     (patience    = early stopping on val_loss in grid mode)     ;
+	#     (mixup_ratio = on-the-fly mixup rows per training row)      ;
+	#-----------------------------------------------------------------;
+	random_seed, counter = args_inp_list[0:2]
+	num_epochs           = args_inp_list[2] if len(args_inp_list) > 2 else None #Successive halving (epochs of the rung)
 
 	#------------------------------------------------;
 	#  1. Get pre-processed data (all realizations)  ;
@@ -188,8 +128,11 @@ def get_trained_models(args_inp_list):
 	#path_testing    = '/mnt/4tba/maruti/11_GeoDT_DL/'
 	path_testing   = '/tahoma/emsle60558/test_dl_1/1_ML4GeoDT_v3/'
 	#
-	path_fl_sav    =  path_testing + "1_InvDNNModel_ss_th/" + str(counter) + "_model/" #i-th hp-dl-model folder
-	print(path_fl_sav + 'hp_input_deck.txt')
+	path_models    = path_testing + "1_InvDNNModel_ss_th/" #hp-dl-model folders and HP_Table.npy
+	path_fl_sav    = get_model_dir(path_models, counter) #i-th hp-dl-model folder (path only; created for outputs)
+	path_rungs     = path_models + "Rungs/" #Rung checkpoints/histories of all models (one folder; successive halving)
+	print(path_fl_sav)
+	tic_model      = time.perf_counter() #Total time of this model (results store)
 
 	#--------------------------------;
 	#  2. Get other initializations  ;
@@ -202,78 +145,32 @@ def get_trained_models(args_inp_list):
 	sclr_name       = "ss" #Standard Scaler
 	geodt_out_list  = ['npv_']
 	geodt_out       = geodt_out_list[0]
-	p_name          = path_pp_models + "p_" + sclr_name + "_" + str(num_train) + ".sav" #GeoDT-params pre-processor
-	q_name          = path_pp_models + geodt_out + sclr_name + "_" + str(num_train) + ".sav" #q-data pre-processor
 	#
-	pp_scalar       = pickle.load(open(p_name, 'rb')) #Load already created GeoDT pre-processing model
-	qq_scalar       = pickle.load(open(q_name, 'rb')) #Load already created q-data pre-processing model
+	dataset         = get_cached_dataset(path, sclr_name, geodt_out, num_realz, \
+							num_train, num_val, num_test) #Loaded once per rank/worker (read-only arrays)
+	pp_scalar       = dataset['pp_scalar'] #Already created GeoDT pre-processing model
+	qq_scalar       = dataset['qq_scalar'] #Already created q-data pre-processing model
 	#
-	df_p            = pd.read_csv(path_geodt + 'geodt_params.csv', index_col = 0) #[4078 rows x 117 columns]
-
-	#--------------------------------------------------------------------;
-	#  3a. Load train/val/test *.npy data -- One of the 7-preprocessors  ;
-	#--------------------------------------------------------------------; 
-	train_ss_npv = np.load(path_pp_data + "train_" + sclr_name + "_" + geodt_out + \
-						str(num_train) + ".npy") #Train q-data pre-processed (3278, 1) in *.npy file
-	val_ss_npv   = np.load(path_pp_data + "val_" + sclr_name + "_" + geodt_out + \
-						str(num_val) + ".npy") #Save q-data pre-processed (400, 1) in *.npy file
-	test_ss_npv  = np.load(path_pp_data + "test_" + sclr_name + "_" + geodt_out  + \
-						str(num_test) + ".npy") #Save q-data pre-processed (400, 1) in *.npy file 
+	p_list          = dataset['p_list'] #117 GeoDT params
 	#
-	train_ss_p   = np.load(path_pp_data + "train_" + sclr_name + "_p_" + \
-						str(num_train) + ".npy") #Train p-data pre-processed (3278, 117) in *.npy file
-	val_ss_p     = np.load(path_pp_data + "val_" + sclr_name + "_p_" + \
-						str(num_val) + ".npy") #Save p-data pre-processed (400, 117) in *.npy file
-	test_ss_p    = np.load(path_pp_data + "test_" + sclr_name + "_p_"  + \
-						str(num_test) + ".npy") #Save p-data pre-processed (400, 117) in *.npy file
 
-	#--------------------------------------------------;
-	#  3b. Only use non-outlier data (Train/Val/Test)  ;
-	#      (NPV > -1)                                  ;
-	#--------------------------------------------------; 
-	counterx = 0
-	train_neglect_list = []
+	#------------------------------------------------------------;
+	#  3. Only use non-outlier data (Train/Val/Test)             ;
+	#     (NPV > -1; persisted masks in Train_Val_Test_Indices,  ;
+	#      served from the process-level dataset cache)          ;
+	#------------------------------------------------------------;
+	train_q = dataset['train_q'] #(3264,1)
+	val_q   = dataset['val_q'] #(399,1)
+	test_q  = dataset['test_q'] #(397,1)
 	#
-	for i in train_ss_npv: #Neglect train-counterx = 0 to 13
-	    if i <= -1:
-	        #print('Train = ', counterx, i)
-	        train_neglect_list.append(counterx)
-	    counterx = counterx + 1
+	train_p = dataset['train_p'] #(3264,117)
+	val_p   = dataset['val_p'] #(399,117)
+	test_p  = dataset['test_p'] #(397,117)
 
-	counterx = 0
-	val_neglect_list = []
-	#
-	for i in val_ss_npv: #Neglect val-counterx = 0
-	    if i <= -1:
-	        #print('Val = ', counterx, i)
-	        val_neglect_list.append(counterx)
-	    counterx = counterx + 1
-
-	counterx = 0
-	test_neglect_list = []
-	#
-	for i in test_ss_npv: #Neglect test-counterx = 0 to 2
-	    if i <= -1:
-	        #print('Test = ', counterx, i)
-	        test_neglect_list.append(counterx)
-	    counterx = counterx + 1
-
-	train_nn_list = np.array(list(set(range(0,num_train)) - set(train_neglect_list)), dtype = int) #(3264,)
-	val_nn_list   = np.array(list(set(range(0,num_val)) - set(val_neglect_list)), dtype = int) #(399,)
-	test_nn_list  = np.array(list(set(range(0,num_test)) - set(test_neglect_list)), dtype = int) #(397,)
-	#
-	train_q = train_ss_npv[train_nn_list,:] #(3264,1)
-	val_q   = val_ss_npv[val_nn_list,:] #(399,1)
-	test_q  = test_ss_npv[test_nn_list,:] #(397,1)
-	#
-	train_p = train_ss_p[train_nn_list,:] #(3264,117)
-	val_p   = val_ss_p[val_nn_list,:] #(399,117)
-	test_p  = test_ss_p[test_nn_list,:] #(397,117)
-
-	#----------------------------------------------;
-	#  4a. Model training initialization           ;
-	#      (read from a hyperparameter .txt file)  ;
-	#----------------------------------------------;
+	#--------------------------------------------;
+	#  4a. Model training initialization         ;
+	#      (read from the hyperparameter table)  ;
+	#--------------------------------------------;
 	K.clear_session()
 	#
 	np.random.seed(random_seed)
@@ -281,24 +178,18 @@ def get_trained_models(args_inp_list):
 	nq_comps      = train_q.shape[1] #1
 	np_comps      = train_p.shape[1] #117
 	#
-	fl_id         = open(path_fl_sav + 'hp_input_deck.txt') #Read the hp .txt file line by line
-	#
-	hp_line_list  = fl_id.readlines()
+	hp_table      = load_hp_table(path_models + "HP_Table.npy") #Loaded once per rank/worker (memory-mapped)
+	hp            = get_hp(hp_table, counter) #O(1) lookup by model id
 	#
-	num_layers    = int(hp_line_list[0].strip().split(" = ", 1)[1])
-	neurons       = [int(i) for i in hp_line_list[1].strip().split(" = ", 1)[1].split(",")]
-	dropout_value = float(hp_line_list[2].strip().split(" = ", 1)[1])
-	alpha_value   = float(hp_line_list[3].strip().split(" = ", 1)[1])
-	lr_values     = float(hp_line_list[4].strip().split(" = ", 1)[1])
-	epochs        = int(hp_line_list[5].strip().split(" = ", 1)[1])
-	batch_size    = int(hp_line_list[6].strip().split(" = ", 1)[1])
+	num_layers    = hp['num_layers']
+	neurons       = hp['neurons']
+	dropout_value = hp['dropout_value']
+	alpha_value   = hp['alpha_value']
+	lr_values     = hp['lr_values']
+	epochs        = hp['epochs']
+	batch_size    = hp['batch_size']
 	#
 	print(num_layers, neurons, dropout_value, alpha_value, lr_values, epochs, batch_size)
-	#
-	for hp_line in hp_line_list:
-		temp = hp_line.strip().split(" = ", 1)
-		print(temp, len(temp))
-	fl_id.close()
 	
 	#-------------------------------------;
 	#  4b. Model training and validation  ;
@@ -306,47 +197,74 @@ def get_trained_models(args_inp_list):
 	fwd_model  = get_dnn_model(nq_comps, np_comps, num_layers, \
 								neurons, alpha_value, dropout_value) #Forward-DNN-model
 	fwd_model.summary() #Model summary
-	tf.keras.utils.plot_model(fwd_model, path_fl_sav + "Full-Fwd-DNN-Model-a.png", show_shapes = True)
-	tf.keras.utils.plot_model(fwd_model, path_fl_sav + "Full-Fwd-DNN-Model-b.png", show_shapes = False)
+	arch_files = get_arch_diagrams(fwd_model, path_models + "Architectures/", \
+								[np_comps] + list(neurons) + [nq_comps]) #Rendered once per layout (registry)
 	#
 	opt        = Adam(learning_rate = lr_values) #Optimizer and learning rate
 	loss       = "mse" #MSE loss function
 	fwd_model.compile(opt, loss = loss)
-	train_csv  = path_fl_sav + "FwdDNNModel_Loss.csv"
-	csv_logger = CSVLogger(train_csv)
-	callbacks  = [csv_logger] 
+	train_hist = path_fl_sav + "FwdDNNModel_Loss.npz" #History (epoch, loss, val_loss)
+	rung_hist  = path_rungs + str(counter) + "_FwdDNNModel_Loss.npz" #History of the earlier rungs
+	fl_ckpt    = path_rungs + str(counter) + "_Fwd_DNN_Model_SH" #Checkpoint between rungs (prefix)
+	ckpt       = tf.train.Checkpoint(model = fwd_model, optimizer = opt) #Weights and Adam moments/iterations
+	last_run   = num_epochs is None or num_epochs >= epochs #Grid run or last rung --> outputs in path_fl_sav
+	#
+	if last_run: #Folder only for models with outputs (none for models pruned in a rung)
+		get_model_dir(path_models, counter, create = True)
+		link_arch_diagrams(path_fl_sav, arch_files)
+	else:
+		os.makedirs(path_rungs, exist_ok = True)
+	#
+	initial_epoch = 0
+	if num_epochs is not None and os.path.exists(fl_ckpt + ".index") and os.path.exists(rung_hist):
+		opt.build(fwd_model.trainable_variables) #Optimizer slots exist before the restore
+		ckpt.read(fl_ckpt).assert_existing_objects_matched() #Continue training from the state of the last rung
+		initial_epoch = len(load_history(rung_hist)['epoch'])
+		if last_run:
+			shutil.copyfile(rung_hist, train_hist) #Continued in the model folder
+	#
+	train_ds   = get_train_dataset(train_p, train_q, batch_size, random_seed, \
+									mixup_ratio) #Shuffled, batched, and prefetched (tf.data)
+	val_ds     = get_eval_dataset(val_p, val_q)
+	#
+	hist_logger = BestEpochHistory(train_hist if last_run else rung_hist, \
+									append = initial_epoch > 0) #Best epoch online; one write at the end
+	callbacks   = [hist_logger]
+	if num_epochs is None and patience is not None:
+		callbacks.append(EarlyStopping(monitor = 'val_loss', patience = patience, \
+										restore_best_weights = True))
     #
-	history    = fwd_model.fit(x = train_p, y = train_q, \
-								epochs = epochs, batch_size = batch_size, \
-								validation_data = (val_p, val_q), \
+	tic_fit    = time.perf_counter()
+	history    = fwd_model.fit(x = train_ds, \
+								epochs = epochs if num_epochs is None else min(num_epochs, epochs), \
+								initial_epoch = initial_epoch, validation_data = val_ds, \
 								verbose = 2, callbacks = callbacks)
 	hist = history.history
+	train_time = time.perf_counter() - tic_fit #fit only (this run/rung)
 	print("Done training")
+	if not last_run:
+		ckpt.write(fl_ckpt)
 	#print(hist.keys())
-	time.sleep(2)
 
 	#--------------------------------------;
-	#  5. Plot train and val loss ('mse')  ;
+	#  5. Train and val loss ('mse')       ;
 	#     (loss and epoch stats)           ;
 	#--------------------------------------;
-	plot_tv_loss(hist, epochs, path_fl_sav)
+	df_hist        = pd.DataFrame(hist_logger.history) #All epochs (also earlier rungs); no file re-read
+	min_epochs     = [hist_logger.best_epoch]
+	min_val_loss   = [hist_logger.best_val_loss]
+	min_train_loss = [hist_logger.best_loss]
 	#
-	df_hist        = pd.read_csv(train_csv)
-	val_f1         = df_hist['val_loss']
-	min_val_f1     = val_f1.min()
-	min_val_f1_df  = df_hist[val_f1 == min_val_f1]
-	min_epochs     = min_val_f1_df['epoch'].values
-	min_val_loss   = min_val_f1_df['val_loss'].values
-	min_train_loss = min_val_f1_df['loss'].values
+	print('Best epoch, val loss, train loss = ', min_epochs[0], min_val_loss[0], min_train_loss[0])
 	#
-	print(min_val_f1_df)
+	if num_epochs is not None and num_epochs < epochs: #Not the last rung of this model
+		return float(min_val_loss[0])
 
 	#----------------------------------------;
 	#  6. Model prediction (train/val/test)  ;
 	#----------------------------------------;
-	train_pred_q = fwd_model.predict(train_p)
-	val_pred_q   = fwd_model.predict(val_p)
-	test_pred_q  = fwd_model.predict(test_p)
+	train_pred_q, val_pred_q, test_pred_q = predict_splits(fwd_model, \
+											[train_p, val_p, test_p]) #One predict call
 	#
 	#np.save(path_fl_sav + "train_pred_q_" + str(num_train) + ".npy", \
 	#	train_pred_q) #Save train pred (3278, 1) in *.npy file (normalized)
@@ -373,55 +291,20 @@ def get_trained_models(args_inp_list):
 	#np.save(path_fl_sav + "test_pred_q_it" + str(num_test) + ".npy", \
 	#	test_pred_q_it) #Save test pred (400, 1) in *.npy file
 
-	#---------------------------------------------------;
-	#  8. One-to_one normalized plots (train/val/test)  ;
-	#---------------------------------------------------;
-	str_x_label = 'Normalized ground truth (NPV)'
-	str_y_label = 'Normalized prediction (NPV)'
-	#
-	param_id = 0
-	x_train  = train_q[:,param_id]
-	y_train  = train_pred_q[:,param_id]
-	fl_name  = path_fl_sav + "Q_train_"
-	plot_gt_pred(x_train, y_train, param_id, fl_name, \
-					str_x_label, str_y_label)
-	#  
-	x_val    = val_q[:,param_id]
-	y_val    = val_pred_q[:,param_id]
-	fl_name  = path_fl_sav + "Q_val_"
-	plot_gt_pred(x_val, y_val, param_id, fl_name, \
-					str_x_label, str_y_label)
-	#
-	x_test   = test_q[:,param_id]
-	y_test   = test_pred_q[:,param_id]
-	fl_name  = path_fl_sav + "Q_test_"
-	plot_gt_pred(x_test, y_test, param_id, fl_name, \
-					str_x_label, str_y_label)
-	
-	#----------------------------------------------------------;
-	#  9. One-to-one inverse transform plots (train/val/test)  ;
-	#----------------------------------------------------------;
-	str_x_label = 'Ground truth (NPV)'
-	str_y_label = 'Prediction (NPV)'
-	#
-	param_id = 0
-	x_train  = train_q_it[:,param_id]
-	y_train  = train_pred_q_it[:,param_id]
-	fl_name  = path_fl_sav + "IT_train_"
-	plot_gt_pred(x_train, y_train, param_id, fl_name, \
-					str_x_label, str_y_label)
-	#  
-	x_val    = val_q_it[:,param_id]
-	y_val    = val_pred_q_it[:,param_id]
-	fl_name  = path_fl_sav + "IT_val_"
-	plot_gt_pred(x_val, y_val, param_id, fl_name, \
-					str_x_label, str_y_label)
-	#
-	x_test   = test_q_it[:,param_id]
-	y_test   = test_pred_q_it[:,param_id]
-	fl_name  = path_fl_sav + "IT_test_"
-	plot_gt_pred(x_test, y_test, param_id, fl_name, \
-					str_x_label, str_y_label)
+	#-------------------------------------------------------------;
+	#  8. Save loss and predictions (Diagnostics.npz); plots are  ;
+	#     made later by get_plot_renderer.py (top-k models)       ;
+	#-------------------------------------------------------------;
+	save_diagnostics(path_fl_sav, df_hist['loss'], df_hist['val_loss'], \
+					{'train': (train_q, train_pred_q, train_q_it, train_pred_q_it), \
+					 'val': (val_q, val_pred_q, val_q_it, val_pred_q_it), \
+					 'test': (test_q, test_pred_q, test_q_it, test_pred_q_it)})
+
+	#-----------------------------------------------------;
+	#  9. Plots while training (plot_mode = 'now' only)   ;
+	#-----------------------------------------------------;
+	if plot_mode == 'now':
+		render_model_plots(path_fl_sav)
 
 	#--------------------------------------------------------------;
 	#  10. Save model (TensorFlow SavedModel format. *.h5 format)  ;
@@ -436,6 +319,17 @@ def get_trained_models(args_inp_list):
 	print('            Trained: ' + str(counter) + '_model/            ',)
 	print('-------------------------------------------------------------')
 
+	#--------------------------------------------------------------------;
+	#  13. One record in the results store (Results.db; top-k queries)   ;
+	#--------------------------------------------------------------------;
+	r2_dict = {'train': get_r2_score(train_q, train_pred_q), \
+				'val': get_r2_score(val_q, val_pred_q), \
+				'test': get_r2_score(test_q, test_pred_q)} #Normalized NPV
+	save_model_result(path_models + "Results.db", counter, hp, min_val_loss[0], min_epochs[0], \
+						r2_dict, train_time, time.perf_counter() - tic_model)
+
+	return float(min_val_loss[0]) #Recorded in the completion manifest
+
 #**************************************************;
 #  mpi4py + TFv2 + ParallelHDF5 for runs on NERSC  ;
 #**************************************************;
@@ -445,24 +339,36 @@ start            = 1
 end              = 21876 #21876
 id_list          = list(range(start,end))
 #
+search_mode      = 'grid' #'grid' (all models), 'sh' (successive halving), 'hyperband', or 'stacked'
+min_epochs       = 20 #Epochs of the first rung (sh/hyperband)
+max_epochs       = 500 #Largest epochs in the hp grid
+eta              = 3 #Keep the best 1/eta models in each rung
+patience         = None #Early stopping on val_loss in grid mode (e.g., 50 epochs); None --> train for all epochs
+mixup_ratio      = 0.0 #On-the-fly mixup rows per training row of a batch (e.g., 0.5); 0 --> no augmentation
+pool_mode        = 'warm' #'warm' (warm-up + task queue; get_worker_pool.py) or 'map' (pool.map; no warm-up)
+num_threads      = 1 #TF intra-op/OpenMP threads per worker (None --> all cores)
+cores_per_node   = None #Cores of the node (e.g., 64): workers get cores_per_node // num_procs threads and own cores
+calibrate        = False #Pick num_procs x num_threads with the highest models/hour (needs cores_per_node)
+calib_models     = 64 #Models (first model ids) of the calibration runs
+calib_epochs     = 5 #Epochs of the calibration runs
+share_dataset    = True #One read-only copy of the dataset per node for all workers (/dev/shm)
+plot_mode        = 'deferred' #'deferred' (Diagnostics.npz; get_plot_renderer.py) or 'now'
+path_models      = '/tahoma/emsle60558/test_dl_1/1_ML4GeoDT_v3/1_InvDNNModel_ss_th/' #hp-dl-model folders and HP_Table.npy
+dataset_args     = ('/tahoma/emsle60558/test_dl_1/1_ML4GeoDT_v3/', "ss", 'npv_', 4078, 3278, 400, 400) #get_cached_dataset args of get_trained_models (cache key)
+#
 if __name__ == '__main__':
 
-	#=======================================================;
-	#  1. Create args and pack args for DNN model training  ;
-	#=======================================================;
-	random_seed_list = [131 for i in range(0,len(id_list))] #Popular random seeds
-	#
-	args_inp_list    = list(zip(random_seed_list,id_list)) #Args list for embarassingly parallel function -- get_trained_models
-
-	#================================================;
-	#  2. Create processor pool and save DNN models  ;
-	#================================================;
-	pool      = multiprocessing.Pool(processes = num_procs) #Create a pool of workers
-	results   = pool.map(get_trained_models, args_inp_list, chunksize = 1) #Save keras-tuner searches
-	print(results)
-	pool.close()
-	pool.join()
-	pool.terminate()
+	#============================================================;
+	#  Sweep on a pool of workers (grid/stacked/sh/hyperband;    ;
+	#  manifest, shared dataset, calibration: get_sweep_runner)  ;
+	#============================================================;
+	sweep_cfg = get_sweep_config(dataset_args, path_models, id_list, search_mode, min_epochs, \
+					max_epochs, eta, random_seed = 131, plot_mode = plot_mode, num_procs = num_procs, \
+					pool_mode = pool_mode, num_threads = num_threads, cores_per_node = cores_per_node, \
+					calibrate = calibrate, calib_models = calib_models, calib_epochs = calib_epochs, \
+					share_dataset = share_dataset)
+	results   = run_pool_sweep(sweep_cfg, functools.partial(get_trained_models, patience = patience, \
+					mixup_ratio = mixup_ratio), get_dnn_model) #Picklable for the pool workers
 	print('done')
 
 #======================;
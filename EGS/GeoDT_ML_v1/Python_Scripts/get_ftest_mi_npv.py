@@ -21,7 +21,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 #
-from sklearn.feature_selection import f_regression, mutual_info_regression
+from get_columnar_store import load_csv_column_group
+from get_sensitivity import get_f_regression, get_mi_shared
 #
 np.set_printoptions(precision=2)
 
@@ -75,17 +76,15 @@ def plot_avg_ftr_imp(y_pos, data_list1, data_list2, yticklabels, cmap1, cmap2, s
 #*********************************************************;
 path        = '/Users/mudu605/Desktop/GeoDT_DL/1_ML4GeoDT_v3/'
 path_geodt  = path + 'Data/' #GeoDT data
+path_store  = path + 'Data/Columnar_Data/' #Binary columnar store (get_inp_out.py)
 #
-df_p        = pd.read_csv(path + 'Data/geodt_params.csv', index_col = 0) #[4078 rows x 117 columns]
-df_npv      = pd.read_csv(path_geodt + 'npv.csv', index_col = 0) #[4078 rows x 1 columns]
+p_geodt, p_list = load_csv_column_group(path_store, 'params', \
+                    path_geodt + 'geodt_params.csv') #(4078, 117) and 117 names
+npv_geodt, _    = load_csv_column_group(path_store, 'npv', \
+                    path_geodt + 'npv.csv') #(4078, 1)
 #
-num_realz   = df_npv.shape[0] #4078
-num_params  = df_p.shape[1] #117
-#
-npv_geodt   = df_npv.values #(4078, 1)
-#
-p_geodt     = df_p.values #(4078, 117)
-p_list      = df_p.columns.to_list() #117
+num_realz   = npv_geodt.shape[0] #4078
+num_params  = p_geodt.shape[1] #117
 p_list      = ['pin', 'size', 'ResDepth', 'ResGradient', 'ResRho', 'ResKt', 'ResSv', 'AmbTempC',
                 'AmbPres', 'ResE', 'Resv', 'ResG', 'Ks3', 'Ks2', 's3Azn', 's3AznVar', 's3Dip', 
                 's3DipVar', 'fNum0', 'fDia\_min0', 'fDia\_max0', 'fStr\_nom0', 'fStr\_var0', 
@@ -106,11 +105,9 @@ p_list      = ['pin', 'size', 'ResDepth', 'ResGradient', 'ResRho', 'ResKt', 'Res
 #***************************************;
 #  2. Get F-test and MI values for NPV  ;
 #***************************************;
-f_test, _            = f_regression(p_geodt, npv_geodt.flatten()) #(117,)
-mi_npv               = mutual_info_regression(p_geodt, npv_geodt, n_neighbors = 3, random_state = 0) #(117,)
-ind_list             = np.argwhere(np.isnan(f_test))[:,0]
-f_test_npv           = copy.deepcopy(f_test)
-f_test_npv[ind_list] = 0
+f_test, _            = get_f_regression(p_geodt, npv_geodt) #(117,1) each; constant params --> F = 0
+mi_npv               = get_mi_shared(p_geodt, npv_geodt, n_neighbors = 3, random_state = 0)[:,0] #(117,); same as mutual_info_regression
+f_test_npv           = copy.deepcopy(f_test[:,0]) #(117,)
 #
 f_test_npv           = f_test_npv/np.max(f_test_npv) #(117,)
 mi_npv               = mi_npv/np.max(mi_npv) #(117,)
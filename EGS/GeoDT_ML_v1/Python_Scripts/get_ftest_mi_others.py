@@ -23,7 +23,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 #
-from sklearn.feature_selection import f_regression, mutual_info_regression
+from get_columnar_store import load_csv_column_group
+from get_sensitivity import get_ftest_mi_parallel, get_ftest_mi_subsampled
 #
 np.set_printoptions(precision=2)
 
@@ -32,32 +33,8 @@ np.set_printoptions(precision=2)
 #=========================;
 tic = time.perf_counter()
 
-#=========================================================;
-#  Function-1: F-test and MI at each and every time-step  ;
-#=========================================================;
-def get_ftest_mi_values(num_realz, num_ts, num_params, X, y):
-
-    #------------------;
-    #  Initialization  ;
-    #------------------;
-    f_test_arr = np.zeros((num_params,num_ts), dtype = float) #(63,37)
-    mi_arr     = np.zeros((num_params,num_ts), dtype = float) #(63,37)
-
-    #---------------------------------------------;
-    #  Calculate F-test and MI at each time-step  ;
-    #---------------------------------------------;
-    for i in range(1,num_ts):
-    	print(i)
-    	f_test, _       = f_regression(X, y[:,i]) #(63,)
-    	mi              = mutual_info_regression(X, y[:,i], \
-    											n_neighbors = 3, random_state = 0) #(63,)
-    	f_test_arr[:,i] = copy.deepcopy(f_test) #(63,37)
-    	mi_arr[:,i]     = copy.deepcopy(mi) #(63,37)
-
-    return f_test_arr, mi_arr
-
 #======================================================;
-#  Function-2: Heatmap of F-test and MI sensitivities  ;
+#  Function-1: Heatmap of F-test and MI sensitivities  ;
 #======================================================;
 def plot_heatmap(data_list, xticklabels, yticklabels, vmin, vmax, sq_bol, \
 				cmap, str_x_label, str_y_label, str_fig_name):
@@ -96,7 +73,7 @@ def plot_heatmap(data_list, xticklabels, yticklabels, vmin, vmax, sq_bol, \
     plt.close(fig)
 
 #=====================================================;
-#  Function-3: Plot avg. F-test and MI sensitivities  ;
+#  Function-2: Plot avg. F-test and MI sensitivities  ;
 #=====================================================;
 def plot_avg_ftr_imp(y_pos, data_list1, data_list2, yticklabels, cmap1, cmap2, str_fig_name):
 
@@ -139,22 +116,23 @@ def plot_avg_ftr_imp(y_pos, data_list1, data_list2, yticklabels, cmap1, cmap2, s
 #  1. Set paths, create directories, and dump .csv files  ;
 #*********************************************************;
 path        = '/Users/mudu605/Desktop/GeoDT_DL/1_ML4GeoDT_v2/'
-#
-df_p        = pd.read_csv(path + 'Data/geodt_params_common.csv', index_col = 0) #[13049 rows x 63 columns]
-df_hpro     = pd.read_csv(path + 'Data/hpro_common.csv', index_col = 0) #[13049 rows x 37 columns]
-df_pout     = pd.read_csv(path + 'Data/pout_common.csv', index_col = 0) #[13049 rows x 37 columns]
-df_dhout    = pd.read_csv(path + 'Data/dhout_common.csv', index_col = 0) #[13049 rows x 37 columns]
-#
-num_realz   = df_hpro.shape[0] #13049
-num_ts      = df_hpro.shape[1] #37
-num_params  = df_p.shape[1] #63
-#
-hpro_geodt  = df_pout.values #(13049, 37)
-pout_geodt  = df_hpro.values #(13049, 37)
-dhout_geodt = df_dhout.values #(13049, 37)
-#
-p_geodt     = df_p.values #(13049, 63)
-p_list      = df_p.columns.to_list() #63
+path_store  = path + 'Data/Columnar_Data/' #Binary columnar store (*_common.csv converted once)
+#
+p_geodt, p_list = load_csv_column_group(path_store, 'params_common', \
+                    path + 'Data/geodt_params_common.csv') #(13049, 63) and 63 names
+hpro_common, _  = load_csv_column_group(path_store, 'hpro_common', \
+                    path + 'Data/hpro_common.csv') #(13049, 37)
+pout_common, _  = load_csv_column_group(path_store, 'pout_common', \
+                    path + 'Data/pout_common.csv') #(13049, 37)
+dhout_geodt, _  = load_csv_column_group(path_store, 'dhout_common', \
+                    path + 'Data/dhout_common.csv') #(13049, 37)
+#
+num_realz   = hpro_common.shape[0] #13049
+num_ts      = hpro_common.shape[1] #37
+num_params  = p_geodt.shape[1] #63
+#
+hpro_geodt  = pout_common #(13049, 37)
+pout_geodt  = hpro_common #(13049, 37)
 p_list      = ['ResDepth', 'ResGradient', 'ResRho', 'ResKt', \
 				'ResSv', 'AmbTempC', 'ResE', 'Resv', \
 				'ResG', 'Ks3', 'Ks2', 'fNum0', 'fDia\_max0', 'fStr\_nom0', \
@@ -169,10 +147,30 @@ p_list      = ['ResDepth', 'ResGradient', 'ResRho', 'ResKt', \
 				'Qinj', 'Vinj', 'Qstim', 'Vstim', 'phi0', 'phi1', 'phi2', 'mcc0', \
 				'mcc1', 'mcc2', 'hfmcc', 'hfphi'] #63
 
+#*****************************************************************;
+#  2. Get F-test and MI values for each time-step (all outputs)   ;
+#     (F-test --> one matrix product for all outputs; MI -->      ;
+#      (output, time-step) jobs in parallel, n_jobs = -1 uses     ;
+#      all cores)                                                 ;
+#     mi_num_samples = None --> exact MI (all realz)              ;
+#     mi_num_samples = 5000 --> mean MI of stratified subsamples  ;
+#                               and 95% bands (e.g., 46057 realz) ;
+#*****************************************************************;
+y_dict         = {'hpro': hpro_geodt, 'pout': pout_geodt, 'dhout': dhout_geodt}
+mi_num_samples = None
+#
+if mi_num_samples is None:
+    sens_dict = get_ftest_mi_parallel(p_geodt, y_dict, n_jobs = -1)
+else:
+    sens_dict, band_dict = get_ftest_mi_subsampled(p_geodt, y_dict, mi_num_samples, n_jobs = -1)
+    for name, (mi_lower, mi_upper) in band_dict.items():
+        print('Mean/max width of MI bands (' + name + ') = ', np.mean(mi_upper - mi_lower), \
+                np.max(mi_upper - mi_lower))
+
 #**********************************************************;
 #  2a. Get F-test and MI values for each time-step (hpro)  ;
 #**********************************************************;
-f_test_hpro_arr, mi_hpro_arr = get_ftest_mi_values(num_realz, num_ts, num_params, p_geodt, hpro_geodt)
+f_test_hpro_arr, mi_hpro_arr = sens_dict['hpro'] #(63,37) each
 f_test_hpro_arr              = f_test_hpro_arr/np.max(f_test_hpro_arr) #(63,37)
 mi_hpro_arr                  = mi_hpro_arr/np.max(mi_hpro_arr) #(63,37)
 #
@@ -193,7 +191,7 @@ f_test_hpro_sorted           = f_test_hpro[mi_hpro_ids] #Descending order of avg
 #***************************************************;
 #  2b. Get f-test and mi for each time-step (pout)  ;
 #***************************************************;
-f_test_pout_arr, mi_pout_arr = get_ftest_mi_values(num_realz, num_ts, num_params, p_geodt, pout_geodt)
+f_test_pout_arr, mi_pout_arr = sens_dict['pout'] #(63,37) each
 f_test_pout_arr              = f_test_pout_arr/np.max(f_test_pout_arr) #(63,37)
 mi_pout_arr                  = mi_pout_arr/np.max(mi_pout_arr) #(63,37)
 #
@@ -213,7 +211,7 @@ f_test_pout_sorted           = f_test_pout[mi_hpro_ids] #Descending order of avg
 #****************************************************;
 #  2c. Get f-test and mi for each time-step (dhout)  ;
 #****************************************************;
-f_test_dhout_arr, mi_dhout_arr = get_ftest_mi_values(num_realz, num_ts, num_params, p_geodt, dhout_geodt)
+f_test_dhout_arr, mi_dhout_arr = sens_dict['dhout'] #(63,37) each
 f_test_dhout_arr              = f_test_dhout_arr/np.max(f_test_dhout_arr) #(63,37)
 mi_dhout_arr                  = mi_dhout_arr/np.max(mi_dhout_arr) #(63,37)
 #
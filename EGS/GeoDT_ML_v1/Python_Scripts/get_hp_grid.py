@@ -0,0 +1,149 @@
+# Declarative hyperparameter grid for the DNN sweep
+#   A grid spec is a list of blocks (one block per number of hidden layers)
+#   Each block is a dict {hp_name: list of values}; a block is the product
+#   (itertools.product) of its lists in the order of hp_names, i.e., the same
+#   order as the old 6-deep nested loops (neurons outer, batch_size inner)
+#   Model ids are consecutive (1 to 21875) over the blocks; block offsets
+#   (1, 9376, 18751) are derived from the grid spec and not hard-coded
+#   Random or Latin-hypercube subsamples of the grid keep the full-grid ids
+#   Each model also has a stable content-hash id (hp_hash in the HP table)
+#   that does not change if the grid spec is extended or re-ordered
+#
+# Usage (get_dir_hp_dnn_*.py):
+#	hp_list = list(iter_hp_grid(hp_grid_spec)) #21875
+#	hp_list = get_hp_subsample(hp_grid_spec, 2000, method = 'lhs') #2000
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import itertools
+import numpy as np
+
+hp_names = ('neurons', 'dropout_value', 'alpha_value', \
+            'lr_values', 'epochs', 'batch_size') #Product order (outer to inner)
+#
+hp_common    = {'dropout_value': [0.0, 0.1, 0.2, 0.3, 0.4], \
+                'alpha_value': [0.0, 0.1, 0.2, 0.3, 0.4], \
+                'lr_values': [1e-6, 1e-5, 1e-4, 1e-3, 1e-2], \
+                'epochs': [100, 200, 300, 400, 500], \
+                'batch_size': [4, 8, 16, 32, 64]} #5*5*5*5*5 = 3125
+#
+hp_grid_spec = [dict(neurons = [[1000], [500], [250]], **hp_common), \
+                dict(neurons = [[1000, 500], [1000, 250], [500, 250]], **hp_common), \
+                dict(neurons = [[1000, 500, 250]], **hp_common)] #9375 + 9375 + 3125 = 21875
+
+#===================================================;
+#  Function-1: Number of models in each grid block  ;
+#===================================================;
+def get_block_sizes(grid_spec):
+
+    return [int(np.prod([len(block[name]) for name in hp_names])) for block in grid_spec]
+
+#==================================================================;
+#  Function-2: First model id of each grid block (1, 9376, 18751)  ;
+#==================================================================;
+def get_block_offsets(grid_spec, start_id = 1):
+
+    block_sizes = get_block_sizes(grid_spec)
+
+    return [start_id + int(i) for i in np.cumsum([0] + block_sizes[:-1])]
+
+#================================================================;
+#  Function-3: Enumerate the grid lazily (one hp row at a time)  ;
+#              [model_id, num_layers, neurons, dropout_value,    ;
+#               alpha_value, lr_values, epochs, batch_size]      ;
+#================================================================;
+def iter_hp_grid(grid_spec, start_id = 1):
+
+    #------------------------------------------------;
+    #  Same order as the nested loops of each block  ;
+    #------------------------------------------------;
+    model_id = start_id
+    #
+    for block in grid_spec:
+        for hp_values in itertools.product(*[block[name] for name in hp_names]):
+            neurons = list(hp_values[0])
+            yield [model_id, len(neurons), neurons] + list(hp_values[1:])
+            model_id = model_id + 1
+
+#=============================================================;
+#  Function-4: hp row of a position in the grid (no listing)  ;
+#              (position = model_id - start_id)               ;
+#=============================================================;
+def get_hp_grid_row(grid_spec, position, start_id = 1):
+
+    #-----------------------------------------------------;
+    #  Block of the position, then mixed-radix unranking  ;
+    #-----------------------------------------------------;
+    block_sizes = get_block_sizes(grid_spec)
+    model_id    = start_id + position
+    #
+    for block, block_size in zip(grid_spec, block_sizes):
+        if position < block_size:
+            dims      = [len(block[name]) for name in hp_names]
+            level_ids = np.unravel_index(position, dims) #C-order --> last hp varies fastest
+            hp_values = [block[name][int(i)] for name, i in zip(hp_names, level_ids)]
+            neurons   = list(hp_values[0])
+            return [model_id, len(neurons), neurons] + hp_values[1:]
+        position = position - block_size
+    #
+    raise IndexError('Position is larger than the size of the grid')
+
+#=============================================================;
+#  Function-5: Latin-hypercube positions in a grid block      ;
+#              (stratified levels of each hp; no duplicates)  ;
+#=============================================================;
+def get_lhs_positions(dims, num_models, rng):
+
+    #------------------------------------------------------------;
+    #  Each hp: num_models strata in [0,1) --> level ids, and    ;
+    #  duplicate grid points are replaced by random unused ones  ;
+    #------------------------------------------------------------;
+    num_grid  = int(np.prod(dims))
+    level_ids = [np.floor((rng.permutation(num_models) + rng.random(num_models)) \
+                            / num_models * dim).astype(int) for dim in dims]
+    positions = np.unique(np.ravel_multi_index(level_ids, dims))
+    #
+    if len(positions) < num_models:
+        unused    = np.setdiff1d(np.arange(num_grid), positions)
+        positions = np.union1d(positions, rng.choice(unused, num_models - len(positions), \
+                                                        replace = False))
+
+    return positions
+
+#===============================================================;
+#  Function-6: Random or Latin-hypercube subsample of the grid  ;
+#              (hp rows keep their full-grid model ids)         ;
+#===============================================================;
+def get_hp_subsample(grid_spec, num_models, method = 'random', seed = 1337, start_id = 1):
+
+    #-------------------------------------------------------------;
+    #  'random' --> uniform over all grid points (no duplicates)  ;
+    #  'lhs'    --> per-block Latin hypercube; models per block   ;
+    #               are proportional to the block size            ;
+    #-------------------------------------------------------------;
+    rng         = np.random.default_rng(seed)
+    block_sizes = np.asarray(get_block_sizes(grid_spec))
+    num_grid    = int(np.sum(block_sizes))
+    #
+    if num_models >= num_grid:
+        return list(iter_hp_grid(grid_spec, start_id = start_id))
+    #
+    if method == 'random':
+        positions = np.sort(rng.choice(num_grid, num_models, replace = False))
+    elif method == 'lhs':
+        num_block = np.floor(num_models * block_sizes / num_grid).astype(int)
+        remainder = num_models * block_sizes / num_grid - num_block
+        num_block[np.argsort(-remainder, kind = 'stable')[0:num_models - np.sum(num_block)]] += 1
+        #
+        positions = []
+        offset    = 0
+        for block, block_size, num_b in zip(grid_spec, block_sizes, num_block):
+            if num_b > 0:
+                dims = [len(block[name]) for name in hp_names]
+                positions.append(offset + get_lhs_positions(dims, int(num_b), rng))
+            offset = offset + int(block_size)
+        positions = np.concatenate(positions)
+    else:
+        raise ValueError("method must be 'random' or 'lhs'")
+
+    return [get_hp_grid_row(grid_spec, int(i), start_id = start_id) for i in positions]
@@ -0,0 +1,203 @@
+# Hyperparameter inputs for the DNN sweep (21875 models)
+#   All hyperparameters of the sweep are in ONE table (see get_dir_hp_dnn_*.py)
+#	1_InvDNNModel_ss_*/HP_Table.npy --> structured array, one row per model
+#   Row of a model is looked up by its model id (O(1); no file per model)
+#   Model folders (i_model/) are created only when outputs are written
+#   Old hp_input_deck.txt files can still be read (read_hp_input_deck)
+#   and the relative training cost of a model is estimated (get_model_cost)
+#
+# HP table fields:
+#	model_id, hp_hash, num_layers, neurons (3; zero padded), dropout_value,
+#	alpha_value, lr_values, epochs, batch_size
+#	hp_hash --> content hash of the hyperparameters (stable id of a model)
+#
+# Cost estimate (relative):
+#	epochs/batch_size --> number of optimizer steps per realz
+#	layer widths      --> number of weights (117 -> neurons -> 1)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import json
+import hashlib
+import numpy as np
+
+_hp_table_cache = {} #Process-level cache {fl_name: HP table}
+
+#=================================================;
+#  Function-1: Read hp_input_deck.txt of a model  ;
+#=================================================;
+def read_hp_input_deck(fl_name):
+
+    #--------------------------------------;
+    #  Read the hp .txt file line by line  ;
+    #--------------------------------------;
+    with open(fl_name) as fl_id:
+        hp_line_list = fl_id.readlines()
+    #
+    hp = {'num_layers': int(hp_line_list[0].strip().split(" = ", 1)[1]), \
+          'neurons': [int(i) for i in hp_line_list[1].strip().split(" = ", 1)[1].split(",")], \
+          'dropout_value': float(hp_line_list[2].strip().split(" = ", 1)[1]), \
+          'alpha_value': float(hp_line_list[3].strip().split(" = ", 1)[1]), \
+          'lr_values': float(hp_line_list[4].strip().split(" = ", 1)[1]), \
+          'epochs': int(hp_line_list[5].strip().split(" = ", 1)[1]), \
+          'batch_size': int(hp_line_list[6].strip().split(" = ", 1)[1])}
+
+    return hp
+
+#=======================================================;
+#  Function-2: Relative training cost of a DNN model    ;
+#              (epochs/batch_size x number of weights)  ;
+#=======================================================;
+def get_model_cost(hp, np_comps = 117, nq_comps = 1):
+
+    #-----------------------------------------------;
+    #  Dense layers: 117 -> neurons[0] -> ... -> 1  ;
+    #-----------------------------------------------;
+    layer_units = [np_comps] + list(hp['neurons'][0:hp['num_layers']]) + [nq_comps]
+    num_weights = np.sum([(layer_units[i] + 1) * layer_units[i+1] \
+                            for i in range(0,len(layer_units)-1)]) #Weights and biases
+    cost        = hp['epochs'] / hp['batch_size'] * num_weights
+
+    return float(cost)
+
+#=================================================;
+#  Function-3: Data type of the HP table (a row)  ;
+#=================================================;
+def get_hp_dtype(max_layers = 3):
+
+    return np.dtype([('model_id', np.int64), \
+                     ('hp_hash', 'U16'), \
+                     ('num_layers', np.int32), \
+                     ('neurons', np.int32, (max_layers,)), \
+                     ('dropout_value', np.float64), \
+                     ('alpha_value', np.float64), \
+                     ('lr_values', np.float64), \
+                     ('epochs', np.int32), \
+                     ('batch_size', np.int32)])
+
+#==========================================================;
+#  Function-4: Content hash of a model's hyperparameters   ;
+#              (stable id; independent of the grid order)  ;
+#==========================================================;
+def get_hp_hash(num_layers, neurons, dropout_value, alpha_value, \
+                lr_values, epochs, batch_size):
+
+    #-----------------------------------------------------;
+    #  Canonical json (repr of floats) --> sha1 (16 hex)  ;
+    #-----------------------------------------------------;
+    hp_key = json.dumps([int(num_layers), [int(i) for i in np.atleast_1d(neurons)], \
+                         float(dropout_value), float(alpha_value), float(lr_values), \
+                         int(epochs), int(batch_size)])
+
+    return hashlib.sha1(hp_key.encode('utf-8')).hexdigest()[0:16]
+
+#==========================================================================;
+#  Function-5: Save the HP table                                           ;
+#              hp_list --> [model_id, num_layers, neurons, dropout_value,  ;
+#                           alpha_value, lr_values, epochs, batch_size]    ;
+#==========================================================================;
+def save_hp_table(fl_name, hp_list, max_layers = 3):
+
+    #--------------------------------------------------------------;
+    #  Rows are sorted by model id; written atomically (tmp file)  ;
+    #--------------------------------------------------------------;
+    hp_table = np.zeros(len(hp_list), dtype = get_hp_dtype(max_layers))
+    #
+    for i, hp_row in enumerate(hp_list):
+        model_id, num_layers, neurons, dropout_value, \
+        alpha_value, lr_values, epochs, batch_size = hp_row
+        neurons  = np.atleast_1d(neurons) #1-DNN-layer --> int
+        hp_table[i]['model_id']      = model_id
+        hp_table[i]['hp_hash']       = get_hp_hash(num_layers, neurons, dropout_value, \
+                                        alpha_value, lr_values, epochs, batch_size)
+        hp_table[i]['num_layers']    = num_layers
+        hp_table[i]['neurons'][0:len(neurons)] = neurons
+        hp_table[i]['dropout_value'] = dropout_value
+        hp_table[i]['alpha_value']   = alpha_value
+        hp_table[i]['lr_values']     = lr_values
+        hp_table[i]['epochs']        = epochs
+        hp_table[i]['batch_size']    = batch_size
+    #
+    hp_table = hp_table[np.argsort(hp_table['model_id'], kind = 'stable')]
+    if len(np.unique(hp_table['model_id'])) != len(hp_table):
+        raise ValueError('Model ids in the HP table are not unique')
+    #
+    path_table = os.path.dirname(fl_name)
+    if path_table and not os.path.exists(path_table): #Create if they dont exist
+        os.makedirs(path_table, exist_ok = True)
+    #
+    tmp_name = fl_name + "." + str(os.getpid()) + ".tmp"
+    with open(tmp_name, 'wb') as fl_id:
+        np.save(fl_id, hp_table)
+    os.replace(tmp_name, fl_name)
+
+    return hp_table
+
+#===========================================================;
+#  Function-6: Load the HP table (once per process/worker)  ;
+#===========================================================;
+def load_hp_table(fl_name, mmap_mode = 'r'):
+
+    #-------------------------------------------------;
+    #  Memory-mapped; a model only reads its own row  ;
+    #-------------------------------------------------;
+    if fl_name not in _hp_table_cache:
+        _hp_table_cache[fl_name] = np.load(fl_name, mmap_mode = mmap_mode)
+
+    return _hp_table_cache[fl_name]
+
+#====================================================;
+#  Function-7: Row of a model in the HP table        ;
+#              (contiguous ids --> O(1) row offset)  ;
+#====================================================;
+def get_hp_row(hp_table, model_id):
+
+    #-----------------------------------------------------------;
+    #  Contiguous ids (full sweep): row = model_id - first id   ;
+    #  Otherwise (e.g., a subsample): binary search on the ids  ;
+    #-----------------------------------------------------------;
+    first_id = int(hp_table['model_id'][0])
+    last_id  = int(hp_table['model_id'][-1])
+    #
+    if last_id - first_id + 1 == len(hp_table):
+        i = model_id - first_id
+    else:
+        i = int(np.searchsorted(hp_table['model_id'], model_id))
+    #
+    if i < 0 or i >= len(hp_table) or int(hp_table['model_id'][i]) != model_id:
+        raise KeyError('Model id ' + str(model_id) + ' is not in the HP table')
+
+    return i
+
+#======================================================;
+#  Function-8: Hyperparameters of a model (as a dict)  ;
+#              (same keys as read_hp_input_deck)       ;
+#======================================================;
+def get_hp(hp_table, model_id):
+
+    hp_row     = hp_table[get_hp_row(hp_table, model_id)]
+    num_layers = int(hp_row['num_layers'])
+    #
+    hp = {'num_layers': num_layers, \
+          'hp_hash': str(hp_row['hp_hash']), \
+          'neurons': [int(i) for i in hp_row['neurons'][0:num_layers]], \
+          'dropout_value': float(hp_row['dropout_value']), \
+          'alpha_value': float(hp_row['alpha_value']), \
+          'lr_values': float(hp_row['lr_values']), \
+          'epochs': int(hp_row['epochs']), \
+          'batch_size': int(hp_row['batch_size'])}
+
+    return hp
+
+#============================================================;
+#  Function-9: Folder of a model (created lazily, i.e.,      ;
+#              create = True only when outputs are written)  ;
+#============================================================;
+def get_model_dir(path_models, model_id, create = False):
+
+    path_fl_sav = path_models + str(model_id) + "_model/"
+    if create:
+        os.makedirs(path_fl_sav, exist_ok = True)
+
+    return path_fl_sav
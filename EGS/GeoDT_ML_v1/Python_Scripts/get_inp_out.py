@@ -8,11 +8,16 @@
 #
 # NUMBER OF REALZ -- 4078
 #
+# STORE (Data/Columnar_Data/) -- params/npv/hpro/pout column groups as *.npy
+#	(read downstream with get_columnar_store.load_column_group; no csv parsing)
+#
 # AUTHOR: Maruti Kumar Mudunuru
 
 import numpy as np
 import pandas as pd
 import time
+#
+from get_columnar_store import save_column_groups
 
 #=========================;
 #  Start processing time  ;
@@ -23,23 +28,37 @@ tic = time.perf_counter()
 #  1. Set paths, create directories, and dump .csv files  ;
 #*********************************************************;
 path             = '/Users/mudu605/Desktop/GeoDT_DL/1_ML4GeoDT_v3/'
+path_store       = path + 'Data/Columnar_Data/' #Binary columnar store (*.npy column groups)
 #
-df               = pd.read_csv(path + 'Data/full2w_4078.csv') #[4078 rows x 222 columns]
-#
-df_inp           = df.iloc[:,0:117].copy(deep = True) #[4078 rows x 117 columns]
-df_inp.to_csv(path + 'Data/geodt_params.csv') #[4078 rows x 117 columns]
-#
-df_npv           = df.iloc[:,126].copy(deep = True) #[4078 rows x 1 columns]
-df_npv.to_csv(path + 'Data/npv.csv') #[4078 rows x 1 columns]
+ingest_mode      = 'npy' #'npy' (columnar store only) or 'npy+csv' (also dump .csv files)
 #
-df_hpro          = df.iloc[:,142:182].copy(deep = True) #[4078 rows x 40 columns]
-df_hpro.to_csv(path + 'Data/hpro.csv') #[4078 rows x 40 columns]
-#
-df_hpro          = df.iloc[:,142:182].copy(deep = True) #[4078 rows x 40 columns]
-df_hpro.to_csv(path + 'Data/hpro.csv') #[4078 rows x 40 columns]
+df               = pd.read_csv(path + 'Data/full2w_4078.csv') #[4078 rows x 222 columns]
+
+#**************************************************************;
+#  2. Binary columnar store (parse raw .csv ONCE; memory-map)  ;
+#**************************************************************;
+column_groups    = {'params': range(0,117), \
+                    'npv': [126], \
+                    'hpro': range(142,182), \
+                    'pout': range(182,222)}
 #
-df_pout          = df.iloc[:,182:222].copy(deep = True) #[4078 rows x 40 columns]
-df_pout.to_csv(path + 'Data/pout.csv') #[4078 rows x 40 columns]
+save_column_groups(path_store, df, column_groups) #params (4078, 117), npv (4078, 1), hpro/pout (4078, 40)
+
+#*****************************************;
+#  3. Dump .csv files (legacy; optional)  ;
+#*****************************************;
+if ingest_mode == 'npy+csv':
+    df_inp           = df.iloc[:,0:117].copy(deep = True) #[4078 rows x 117 columns]
+    df_inp.to_csv(path + 'Data/geodt_params.csv') #[4078 rows x 117 columns]
+    #
+    df_npv           = df.iloc[:,126].copy(deep = True) #[4078 rows x 1 columns]
+    df_npv.to_csv(path + 'Data/npv.csv') #[4078 rows x 1 columns]
+    #
+    df_hpro          = df.iloc[:,142:182].copy(deep = True) #[4078 rows x 40 columns]
+    df_hpro.to_csv(path + 'Data/hpro.csv') #[4078 rows x 40 columns]
+    #
+    df_pout          = df.iloc[:,182:222].copy(deep = True) #[4078 rows x 40 columns]
+    df_pout.to_csv(path + 'Data/pout.csv') #[4078 rows x 40 columns]
 
 #======================;
 # End processing time  ;
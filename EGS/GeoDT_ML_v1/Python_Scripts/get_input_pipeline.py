@@ -0,0 +1,95 @@
+# tf.data input pipeline for DNN training (get_trained_models)
+#   Train/val/test arrays of the cached dataset (get_dataset_cache.py) are
+#   served to fit/predict as tf.data datasets (shuffle, batch, prefetch), so
+#   data preparation of the next batch overlaps with the training step
+#   Optional on-the-fly mixup (get_mixup.py): each training batch gets extra
+#   mixed rows from random pairs of training realz (no materialized data);
+#   mixup batches are generated in the tf.data threads
+#   Predictions of train/val/test come from ONE predict call
+#
+# Usage (inside get_trained_models):
+#	train_ds = get_train_dataset(train_p, train_q, batch_size, random_seed)
+#	val_ds   = get_eval_dataset(val_p, val_q, 4096)
+#	fwd_model.fit(x = train_ds, validation_data = val_ds, ...)
+#	train_pred_q, val_pred_q, test_pred_q = predict_splits(fwd_model, [train_p, val_p, test_p])
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+import tensorflow as tf
+
+from get_mixup import iter_mixup_batches
+
+#============================================================;
+#  Function-1: Dataset of (p, q) batches for evaluation      ;
+#              (no shuffle; validation data of fit/predict)  ;
+#============================================================;
+def get_eval_dataset(x, y = None, batch_size = 4096):
+
+    data = np.asarray(x, dtype = np.float32) if y is None else \
+            (np.asarray(x, dtype = np.float32), np.asarray(y, dtype = np.float32))
+
+    return tf.data.Dataset.from_tensor_slices(data).batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+#=============================================================;
+#  Function-2: Dataset of on-the-fly mixup batches (endless)  ;
+#              (random pairs; lam from Beta(alpha, beta))     ;
+#=============================================================;
+def get_mixup_dataset(train_p, train_q, batch_size, alpha = 0.5, beta = 0.5, seed = 1337):
+
+    #-------------------------------------------------------;
+    #  Python generator (get_mixup.py) --> tf.data; mixing  ;
+    #  runs in a tf.data thread (prefetched)                ;
+    #-------------------------------------------------------;
+    train_p    = np.asarray(train_p, dtype = np.float32)
+    train_q    = np.asarray(train_q, dtype = np.float32)
+    mixup_iter = iter_mixup_batches(train_p, train_q, batch_size, shuffle = True, \
+                                    seed = seed, alpha = alpha, beta = beta) #One stream for all epochs
+    #
+    def mixup_generator():
+        for p_lam, q_lam in mixup_iter: #Continues where the last epoch stopped
+            yield p_lam.astype(np.float32), q_lam.astype(np.float32)
+    #
+    signature = (tf.TensorSpec(shape = (None, train_p.shape[1]), dtype = tf.float32), \
+                 tf.TensorSpec(shape = (None, train_q.shape[1]), dtype = tf.float32))
+
+    return tf.data.Dataset.from_generator(mixup_generator, output_signature = signature)
+
+#===========================================================;
+#  Function-3: Dataset of shuffled (p, q) training batches  ;
+#              (mixup_ratio > 0 --> mixup_ratio*batch_size  ;
+#               mixed rows are added to each batch)         ;
+#===========================================================;
+def get_train_dataset(train_p, train_q, batch_size, seed = 1337, mixup_ratio = 0.0, \
+                        alpha = 0.5, beta = 0.5):
+
+    #----------------------------------------------------------;
+    #  Reshuffled every epoch (same order for the same seed);  ;
+    #  an epoch is one pass over the training realz            ;
+    #----------------------------------------------------------;
+    train_p  = np.asarray(train_p, dtype = np.float32)
+    train_q  = np.asarray(train_q, dtype = np.float32)
+    train_ds = tf.data.Dataset.from_tensor_slices((train_p, train_q)) \
+                .shuffle(train_p.shape[0], seed = seed, reshuffle_each_iteration = True) \
+                .batch(batch_size)
+    #
+    if mixup_ratio > 0:
+        mixup_ds = get_mixup_dataset(train_p, train_q, max(1, int(mixup_ratio * batch_size)), \
+                                        alpha, beta, seed)
+        train_ds = tf.data.Dataset.zip((train_ds, mixup_ds)).map(lambda real, mix: \
+                    (tf.concat([real[0], mix[0]], axis = 0), tf.concat([real[1], mix[1]], axis = 0)), \
+                    num_parallel_calls = tf.data.AUTOTUNE)
+
+    return train_ds.prefetch(tf.data.AUTOTUNE)
+
+#====================================================================;
+#  Function-4: Predictions of train/val/test (one predict call)      ;
+#              (splits are concatenated, predicted, and split back)  ;
+#====================================================================;
+def predict_splits(model, x_list, batch_size = 4096):
+
+    num_rows = [x.shape[0] for x in x_list]
+    pred     = model.predict(get_eval_dataset(np.concatenate(x_list, axis = 0), \
+                                batch_size = batch_size), verbose = 0)
+
+    return np.split(pred, np.cumsum(num_rows)[:-1], axis = 0)
@@ -0,0 +1,90 @@
+# Resource-aware launch settings for the DNN sweep (threads and CPU affinity)
+#   Many TF processes on one node each use ALL cores by default (oversubscribed)
+#   Given the cores of a node and the processes per node, each process gets
+#	threads --> cores_per_node // procs_per_node (TF intra-op, OpenMP, MKL)
+#	cores   --> its own block of cores (os.sched_setaffinity; local id of the
+#	            process on the node, e.g., pool worker slot or node rank)
+#   The core blocks are taken from the cores this job may use (srun/taskset)
+#   Calibration of the procs x threads split: see run_calibration (get_worker_pool.py)
+#
+# Usage:
+#	num_threads = get_threads_per_proc(68, 17) #4 threads, 17 processes on a KNL node
+#	set_process_resources(num_threads, get_core_set(local_id, num_threads))
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+
+#=========================================================;
+#  Function-1: Threads of a process (cores split evenly)  ;
+#=========================================================;
+def get_threads_per_proc(cores_per_node, procs_per_node):
+
+    return max(1, int(cores_per_node) // max(1, int(procs_per_node)))
+
+#===================================================================;
+#  Function-2: Cores of a process (block of num_threads cores)      ;
+#              (local_id = 0, 1, ... on the node; wraps if the job  ;
+#               has fewer cores than procs x threads)               ;
+#===================================================================;
+def get_core_set(local_id, num_threads):
+
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0)) #Cores allowed for this job (srun/taskset)
+    else: #No affinity control (e.g., macOS)
+        cores = list(range(os.cpu_count()))
+    start = (int(local_id) * int(num_threads)) % len(cores)
+
+    return [cores[(start + i) % len(cores)] for i in range(0,int(num_threads))]
+
+#===============================================================;
+#  Function-3: Set threads and affinity of the calling process  ;
+#              (before TF runs its first op)                    ;
+#===============================================================;
+def set_process_resources(num_threads, core_set = None, inter_threads = 1):
+
+    #----------------------------------------------------------;
+    #  num_threads = None --> TF/OpenMP defaults (all cores);  ;
+    #  core_set = None --> no binding                          ;
+    #----------------------------------------------------------;
+    if num_threads is not None:
+        for env_name in ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', \
+                            'TF_NUM_INTRAOP_THREADS']:
+            os.environ[env_name] = str(num_threads)
+        os.environ['TF_NUM_INTEROP_THREADS'] = str(inter_threads)
+        #
+        import tensorflow as tf
+        try:
+            tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+            tf.config.threading.set_inter_op_parallelism_threads(inter_threads)
+        except RuntimeError as error: #TF runtime already initialized (e.g., in the parent)
+            print('Threads not set: ', error)
+    #
+    if core_set is not None and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, core_set)
+
+#===========================================================;
+#  Function-4: Local id of a pool worker (shared counter)   ;
+#              (multiprocessing.Value('i', 0) of the pool)  ;
+#===========================================================;
+def get_worker_slot(counter):
+
+    with counter.get_lock():
+        slot          = counter.value
+        counter.value = counter.value + 1
+
+    return slot
+
+#====================================================================;
+#  Function-5: Procs x threads splits of a node (calibration)        ;
+#              (all divisors of cores_per_node, fewest procs first)  ;
+#====================================================================;
+def get_calibration_splits(cores_per_node, max_threads = None):
+
+    split_list = [(p, cores_per_node // p) for p in range(1,cores_per_node+1) \
+                    if cores_per_node % p == 0]
+    #
+    if max_threads is not None:
+        split_list = [(p, t) for p, t in split_list if t <= max_threads]
+
+    return split_list
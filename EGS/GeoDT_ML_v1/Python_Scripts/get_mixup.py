@@ -1,19 +1,42 @@
-# WORK-IN-PROGRESS
-#
 # Pre-computed mixup -- Generate weak supervised labels
-# Mixup's lambda is from Beta distribution (https://arxiv.org/pdf/1710.09412.pdf)
-# alpha > 0, beta > 0; lam   = np.random.beta(alpha, beta)
-# Herein, we assume lam = 0.5, resulting in an average mixup between two samples
+# Mixup's lambda per mixed row (https://arxiv.org/pdf/1710.09412.pdf), see get_mixup_lambdas:
+#   k = 2 samples --> lam ~ Beta(alpha, beta) (beta = None --> Beta(alpha, alpha)),
+#                     weights (lam, 1 - lam)
+#   k > 2 samples --> weights ~ Dirichlet(alpha,...,alpha) (sum to 1)
+#   alpha = None  --> constant weights: (lam, 1 - lam) with lam = 0.5 by default
+#                     (average of two samples) or 1/k for k > 2
+# mixup_data_twosamples keeps the constant lam = 0.5
 #
 # Train/Val/Test splits:
 #   Val = 10%, Test = 10%
 #   Train --> 5%, 10%, 20%, 40%, 60%, and 80%
+# Pairs are not listed: pair ids are computed from their ranks in chunks
+# (triangular-number unranking) and mixup batches are generated on demand
+#   for x_lam, y_lam in iter_mixup_batches(x, y, 1024): ...
+# Batched kernel: index (B, k) and lam (B, k) from Beta (k = 2) or Dirichlet
+# (k > 2) with a seeded np.random.Generator per worker
+#   rng = get_mixup_rng(1337, worker_id)
+#   x_lam, hpro_lam, npv_lam = mixup_batch([x_p, y_hpro, y_npv], index, \
+#                                get_mixup_lambdas(rng, len(index), 2, alpha, beta))
+# Pre-computed mixup: pair space is split into fixed-size shards written by a
+# process pool (Philox stream per shard --> same output for any num_procs);
+# Mixup_Manifest.json lists the shards and iter_mixup_shards streams them;
+# existing shards are reused only if Mixup_Params.json has the same seed,
+# alpha, beta, lam, and data shapes (otherwise they are regenerated)
 # Author: Maruti Kumar Mudunuru
 
 import os
+import re
+import json
 import time
+import multiprocessing
 import numpy as np
-from itertools import combinations
+from itertools import combinations, count
+#
+from get_outlier_mask import load_outlier_mask
+from get_split_views import load_split_views
+
+_mixup_data = {} #{name: (num_realz, dim) array} of a materializer worker (pool initializer)
 
 #==============================================================;
 #  Function-1: Pre-computed mixup for two sample combinations  ;
@@ -26,7 +49,7 @@ def mixup_data_twosamples(x1, x2, y1, y2, alpha, beta):
     #np.random.seed(int.from_bytes(os.urandom(4), byteorder='little')) #Needed for multiprocessing
     #lam   = np.random.beta(alpha, beta) #Sample from beta distribution
     #np.random.dirichlet((10, 5, 3), 20) for multi-dimensional mixup
-    lam   = 0.5 #Average between two samples
+    lam   = 0.5 #Average between two samples (batched version with Beta lam --> mixup_batch)
     x_lam = lam * x1 + (1.0 - lam) * x2 #Mixup inputs vectors
     y_lam = lam * y1 + (1.0 - lam) * y2 #Mixup output vectors
 
@@ -42,25 +65,360 @@ def get_all_unique_pairs(num_realz, k):
     #----------------------------------------------------------------;
     # Generate unique pairs of realizations                          ;
     # (nCk = n! / k! / (n-k)! when 0 <= k <= n or zero when k > n.)  ; 
+    # k = 2 --> unranking (no list of tuples); same order as         ;
+    # itertools.combinations                                         ;
     #----------------------------------------------------------------;
+    if k == 2:
+        ranks = np.arange(0,get_num_pairs(num_realz),dtype = np.int64)
+        return np.stack(get_pairs_from_ranks(ranks, num_realz), axis = 1)
+    #
     realz_list = list(range(0,num_realz)) #List of realization numbers
     comb_list  = np.array([comb for comb in \
                           combinations(realz_list,k)]) #List of all possible unique pairs
     
     return comb_list
 
-#**********************************************************;
-#  Mixup for two samples -- Different training data sizes  ;
-#     5%  = 522   --> 135,981    samples                   ; 
-#     10% = 1043  --> 543,403    samples                   ;
-#     20% = 2087  --> 2,176,741  samples                   ;
-#     40% = 4175  --> 8,713,225  samples                   ;
-#     60% = 6263  --> 19,609,453 samples                   ;
-#     80% = 10439 --> 54,481,141 samples                   ;
-#     Each input-output has the following dimensions       ;
-#       INPUT  = (37,)                                     ; 
-#       OUTPUT = (63,)                                     ;
-#**********************************************************;
+#==================================================;
+#  Function-3: Number of unique pairs (n*(n-1)/2)  ;
+#==================================================;
+def get_num_pairs(num_realz):
+
+    return int(num_realz) * (int(num_realz) - 1) // 2
+
+#==============================================================;
+#  Function-4: Pairs (i, j) with i < j from their ranks        ;
+#              (triangular-number unranking; vectorized)       ;
+#              rank 0 --> (0,1), rank 1 --> (0,2), ...         ;
+#==============================================================;
+def get_pairs_from_ranks(ranks, num_realz):
+
+    #-------------------------------------------------------------;
+    #  Row i starts at rank offset(i) = i*(2n-i-1)/2; i is the    ;
+    #  root of the quadratic (one integer correction step for     ;
+    #  round-off of sqrt), j = rank - offset(i) + i + 1           ;
+    #-------------------------------------------------------------;
+    n     = int(num_realz)
+    ranks = np.asarray(ranks, dtype = np.int64)
+    b     = 2 * n - 1
+    i     = np.floor((b - np.sqrt(float(b)**2 - 8.0 * ranks)) / 2.0).astype(np.int64)
+    i     = np.clip(i, 0, n - 2)
+    #
+    offset_i  = i * (2 * n - i - 1) // 2
+    i         = np.where(offset_i > ranks, i - 1, i) #Root is too large
+    offset_i  = i * (2 * n - i - 1) // 2
+    offset_i1 = (i + 1) * (2 * n - i - 2) // 2
+    i         = np.where(offset_i1 <= ranks, i + 1, i) #Root is too small
+    offset_i  = i * (2 * n - i - 1) // 2
+    j         = ranks - offset_i + i + 1
+
+    return i, j
+
+#================================================================;
+#  Function-5: Pairs in chunks of ranks [start, stop)            ;
+#              (constant memory; (chunk_size,2) arrays of ids)   ;
+#================================================================;
+def iter_pair_chunks(num_realz, chunk_size, start = 0, stop = None):
+
+    num_pairs = get_num_pairs(num_realz)
+    stop      = num_pairs if stop is None else min(int(stop), num_pairs)
+    #
+    for rank_start in range(int(start),stop,int(chunk_size)):
+        ranks = np.arange(rank_start,min(rank_start + int(chunk_size), stop),dtype = np.int64)
+        yield np.stack(get_pairs_from_ranks(ranks, num_realz), axis = 1)
+
+#==================================================================;
+#  Function-6: Streaming mixup batches (x_lam, y_lam) on demand    ;
+#              (shuffle = False --> all pairs in order, one pass;  ;
+#               shuffle = True  --> random pairs, num_batches)     ;
+#==================================================================;
+def iter_mixup_batches(x, y, batch_size, lam = 0.5, shuffle = False, \
+                        num_batches = None, seed = 1337, alpha = None, beta = None):
+
+    #------------------------------------------------------------;
+    #  x, y are (num_realz, dim) arrays of the training split;   ;
+    #  pair ids are computed per batch (never listed); lam per   ;
+    #  row from Beta(alpha, beta) if alpha is given              ;
+    #------------------------------------------------------------;
+    num_realz = x.shape[0]
+    num_pairs = get_num_pairs(num_realz)
+    rng       = get_mixup_rng(seed)
+    #
+    if shuffle: #Random pairs (with replacement)
+        pair_iter = (np.stack(get_pairs_from_ranks(rng.integers(0, num_pairs, size = batch_size), \
+                                num_realz), axis = 1) for _ in count())
+    else:
+        pair_iter = iter_pair_chunks(num_realz, batch_size)
+    #
+    for counter, pair_ids in enumerate(pair_iter):
+        if num_batches is not None and counter >= num_batches:
+            break
+        lam_ids = get_mixup_lambdas(rng, pair_ids.shape[0], 2, alpha, beta, lam)
+        yield mixup_batch([x, y], pair_ids, lam_ids)
+
+#===============================================================;
+#  Function-7: Seedable random generator for mixup              ;
+#              (independent stream per worker; no global        ;
+#               np.random state --> safe with multiprocessing)  ;
+#===============================================================;
+def get_mixup_rng(seed = 1337, worker_id = 0):
+
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key = (int(worker_id),)))
+
+#==================================================================;
+#  Function-8: Mixup weights of each row (num_rows, k)             ;
+#              (k = 2 --> Beta(alpha, beta); k > 2 --> Dirichlet   ;
+#               (alpha,...,alpha); alpha = None --> constant lam)  ;
+#==================================================================;
+def get_mixup_lambdas(rng, num_rows, k = 2, alpha = None, beta = None, lam = 0.5):
+
+    if alpha is None: #lam for the first sample (k = 2) or an average (k > 2)
+        if k == 2:
+            lam_ids = np.tile([lam, 1.0 - lam], (num_rows, 1))
+        else:
+            lam_ids = np.full((num_rows, k), 1.0 / k)
+    elif k == 2:
+        lam_1   = rng.beta(alpha, alpha if beta is None else beta, size = num_rows)
+        lam_ids = np.stack([lam_1, 1.0 - lam_1], axis = 1)
+    else:
+        lam_ids = rng.dirichlet(np.full(k, alpha), size = num_rows)
+
+    return lam_ids
+
+#================================================================;
+#  Function-9: Batched mixup kernel (one einsum call)            ;
+#              index --> (B, k) realization ids; lam --> (B, k)  ;
+#              data_list --> e.g., [x_p, y_hpro, y_pout, y_npv]  ;
+#================================================================;
+def mixup_batch(data_list, index, lam):
+
+    #-----------------------------------------------------;
+    #  Mixed row b = sum_k lam[b,k] * data[index[b,k],:]  ;
+    #  (all arrays are gathered and mixed in ONE einsum   ;
+    #   call over their concatenated columns)             ;
+    #-----------------------------------------------------;
+    index    = np.asarray(index)
+    lam      = np.asarray(lam)
+    num_col  = [data.shape[1] if data.ndim > 1 else 1 for data in data_list]
+    x_ids    = np.concatenate([data[index].reshape(index.shape + (num,)) \
+                                 for data, num in zip(data_list, num_col)], axis = 2) #(B, k, sum(num_col))
+    x_lam    = np.einsum('bk,bkd->bd', lam.astype(x_ids.dtype), x_ids)
+    mix_list = np.split(x_lam, np.cumsum(num_col)[:-1], axis = 1)
+
+    return [mix if data.ndim > 1 else mix[:,0] for mix, data in zip(mix_list, data_list)]
+
+#===============================================================;
+#  Function-10: Counter-based random generator of a shard       ;
+#               (Philox keyed by (seed, shard_id) --> same lam  ;
+#                for any number of workers or order of shards)  ;
+#===============================================================;
+def get_shard_rng(seed, shard_id):
+
+    return np.random.Generator(np.random.Philox(np.random.SeedSequence(seed, \
+                                spawn_key = (int(shard_id),))))
+
+#=========================================================;
+#  Function-11: Data arrays of a materializer worker      ;
+#               (set once per process; pool initializer)  ;
+#=========================================================;
+def init_mixup_worker(data_dict):
+
+    _mixup_data.clear()
+    _mixup_data.update(data_dict)
+
+#=============================================================;
+#  Function-12: Shard file name (e.g., Shards/npv_00012.npy)  ;
+#=============================================================;
+def get_shard_name(path_shards, name, shard_id):
+
+    return path_shards + name + "_" + str(shard_id).zfill(5) + ".npy"
+
+#==================================================================;
+#  Function-13: Write one shard (pair ranks [start, stop))         ;
+#               (fixed-size *.npy per data array; atomic writes;   ;
+#                existing shards are kept --> resumable; shards    ;
+#                of other parameters are removed before a run,     ;
+#                see check_mixup_params)                           ;
+#==================================================================;
+def save_mixup_shard(path_shards, shard_id, shard_size, alpha = None, beta = None, \
+                        lam = 0.5, seed = 1337):
+
+    #--------------------------------------------------------;
+    #  Pair ids and lam of the shard --> one batched mixup   ;
+    #  (pair_ids and lam are saved with the mixed arrays)    ;
+    #--------------------------------------------------------;
+    names     = list(_mixup_data.keys())
+    num_realz = _mixup_data[names[0]].shape[0]
+    start     = int(shard_id) * int(shard_size)
+    stop      = min(start + int(shard_size), get_num_pairs(num_realz))
+    info      = {'shard_id': int(shard_id), 'start': start, 'stop': stop}
+    #
+    if all(os.path.exists(get_shard_name(path_shards, name, shard_id)) \
+            for name in names + ['pair_ids', 'lam']):
+        return info
+    #
+    pair_ids  = np.stack(get_pairs_from_ranks(np.arange(start,stop,dtype = np.int64), \
+                                                num_realz), axis = 1)
+    lam_ids   = get_mixup_lambdas(get_shard_rng(seed, shard_id), stop - start, 2, alpha, beta, lam)
+    mix_list  = mixup_batch([_mixup_data[name] for name in names], pair_ids, lam_ids)
+    #
+    for name, x_data in zip(names + ['pair_ids', 'lam'], \
+                            mix_list + [pair_ids.astype(np.int32), lam_ids[:,0]]):
+        fl_name  = get_shard_name(path_shards, name, shard_id)
+        tmp_name = fl_name + "." + str(os.getpid()) + ".tmp"
+        with open(tmp_name, 'wb') as fl_id:
+            np.save(fl_id, np.ascontiguousarray(x_data))
+        os.replace(tmp_name, fl_name)
+
+    return info
+
+#===============================================================;
+#  Function-14: Write a contiguous range of shards (pool task)  ;
+#===============================================================;
+def save_mixup_shard_range(args_inp_list):
+
+    path_shards, shard_ids, shard_size, alpha, beta, lam, seed = args_inp_list
+
+    return [save_mixup_shard(path_shards, shard_id, shard_size, alpha, beta, lam, seed) \
+            for shard_id in shard_ids]
+
+#==================================================================;
+#  Function-15: Parameters that generate a shard set               ;
+#               (json types; same params --> same shard contents)  ;
+#==================================================================;
+def get_mixup_params(data_dict, shard_size, alpha = None, beta = None, lam = 0.5, seed = 1337):
+
+    params = {'num_realz': int(next(iter(data_dict.values())).shape[0]), \
+                'shard_size': int(shard_size), \
+                'seed': int(seed), \
+                'alpha': None if alpha is None else float(alpha), \
+                'beta': None if beta is None else float(beta), \
+                'lam': None if alpha is not None else float(lam), \
+                'names': list(data_dict.keys()) + ['pair_ids', 'lam'], \
+                'dims': {name: list(x_data.shape[1:]) for name, x_data in data_dict.items()}}
+
+    return params
+
+#=====================================================================;
+#  Function-16: Keep shards only if they have the same parameters     ;
+#               (Mixup_Params.json is written before any shard; on a  ;
+#                mismatch or missing file, shards and manifest are    ;
+#                removed --> regenerated)                             ;
+#=====================================================================;
+def check_mixup_params(path_shards, params):
+
+    fl_name = path_shards + "Mixup_Params.json"
+    if os.path.exists(fl_name):
+        with open(fl_name, 'r') as fl_id:
+            if json.load(fl_id) == params:
+                return True
+    #
+    for fl_shard in os.listdir(path_shards):
+        if re.search(r"_\d{5,}\.npy($|\.)", fl_shard) or fl_shard == "Mixup_Manifest.json":
+            os.remove(path_shards + fl_shard) #Shards (and *.tmp) of other or unknown parameters
+    #
+    tmp_name = fl_name + "." + str(os.getpid()) + ".tmp"
+    with open(tmp_name, 'w') as fl_id:
+        json.dump(params, fl_id, indent = 1)
+    os.replace(tmp_name, fl_name)
+
+    return False
+
+#=================================================================;
+#  Function-17: Materialize all mixup pairs as shards (parallel)  ;
+#               (manifest --> Mixup_Manifest.json)                ;
+#=================================================================;
+def run_mixup_materializer(path_shards, data_dict, shard_size = 100000, num_procs = 1, \
+                            alpha = None, beta = None, lam = 0.5, seed = 1337):
+
+    #-----------------------------------------------------------;
+    #  Pair space is split into shards of shard_size pairs;     ;
+    #  ranges of shards go to the workers of a process pool;    ;
+    #  output does not depend on num_procs (per-shard Philox)   ;
+    #-----------------------------------------------------------;
+    if not os.path.exists(path_shards): #Create if they dont exist
+        os.makedirs(path_shards, exist_ok = True)
+    params     = get_mixup_params(data_dict, shard_size, alpha, beta, lam, seed)
+    check_mixup_params(path_shards, params) #Existing shards are reused only for the same params
+    #
+    num_realz  = params['num_realz']
+    num_pairs  = get_num_pairs(num_realz)
+    num_shards = -(-num_pairs // int(shard_size))
+    num_ranges = max(1, min(num_shards, 4 * int(num_procs))) #Few ranges per worker (load balance)
+    args_list  = [(path_shards, [int(i) for i in shard_ids], shard_size, alpha, beta, lam, seed) \
+                    for shard_ids in np.array_split(np.arange(num_shards), num_ranges)]
+    #
+    if num_procs > 1:
+        with multiprocessing.Pool(num_procs, initializer = init_mixup_worker, \
+                                    initargs = (data_dict,)) as pool:
+            info_list = [info for info_range in pool.map(save_mixup_shard_range, args_list) \
+                            for info in info_range]
+    else:
+        init_mixup_worker(data_dict)
+        info_list = [info for args in args_list for info in save_mixup_shard_range(args)]
+
+    #----------------------------------------------------------;
+    #  Manifest (written last --> marks a complete shard set)  ;
+    #----------------------------------------------------------;
+    manifest = dict(params, num_pairs = int(num_pairs), num_shards = int(num_shards), \
+                    shards = sorted(info_list, key = lambda info: info['shard_id']))
+    #
+    fl_name  = path_shards + "Mixup_Manifest.json"
+    tmp_name = fl_name + "." + str(os.getpid()) + ".tmp"
+    with open(tmp_name, 'w') as fl_id:
+        json.dump(manifest, fl_id, indent = 1)
+    os.replace(tmp_name, fl_name)
+
+    return manifest
+
+#===================================================================;
+#  Function-18: Stream mixup shards (memory-mapped, one at a time)  ;
+#               (batches of rows; shuffled shards and rows if       ;
+#                shuffle = True)                                    ;
+#===================================================================;
+def iter_mixup_shards(path_shards, names, batch_size = None, shuffle = False, seed = 1337):
+
+    #---------------------------------------------------------;
+    #  Yields [x_data of names] for each batch (or shard if   ;
+    #  batch_size = None); only one shard is read at a time   ;
+    #---------------------------------------------------------;
+    with open(path_shards + "Mixup_Manifest.json", 'r') as fl_id:
+        manifest = json.load(fl_id)
+    #
+    rng       = get_mixup_rng(seed)
+    shard_ids = [info['shard_id'] for info in manifest['shards']]
+    if shuffle:
+        shard_ids = [shard_ids[i] for i in rng.permutation(len(shard_ids))]
+    #
+    for shard_id in shard_ids:
+        x_list = [np.load(get_shard_name(path_shards, name, shard_id), mmap_mode = 'r') \
+                    for name in names]
+        if batch_size is None:
+            yield x_list
+            continue
+        #
+        num_rows = x_list[0].shape[0]
+        index    = rng.permutation(num_rows) if shuffle else np.arange(num_rows)
+        for i in range(0,num_rows,batch_size):
+            ids = np.sort(index[i:i+batch_size]) #Sorted rows --> sequential memmap reads
+            yield [np.asarray(x_data[ids]) for x_data in x_list]
+
+#***********************************************************************;
+#  Mixup for two samples -- Different training data sizes               ;
+#  NOTE: sizes ADAPTED to the v3 data of this tree (4078 realz, split   ;
+#  views, and NPV outlier mask). The v2 sizes of the original script    ;
+#  (13049 realz: 522, 1043, 2087, 4175, 6263, 10439 realz --> 135,981   ;
+#  to 54,481,141 samples) need the v2 raw data, which is not read here  ;
+#  (rows in split order; fewer pairs after removing NPV <= -1 realz)    ;
+#     5%  = 204   --> at most 20,706    samples                         ;
+#     10% = 408   --> at most 83,028    samples                         ;
+#     20% = 816   --> at most 332,520   samples                         ;
+#     40% = 1632  --> at most 1,330,896 samples                         ;
+#     60% = 2446  --> at most 2,990,235 samples                         ;
+#     80% = 3278  --> at most 5,371,003 samples                         ;
+#     Each input-output has the following dimensions (pre-processed)    ;
+#       INPUT  = p (117,)                                               ;
+#       OUTPUT = npv (1,), hpro (40,), pout (40,)                       ;
+#***********************************************************************;
 if __name__ == '__main__':
 
     #=========================;
@@ -69,45 +427,54 @@ if __name__ == '__main__':
     tic = time.perf_counter()
     
     #----------------------------------------------------------;
-    #  1. Get raw training data (5%, 10%, 20%, 40%, 60%, 80%)  ;
+    #  1. Get training data (5%, 10%, 20%, 40%, 60%, 80%)      ;
+    #     (split views of the pre-processed data; smaller      ;
+    #      training sets are the first rows of the 80% split)  ;
     #----------------------------------------------------------;
     #path = os.getcwd() #Get current directory path
-    path                = '/Users/mudu605/Desktop/GeoDT_DL/1_ML4GeoDT_v2/'
-    path_raw_data       = path + 'Data/Raw_Data/' #Raw data
-    path_raw_data_mixup = path + 'Data/Raw_Data_Mixup/' #Raw data with Mixup
+    path            = '/Users/mudu605/Desktop/GeoDT_DL/1_ML4GeoDT_v3/'
+    path_ind        = path + 'Data/Train_Val_Test_Indices/' #Train/Val/Test indices (and non-outlier masks)
+    path_pp_data    = path + 'Data/PreProcessed_Data/' #Pre-processed data
+    path_mixup_data = path + 'Data/Mixup_Data/' #Pre-computed mixup (shards)
     #
-    num_train    = 10439 #Training realz
+    sclr_name  = 'ss' #Standard scaler (mixup with sum(lam) = 1 commutes with it)
+    num_realz  = 4078 #No. of realization (total realz data)
+    num_train  = 3278 #Training realz
+    num_val    = 400 #Validation realz
+    num_test   = 400 #Testing realz
     #
-    x_p          = np.load(path_raw_data + "train_raw_p_" + \
-                            str(num_train) + ".npy") #GeoDT params -- 13049 realz; (13049, 63)
-    x_hpro       = df_hpro.values #hpro -- 13049 realz; (13049, 37)
-    x_pout       = df_pout.values #pout -- 13049 realz; (13049, 37)
-    x_dhout      = df_dhout.values #dhout -- 13049 realz; (13049, 37)
+    train_dict = {name: load_split_views(path_pp_data + sclr_name + "_" + name + "_" + \
+                                            str(num_realz) + ".npy", num_realz, num_train, \
+                                            num_val, num_test)['train'] \
+                    for name in ['p', 'npv', 'hpro', 'pout']} #memmap views, e.g., p (3278, 117)
+    train_mask = load_outlier_mask(path_ind, 'train', sclr_name, 'npv_', num_train, \
+                                    train_dict['npv']) #Non-outlier mask (NPV > -1)
 
     #----------------------;
     #  2. Initializations  ;
     #----------------------;
-    np.random.seed(1337) #For reproducability
-    #
-    realz_list = [522, 1043, 2087, 4175, 6263, 10439]
+    realz_list = [204, 408, 816, 1632, 2446, 3278] #v3 sizes (not the v2 sizes 522 to 10439; see above)
+    alpha      = 0.5 #0.1 to 0.5; None --> lam = 0.5 (average)
+    beta       = 0.5 #0.1 to 0.5
+    seed       = 1337 #For reproducability (same shards for any num_procs)
+    shard_size = 100000 #Pairs per shard
+    num_procs  = multiprocessing.cpu_count()
 
-    #======================;
-    #  3. Initializations  ;
-    #======================;
-    alpha = 0.5 #0.1 to 0.5
-    beta  = 0.5 #0.1 to 0.5
-    #
-    i = 0
-    num_realz = realz_list[i]
-    k         = 2
-    comb_list = get_all_unique_pairs(num_realz,k) #Unique pairs
-    print(comb_list)
-    print('Num realz and comb = ', num_realz, \
-                comb_list.shape, int(0.5*num_realz*(num_realz-1))) #size (0.5*n*(n-1),2)
-    print('\n')
+    #==================================================;
+    #  3. Materialize mixup shards of each train size  ;
+    #==================================================;
+    for num_mix in realz_list:
+        mask        = train_mask[0:num_mix]
+        data_dict   = {name: np.ascontiguousarray(x_data[0:num_mix][mask,:]) \
+                        for name, x_data in train_dict.items()}
+        path_shards = path_mixup_data + sclr_name + "_Train_" + str(num_mix) + "/"
+        manifest    = run_mixup_materializer(path_shards, data_dict, shard_size, num_procs, \
+                                                alpha, beta, seed = seed)
+        print('Num realz, pairs, and shards = ', manifest['num_realz'], \
+                manifest['num_pairs'], manifest['num_shards'])
 
     #======================;
     # End processing time  ;
     #======================;
     toc = time.perf_counter()
-    print('Time elapsed in seconds = ', toc - tic)
\ No newline at end of file
+    print('Time elapsed in seconds = ', toc - tic)
@@ -0,0 +1,73 @@
+# Outlier-filter stage for train/val/test splits (vectorized)
+#   Non-outlier realizations are those with pre-processed NPV > -1
+#   The boolean mask is computed once with numpy and saved next to the split
+#   index files (Data/Train_Val_Test_Indices/) so training does not recompute it
+#   Boolean masks keep the original row order of each split (reproducible results)
+#
+# Neglect list (StandardScaler, NPV)
+#	TRAIN --> [57, 991, 1091, 1566, 2026, 2128, 2253, 2295, 2299, 2494, 2703, 2792, 3048, 3061]
+#	VAL   --> [349]
+#	TEST  --> [98, 201, 261]
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import numpy as np
+
+#==============================================================;
+#  Function-1: Non-outlier mask of a split (True = use realz)  ;
+#==============================================================;
+def get_outlier_mask(q_data, threshold = -1.0):
+
+    #-----------------------------------------------------;
+    #  Keep realz whose outputs are all above threshold   ;
+    #  (q_data is (num_split, num_q) pre-processed data)  ;
+    #-----------------------------------------------------;
+    q_data = np.asarray(q_data)
+    mask   = np.all(q_data.reshape(q_data.shape[0], -1) > threshold, axis = 1) #(num_split,)
+
+    return mask
+
+#======================================================;
+#  Function-2: Mask file name (next to split indices)  ;
+#======================================================;
+def get_mask_name(path_ind, split_name, sclr_name, geodt_out, num_split):
+
+    #----------------------------------------------------------------;
+    #  e.g., Data/Train_Val_Test_Indices/Train_Mask_ss_npv_3278.npy  ;
+    #----------------------------------------------------------------;
+    mask_name = path_ind + split_name.capitalize() + "_Mask_" + sclr_name + "_" + \
+                geodt_out + str(num_split) + ".npy"
+
+    return mask_name
+
+#===========================================;
+#  Function-3: Save non-outlier split mask  ;
+#===========================================;
+def save_outlier_mask(path_ind, split_name, sclr_name, geodt_out, num_split, mask):
+
+    #-----------------------------;
+    #  Boolean mask (num_split,)  ;
+    #-----------------------------;
+    np.save(get_mask_name(path_ind, split_name, sclr_name, geodt_out, num_split), \
+            np.asarray(mask, dtype = bool))
+
+#============================================================;
+#  Function-4: Load non-outlier split mask (or compute one)  ;
+#============================================================;
+def load_outlier_mask(path_ind, split_name, sclr_name, geodt_out, num_split, q_data = None):
+
+    #------------------------------------------------------------;
+    #  Persisted mask from get_preprocessed_data.py if present,  ;
+    #  otherwise compute it in memory from the q-data            ;
+    #------------------------------------------------------------;
+    mask_name = get_mask_name(path_ind, split_name, sclr_name, geodt_out, num_split)
+    #
+    if os.path.exists(mask_name):
+        mask = np.load(mask_name)
+    elif q_data is not None:
+        mask = get_outlier_mask(q_data)
+    else:
+        raise FileNotFoundError(mask_name + ' not found (run get_preprocessed_data.py)')
+
+    return mask
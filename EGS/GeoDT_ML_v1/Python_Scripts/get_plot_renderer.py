@@ -0,0 +1,203 @@
+# Deferred plotting of the trained DNN models (off the training path)
+#   Training (get_trained_models/get_trained_ensemble) only writes a compact
+#   Diagnostics.npz file into each model folder, e.g.,
+#	1_InvDNNModel_ss_th/<model_id>_model/Diagnostics.npz
+#   with loss, val_loss, and ground truth/prediction (normalized and inverse
+#   transformed) of train/val/test as float32 arrays
+#   This renderer makes the plots (Loss.png, Q_*.png, IT_*.png) later for the
+#   top-k models of the completion manifest or for given model ids:
+#	Agg backend (no display), a pool of processes, and ONE figure per process
+#	that is cleared and reused for all plots
+#
+# python get_plot_renderer.py (top_k models of path_models; see below)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import time
+import multiprocessing
+import numpy as np
+#
+import matplotlib
+matplotlib.use('Agg') #Before pyplot (no display; fast png files)
+import matplotlib.pyplot as plt
+
+from get_sweep_manifest import get_model_results
+
+_fig = None #Figure of this process (reused by all plots)
+
+#=======================================================;
+#  Function-1: Save loss and predictions of a model     ;
+#              (split_dict = {split: (q, pred_q, q_it,  ;
+#               pred_q_it)}; train/val/test)            ;
+#=======================================================;
+def save_diagnostics(path_fl_sav, loss, val_loss, split_dict):
+
+    #--------------------------------------------------;
+    #  float32 arrays in one *.npz file; atomic write  ;
+    #--------------------------------------------------;
+    arrays = {'loss': np.asarray(loss, dtype = np.float32), \
+                'val_loss': np.asarray(val_loss, dtype = np.float32)}
+    #
+    for split, (q, pred_q, q_it, pred_q_it) in split_dict.items():
+        arrays['q_' + split]         = np.asarray(q, dtype = np.float32)
+        arrays['pred_q_' + split]    = np.asarray(pred_q, dtype = np.float32)
+        arrays['q_it_' + split]      = np.asarray(q_it, dtype = np.float32)
+        arrays['pred_q_it_' + split] = np.asarray(pred_q_it, dtype = np.float32)
+    #
+    fl_name  = path_fl_sav + "Diagnostics.npz"
+    tmp_name = path_fl_sav + "Diagnostics." + str(os.getpid()) + ".tmp.npz"
+    np.savez(tmp_name, **arrays)
+    os.replace(tmp_name, fl_name)
+
+#================================================;
+#  Function-2: Figure of this process (cleared)  ;
+#================================================;
+def get_figure():
+
+    global _fig
+    #
+    if _fig is None:
+        #plt.rc('text', usetex = True)
+        plt.rcParams['font.family']     = ['sans-serif']
+        plt.rcParams['font.sans-serif'] = ['Lucida Grande']
+        plt.rc('legend', fontsize = 14)
+        _fig = plt.figure()
+    else:
+        _fig.clf()
+
+    return _fig
+
+#=========================================================;
+#  Function-3: Plot training and validation loss ('mse')  ;
+#=========================================================;
+def plot_tv_loss(loss, val_loss, path_fl_sav):
+
+    #---------------------;
+    #  Plot loss ('mse')  ;
+    #---------------------;
+    fig    = get_figure()
+    epochs = len(loss)
+    #
+    ax = fig.add_subplot(111)
+    ax.set_xlabel('Epoch', fontsize = 24, fontweight = 'bold')
+    ax.set_ylabel('Loss (MSE)', fontsize = 24, fontweight = 'bold')
+    ax.tick_params(axis = 'both', which = 'major', labelsize = 20, length = 6, width = 2)
+    ax.set_xlim([0, epochs])
+    e_list = [i for i in range(0,epochs)]
+    ax.plot(e_list, loss, linestyle = 'solid', linewidth = 1.5, \
+                    color = 'b', label = 'Training') #Training loss
+    ax.plot(e_list, val_loss, linestyle = 'solid', linewidth = 1.5, \
+                    color = 'm', label = 'Validation') #Validation loss
+    ax.legend(loc = 'upper right')
+    fig.tight_layout()
+    fig.savefig(path_fl_sav + 'Loss.png')
+
+#======================================================================;
+#  Function-4: Plot one-to-one for train/val/test (All GeoDT outputs)  ;
+#======================================================================;
+def plot_gt_pred(x, y, param_id, fl_name, str_x_label, str_y_label):
+
+    #------------------------------------------------;
+    #  Plot one-to-one (ground truth vs. predicted)  ;
+    #------------------------------------------------;
+    fig = get_figure()
+    #
+    ax = fig.add_subplot(111)
+    ax.set_xlabel(str_x_label, fontsize = 14, fontweight = 'bold')
+    ax.set_ylabel(str_y_label, fontsize = 14, fontweight = 'bold')
+    ax.tick_params(axis = 'both', which = 'major', labelsize = 20, length = 6, width = 2)
+    min_val = np.min(x)
+    max_val = np.max(x)
+    ax.set_xlim([min_val, max_val])
+    ax.set_ylim([min_val, max_val])
+    ax.plot([min_val, max_val], [min_val, max_val], \
+                    linestyle = 'solid', linewidth = 1.5, \
+                    color = 'r') #One-to-One line
+    ax.scatter(x, y, color = 'b', marker = 'o')
+    ax.set_aspect(1./ax.get_data_ratio())
+    fig.tight_layout()
+    fig.savefig(fl_name + str(param_id) + '.png')
+
+#=============================================================;
+#  Function-5: All plots of a model from Diagnostics.npz      ;
+#              (Loss, Q_* (normalized), IT_* (GeoDT output))  ;
+#=============================================================;
+def render_model_plots(path_fl_sav, out_name = 'NPV'):
+
+    #------------------------------------------------;
+    #  Models without diagnostics (not trained) are  ;
+    #  skipped; returns the number of png files      ;
+    #------------------------------------------------;
+    fl_name = path_fl_sav + "Diagnostics.npz"
+    if not os.path.exists(fl_name):
+        print('No diagnostics: ' + path_fl_sav)
+        return 0
+    #
+    with np.load(fl_name) as data:
+        plot_tv_loss(data['loss'], data['val_loss'], path_fl_sav)
+        num_plots = 1
+        #
+        for split in ['train', 'val', 'test']:
+            if 'q_' + split not in data:
+                continue
+            plot_gt_pred(data['q_' + split][:,0], data['pred_q_' + split][:,0], 0, \
+                            path_fl_sav + "Q_" + split + "_", \
+                            'Normalized ground truth (' + out_name + ')', \
+                            'Normalized prediction (' + out_name + ')')
+            plot_gt_pred(data['q_it_' + split][:,0], data['pred_q_it_' + split][:,0], 0, \
+                            path_fl_sav + "IT_" + split + "_", \
+                            'Ground truth (' + out_name + ')', 'Prediction (' + out_name + ')')
+            num_plots = num_plots + 2
+
+    return num_plots
+
+#================================================================;
+#  Function-6: Model ids with the smallest min val loss (top-k)  ;
+#              (done records of the completion manifest;         ;
+#               diverged models (NaN) are not ranked)            ;
+#================================================================;
+def get_top_k_model_ids(path_manifest, top_k):
+
+    model_results = {k: v for k, v in get_model_results(path_manifest).items() \
+                        if v is not None and not np.isnan(v)}
+    model_ids     = sorted(model_results.keys(), key = lambda k: (model_results[k], k))
+
+    return model_ids[0:top_k]
+
+#==========================================================;
+#  Function-7: Render plots of models (pool of processes)  ;
+#==========================================================;
+def run_renderer(path_models, model_id_list, num_procs = 1):
+
+    #---------------------------------------------------;
+    #  One task per model; each process keeps a figure  ;
+    #---------------------------------------------------;
+    tic       = time.perf_counter()
+    path_list = [path_models + str(k) + "_model/" for k in model_id_list]
+    #
+    if num_procs > 1:
+        with multiprocessing.Pool(processes = num_procs) as pool:
+            num_plots = pool.map(render_model_plots, path_list, chunksize = 1)
+    else:
+        num_plots = [render_model_plots(path_fl_sav) for path_fl_sav in path_list]
+    #
+    print('Models, plots, time in seconds = ', len(path_list), sum(num_plots), \
+            time.perf_counter() - tic)
+
+    return num_plots
+
+#***************************************************;
+#  Render plots of the top-k models (or given ids)  ;
+#***************************************************;
+if __name__ == '__main__':
+
+    path_models   = '/tahoma/emsle60558/test_dl_1/1_ML4GeoDT_v3/1_InvDNNModel_ss_th/' #hp-dl-model folders
+    path_manifest = path_models + "Manifest/" #Completion manifest (done models)
+    top_k         = 20 #Models with the smallest min val loss
+    model_id_list = None #On demand, e.g., [1, 2, 3] (overrides top_k)
+    num_procs     = 8
+    #
+    if model_id_list is None:
+        model_id_list = get_top_k_model_ids(path_manifest, top_k)
+    run_renderer(path_models, model_id_list, num_procs)
@@ -16,8 +16,10 @@
 # Train/Val/Test splits:
 #   Val = 10%, Test = 10%
 #   Train --> 5%, 10%, 20%, 40%, 60%, and 80%
+#   (one pre-processed *.npy per quantity in [train | val | test] order,
+#    e.g., PreProcessed_Data/ss_p_4078.npy; splits are memory-mapped views)
 #
-# Neglect list
+# Neglect list (non-outlier masks saved in Data/Train_Val_Test_Indices/)
 #	TRAIN --> [57, 991, 1091, 1566, 2026, 2128, 2253, 2295, 2299, 2494, 2703, 2792, 3048, 3061]
 #	VAL   --> [349]
 #	TEST  --> [98, 201, 261]
@@ -42,6 +44,10 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.preprocessing import RobustScaler
 from sklearn.preprocessing import QuantileTransformer
 from sklearn.preprocessing import PowerTransformer
+#
+from get_outlier_mask import get_outlier_mask, save_outlier_mask
+from get_columnar_store import load_csv_column_group
+from get_split_views import get_split_order, get_split_indices, save_split_array, load_split_views
 
 np.set_printoptions(precision=2)
 print("sklearn version = ", sklearn.__version__)
@@ -95,23 +101,21 @@ path_ind       = path + 'Data/Train_Val_Test_Indices/' #Train/Val/Test indices
 path_pp_models = path + 'Data/PreProcess_Models/' #Pre-processing models for standardization
 path_pp_data   = path + 'Data/PreProcessed_Data/' #Pre-processed data
 path_raw_data  = path + 'Data/Raw_Data/' #Raw data
+path_store     = path + 'Data/Columnar_Data/' #Binary columnar store (get_inp_out.py)
 
 #**************************************************************;
 #  2a. GeoDT data for pre-processing                           ;
 #      (make sure if some GeoDT parameters should be non-neg)  ;
+#      (memory-mapped column groups; .csv is converted once)   ;
 #**************************************************************;
-df_p         = pd.read_csv(path_geodt + 'geodt_params.csv', index_col = 0) #[4078 rows x 117 columns]
-df_hpro      = pd.read_csv(path_geodt + 'hpro.csv', index_col = 0) #[4078 rows x 40 columns]
-df_pout      = pd.read_csv(path_geodt + 'pout.csv', index_col = 0) #[4078 rows x 40 columns]
-df_npv       = pd.read_csv(path_geodt + 'npv.csv', index_col = 0) #[4078 rows x 1 columns]
-#
-geodt_p_list = df_p.columns.to_list() #GeoDT params list -- A total of 117; length = 117
-t_list       = df_hpro.columns.to_list() #time-step list -- A total of 40; length = 40
-#
-x_p          = df_p.values #Matrix of values for GeoDT params -- 4078 realz; (4078, 117)
-x_hpro       = df_hpro.values #Matrix of values of hpro -- 4078 realz; (4078, 40)
-x_pout       = df_pout.values #Matrix of values of pout -- 4078 realz; (4078, 40)
-x_npv        = df_npv.values #Matrix of values of npv -- 4078 realz; (4078,)
+x_p, geodt_p_list = load_csv_column_group(path_store, 'params', \
+                        path_geodt + 'geodt_params.csv') #GeoDT params -- 4078 realz; (4078, 117) and 117 names
+x_hpro, t_list    = load_csv_column_group(path_store, 'hpro', \
+                        path_geodt + 'hpro.csv') #hpro -- 4078 realz; (4078, 40) and 40 time-steps
+x_pout, _         = load_csv_column_group(path_store, 'pout', \
+                        path_geodt + 'pout.csv') #pout -- 4078 realz; (4078, 40)
+x_npv, _          = load_csv_column_group(path_store, 'npv', \
+                        path_geodt + 'npv.csv') #npv -- 4078 realz; (4078, 1)
 #
 print(np.argwhere(np.isnan(x_hpro)))
 print(np.argwhere(np.isnan(x_pout)))
@@ -121,62 +125,25 @@ print(np.argwhere(np.isnan(x_npv)))
 #  3. Develop train/val/test splits              ;
 #     Val = 10%, Test = 10%					     ;
 #     Train --> 5%, 10%, 20%, 40%, 60%, and 80%  ;
+#     (split-view layer; get_split_views.py)     ;
 #************************************************;
 num_realz  = 4078 #No. of realization (total realz data)
 num_train  = 3278 #Training realz
 num_val    = 400 #Validation realz
 num_test   = 400 #Testing realz
 #
-train_index_list = np.genfromtxt(path_ind + "Train_Realz_" + str(num_train) + ".txt", \
-									dtype = int, skip_header = 1) #(3278,)  
-val_index_list   = np.genfromtxt(path_ind + "Val_Realz_" + str(num_val) + ".txt", \
-									dtype = int, skip_header = 1) #(400,)
-test_index_list  = np.genfromtxt(path_ind + "Test_Realz_" + str(num_test) + ".txt", \
-									dtype = int, skip_header = 1) #(400,)
-#
-train_raw_hpro  = x_hpro[train_index_list-1,:] #Raw training data (3278, 40)
-val_raw_hpro    = x_hpro[val_index_list-1,:] #Raw val data (400, 40)
-test_raw_hpro   = x_hpro[test_index_list-1,:] #Raw test data (400, 40)
-#
-train_raw_pout  = x_pout[train_index_list-1,:] #Raw training data (3278, 40)
-val_raw_pout    = x_pout[val_index_list-1,:] #Raw val data (400, 40)
-test_raw_pout   = x_pout[test_index_list-1,:] #Raw test data (400, 40)
-#
-train_raw_npv   = x_npv[train_index_list-1,:] #Raw training data (3278, 1)
-val_raw_npv     = x_npv[val_index_list-1,:] #Raw val data (400, 1)
-test_raw_npv    = x_npv[test_index_list-1,:] #Raw test data (400, 1)
-#
-train_raw_p     = x_p[train_index_list-1,:] #Raw training data (3278, 117)
-val_raw_p       = x_p[val_index_list-1,:] #Raw val data (400, 117)
-test_raw_p      = x_p[test_index_list-1,:] #Raw test data (400, 117)
-#
-np.save(path_raw_data + "train_raw_hpro_" + str(num_train) + ".npy", \
-		train_raw_hpro) #Save train ground truth (3278, 40) in *.npy file
-np.save(path_raw_data + "val_raw_hpro_" + str(num_val) + ".npy", \
-		val_raw_hpro) #Save val ground truth (400, 40) in *.npy file
-np.save(path_raw_data + "test_raw_hpro_"  + str(num_test) + ".npy", \
-		test_raw_hpro) #Save test ground truth (400, 40) in *.npy file
-#
-np.save(path_raw_data + "train_raw_pout_" + str(num_train) + ".npy", \
-		train_raw_pout) #Save train ground truth (3278, 40) in *.npy file
-np.save(path_raw_data + "val_raw_pout_" + str(num_val) + ".npy", \
-		val_raw_pout) #Save val ground truth (400, 40) in *.npy file
-np.save(path_raw_data + "test_raw_pout_"  + str(num_test) + ".npy", \
-		test_raw_pout) #Save test ground truth (400, 40) in *.npy file
-#
-np.save(path_raw_data + "train_raw_npv_" + str(num_train) + ".npy", \
-		train_raw_npv) #Save train ground truth (3278, 1) in *.npy file
-np.save(path_raw_data + "val_raw_npv_" + str(num_val) + ".npy", \
-		val_raw_npv) #Save val ground truth (400, 1) in *.npy file
-np.save(path_raw_data + "test_raw_npv_"  + str(num_test) + ".npy", \
-		test_raw_npv) #Save test ground truth (400, 1) in *.npy file
-#
-np.save(path_raw_data + "train_raw_p_" + str(num_train) + ".npy", \
-		train_raw_p) #Save train ground truth (3278, 117) in *.npy file
-np.save(path_raw_data + "val_raw_p_" + str(num_val) + ".npy", \
-		val_raw_p) #Save val ground truth (400, 117) in *.npy file
-np.save(path_raw_data + "test_raw_p_"  + str(num_test) + ".npy", \
-		test_raw_p) #Save test ground truth (400, 117) in *.npy file
+split_order      = get_split_order(path_ind, num_realz) #(4078,) -- [train | val | test] rows (0-based)
+split_index      = get_split_indices(path_ind, num_realz, num_train, \
+									num_val, num_test) #0-based rows of each split (persisted order)
+train_index_list = split_index['train'] #(3278,)
+#
+train_raw_hpro  = x_hpro[train_index_list,:] #Raw training data (3278, 40) -- fit pre-processors
+train_raw_pout  = x_pout[train_index_list,:] #Raw training data (3278, 40)
+train_raw_npv   = x_npv[train_index_list,:] #Raw training data (3278, 1)
+train_raw_p     = x_p[train_index_list,:] #Raw training data (3278, 117)
+#
+#Raw val/test (and train) data are NOT saved as separate *.npy files;
+#they are rows of the columnar store (x_p, x_hpro, x_pout, x_npv) at split_index
 
 #*******************************************;
 #  4. Pre-processing using Standard Scalar  ;
@@ -205,80 +172,52 @@ hpro_ss        = pickle.load(open(hpro_name, 'rb')) #Load already created hpro s
 pout_ss        = pickle.load(open(pout_name, 'rb')) #Load already created pout standard-scalar model
 npv_ss         = pickle.load(open(npv_name, 'rb')) #Load already created npv standard-scalar model
 #
-train_ss_p     = pp_ss.transform(train_raw_p) #Transform GeoDT-params (3278, 117)
-val_ss_p       = pp_ss.transform(val_raw_p) #Transform GeoDT-params (400, 117)
-test_ss_p      = pp_ss.transform(test_raw_p) #Transform GeoDT-params (400, 117)
-#
-train_ss_hpro  = hpro_ss.transform(train_raw_hpro) #Transform train hpro (3278, 40)
-val_ss_hpro    = hpro_ss.transform(val_raw_hpro) #Transform val hpro (400, 40)
-test_ss_hpro   = hpro_ss.transform(test_raw_hpro) #Transform test hpro (400, 40)
-#
-train_ss_pout  = pout_ss.transform(train_raw_pout) #Transform train pout (3278, 40)
-val_ss_pout    = pout_ss.transform(val_raw_pout) #Transform val pout (400, 40)
-test_ss_pout   = pout_ss.transform(test_raw_pout) #Transform test pout (400, 40)
-#
-train_ss_npv = npv_ss.transform(train_raw_npv) #Transform train npv (3278, 1)
-val_ss_npv   = npv_ss.transform(val_raw_npv) #Transform val npv (400, 1)
-test_ss_npv  = npv_ss.transform(test_raw_npv) #Transform test npv (400, 1)
-#
-np.save(path_pp_data + "train_ss_p_" + str(num_train) + ".npy", \
-		train_ss_p) #Save train ground truth (3278, 117) in *.npy file
-np.save(path_pp_data + "val_ss_p_" + str(num_val) + ".npy", \
-		val_ss_p) #Save val ground truth (400, 117) in *.npy file
-np.save(path_pp_data + "test_ss_p_"  + str(num_test) + ".npy", \
-		test_ss_p) #Save test ground truth (400, 117) in *.npy file
-#
-np.save(path_pp_data + "train_ss_hpro_" + str(num_train) + ".npy", \
-		train_ss_hpro) #Save train ground truth (3278, 40) in *.npy file
-np.save(path_pp_data + "val_ss_hpro_" + str(num_val) + ".npy", \
-		val_ss_hpro) #Save val ground truth (400, 40) in *.npy file
-np.save(path_pp_data + "test_ss_hpro_"  + str(num_test) + ".npy", \
-		test_ss_hpro) #Save test ground truth (400, 40) in *.npy file
-#
-np.save(path_pp_data + "train_ss_pout_" + str(num_train) + ".npy", \
-		train_ss_pout) #Save train ground truth (3278, 40) in *.npy file
-np.save(path_pp_data + "val_ss_pout_" + str(num_val) + ".npy", \
-		val_ss_pout) #Save val ground truth (400, 40) in *.npy file
-np.save(path_pp_data + "test_ss_pout_"  + str(num_test) + ".npy", \
-		test_ss_pout) #Save test ground truth (400, 40) in *.npy file
-#
-np.save(path_pp_data + "train_ss_npv_" + str(num_train) + ".npy", \
-		train_ss_npv) #Save train ground truth (3278, 1) in *.npy file
-np.save(path_pp_data + "val_ss_npv_" + str(num_val) + ".npy", \
-		val_ss_npv) #Save val ground truth (400, 1) in *.npy file
-np.save(path_pp_data + "test_ss_npv_"  + str(num_test) + ".npy", \
-		test_ss_npv) #Save test ground truth (400, 1) in *.npy file
-#
-counter = 0
-train_neglect_list = []
-#
-for i in train_ss_npv: #Neglect train-counter = 0 to 13
-	if i <= -1:
-		print('Train = ', counter, i)
-		train_neglect_list.append(counter)
-	counter = counter + 1
-
-counter = 0
-val_neglect_list = []
-#
-for i in val_ss_npv: #Neglect val-counter = 0
-	if i <= -1:
-		print('Val = ', counter, i)
-		val_neglect_list.append(counter)
-	counter = counter + 1
-
-counter = 0
-test_neglect_list = []
-#
-for i in test_ss_npv: #Neglect test-counter = 0 to 2
-	if i <= -1:
-		print('Test = ', counter, i)
-		test_neglect_list.append(counter)
-	counter = counter + 1
-
-train_nn_list      = np.array(list(set(range(0,num_train)) - set(train_neglect_list)), dtype = int) #(3264,)
-val_nn_list        = np.array(list(set(range(0,num_val)) - set(val_neglect_list)), dtype = int) #(399,)
-test_nn_list       = np.array(list(set(range(0,num_test)) - set(test_neglect_list)), dtype = int) #(397,)
+ss_p_name      = path_pp_data + "ss_p_" + str(num_realz) + ".npy"
+ss_hpro_name   = path_pp_data + "ss_hpro_" + str(num_realz) + ".npy"
+ss_pout_name   = path_pp_data + "ss_pout_" + str(num_realz) + ".npy"
+ss_npv_name    = path_pp_data + "ss_npv_" + str(num_realz) + ".npy"
+#
+save_split_array(ss_p_name, pp_ss.transform(x_p[split_order,:])) #Transform GeoDT-params (4078, 117) in split order
+save_split_array(ss_hpro_name, hpro_ss.transform(x_hpro[split_order,:])) #Transform hpro (4078, 40) in split order
+save_split_array(ss_pout_name, pout_ss.transform(x_pout[split_order,:])) #Transform pout (4078, 40) in split order
+save_split_array(ss_npv_name, npv_ss.transform(x_npv[split_order,:])) #Transform npv (4078, 1) in split order
+#
+ss_p_views     = load_split_views(ss_p_name, num_realz, num_train, num_val, num_test) #Memory-mapped views
+ss_hpro_views  = load_split_views(ss_hpro_name, num_realz, num_train, num_val, num_test)
+ss_pout_views  = load_split_views(ss_pout_name, num_realz, num_train, num_val, num_test)
+ss_npv_views   = load_split_views(ss_npv_name, num_realz, num_train, num_val, num_test)
+#
+train_ss_p     = ss_p_views['train'] #GeoDT-params (3278, 117)
+val_ss_p       = ss_p_views['val'] #GeoDT-params (400, 117)
+test_ss_p      = ss_p_views['test'] #GeoDT-params (400, 117)
+#
+train_ss_hpro  = ss_hpro_views['train'] #Train hpro (3278, 40)
+val_ss_hpro    = ss_hpro_views['val'] #Val hpro (400, 40)
+test_ss_hpro   = ss_hpro_views['test'] #Test hpro (400, 40)
+#
+train_ss_pout  = ss_pout_views['train'] #Train pout (3278, 40)
+val_ss_pout    = ss_pout_views['val'] #Val pout (400, 40)
+test_ss_pout   = ss_pout_views['test'] #Test pout (400, 40)
+#
+train_ss_npv   = ss_npv_views['train'] #Train npv (3278, 1)
+val_ss_npv     = ss_npv_views['val'] #Val npv (400, 1)
+test_ss_npv    = ss_npv_views['test'] #Test npv (400, 1)
+#
+train_mask         = get_outlier_mask(train_ss_npv) #Non-outlier mask (NPV > -1); (3278,)
+val_mask           = get_outlier_mask(val_ss_npv) #Non-outlier mask (NPV > -1); (400,)
+test_mask          = get_outlier_mask(test_ss_npv) #Non-outlier mask (NPV > -1); (400,)
+#
+save_outlier_mask(path_ind, "train", "ss", "npv_", num_train, train_mask) #Train_Mask_ss_npv_3278.npy
+save_outlier_mask(path_ind, "val", "ss", "npv_", num_val, val_mask) #Val_Mask_ss_npv_400.npy
+save_outlier_mask(path_ind, "test", "ss", "npv_", num_test, test_mask) #Test_Mask_ss_npv_400.npy
+#
+print('Train = ', np.flatnonzero(~train_mask)) #Neglect train-counter = 0 to 13
+print('Val = ', np.flatnonzero(~val_mask)) #Neglect val-counter = 0
+print('Test = ', np.flatnonzero(~test_mask)) #Neglect test-counter = 0 to 2
+#
+train_nn_list      = np.flatnonzero(train_mask) #(3264,) -- row order is kept
+val_nn_list        = np.flatnonzero(val_mask) #(399,)
+test_nn_list       = np.flatnonzero(test_mask) #(397,)
 #
 str_x_label = 'Training hpro values' 
 str_y_label = 'Probability density'
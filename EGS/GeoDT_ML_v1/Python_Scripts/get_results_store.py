@@ -0,0 +1,146 @@
+# Results store of the DNN sweep (one SQLite database for all models)
+#   Every trained model appends ONE compact record, e.g.,
+#	1_InvDNNModel_ss_th/Results.db --> table 'results'
+#   with model_id, hyperparameters, min val loss and its epoch, train/val/test
+#   R2-scores (normalized NPV), training/total time, host, and pid
+#   WAL journal mode: many pool workers/MPI ranks write concurrently (writers
+#   wait on the lock, readers never block); records of a re-run replace the old
+#   Indexed columns --> top-k models and per-hyperparameter aggregates in ms
+#   (no grep of the stdout log or reading 21875 FwdDNNModel_Loss files)
+#
+# Usage:
+#	save_model_result(path_models + "Results.db", model_id, hp, min_val_loss, min_epoch, r2_dict, train_time, total_time)
+#	top_list = get_top_k_results(path_models + "Results.db", 10)
+#	agg_list = get_hp_aggregates(path_models + "Results.db", 'batch_size')
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import time
+import socket
+import sqlite3
+import numpy as np
+
+_connections = {} #Process-level connections {(fl_db, pid): sqlite3 connection}
+#
+HP_COLUMNS   = ['num_layers', 'neurons', 'dropout_value', 'alpha_value', 'lr_values', 'epochs', 'batch_size']
+
+#==================================================================;
+#  Function-1: Connection to the results store (WAL; per process)  ;
+#==================================================================;
+def get_results_store(fl_db):
+
+    #------------------------------------------------------------;
+    #  Table and indexes are created on first use; busy writers  ;
+    #  wait up to 10 min for the lock (1000s of processes)       ;
+    #------------------------------------------------------------;
+    key = (fl_db, os.getpid()) #No connections inherited from a forked parent
+    if key in _connections:
+        return _connections[key]
+    #
+    conn = sqlite3.connect(fl_db, timeout = 600.0)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL") #WAL is safe with NORMAL (no fsync per commit)
+    with conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS results (" \
+                        "model_id INTEGER PRIMARY KEY, num_layers INTEGER, neurons TEXT, " \
+                        "dropout_value REAL, alpha_value REAL, lr_values REAL, epochs INTEGER, " \
+                        "batch_size INTEGER, min_val_loss REAL, min_epoch INTEGER, " \
+                        "train_r2 REAL, val_r2 REAL, test_r2 REAL, train_time REAL, total_time REAL, " \
+                        "host TEXT, pid INTEGER, time_stamp TEXT)")
+        for column in ['min_val_loss'] + HP_COLUMNS:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_" + column + " ON results (" + column + ")")
+    _connections[key] = conn
+
+    return conn
+
+#========================================================;
+#  Function-2: R2-score of a model (ground truth, pred)  ;
+#========================================================;
+def get_r2_score(y_true, y_pred):
+
+    y_true = np.asarray(y_true, dtype = float).flatten()
+    y_pred = np.asarray(y_pred, dtype = float).flatten()
+    ss_tot = np.sum((y_true - np.mean(y_true))**2)
+
+    return float(1.0 - np.sum((y_true - y_pred)**2) / ss_tot) if ss_tot > 0 else float('nan')
+
+#==============================================================;
+#  Function-3: Value of a nullable column (None/NaN --> NULL)  ;
+#==============================================================;
+def get_sql_value(value, cast = float):
+
+    if value is None or np.isnan(float(value)):
+        return None
+
+    return cast(value)
+
+#================================================================;
+#  Function-4: Save the record of a trained model (one row)      ;
+#              (r2_dict = {'train': r2, 'val': r2, 'test': r2};  ;
+#               diverged model --> NULL min val loss and epoch)  ;
+#================================================================;
+def save_model_result(fl_db, model_id, hp, min_val_loss, min_epoch, r2_dict, \
+                        train_time = None, total_time = None):
+
+    record = (int(model_id), hp['num_layers'], "-".join([str(i) for i in hp['neurons']]), \
+                hp['dropout_value'], hp['alpha_value'], hp['lr_values'], hp['epochs'], \
+                hp['batch_size'], get_sql_value(min_val_loss), get_sql_value(min_epoch, int), \
+                get_sql_value(r2_dict.get('train')), get_sql_value(r2_dict.get('val')), \
+                get_sql_value(r2_dict.get('test')), get_sql_value(train_time), \
+                get_sql_value(total_time), socket.gethostname(), os.getpid(), \
+                time.strftime('%Y-%m-%d %H:%M:%S'))
+    #
+    conn = get_results_store(fl_db)
+    with conn: #One transaction (commit)
+        conn.execute("INSERT OR REPLACE INTO results VALUES (" + ",".join(["?"] * len(record)) + ")", \
+                        record)
+
+#==================================================;
+#  Function-5: Rows of a query as a list of dicts  ;
+#==================================================;
+def get_query_rows(fl_db, query, params = ()):
+
+    cursor  = get_results_store(fl_db).execute(query, params)
+    columns = [c[0] for c in cursor.description]
+
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+#==================================================================;
+#  Function-6: Top-k models (smallest min val loss)                ;
+#              (optional filter, e.g., where = "batch_size = 64")  ;
+#==================================================================;
+def get_top_k_results(fl_db, top_k = 10, where = None):
+
+    query = "SELECT * FROM results" + ("" if where is None else " WHERE " + where) + \
+            " ORDER BY min_val_loss IS NULL, min_val_loss ASC LIMIT ?" #Diverged models (NULL) last
+
+    return get_query_rows(fl_db, query, (int(top_k),))
+
+#================================================================;
+#  Function-7: Aggregates of min val loss/R2 per hyperparameter  ;
+#              (hp_name in HP_COLUMNS; one row per hp value)     ;
+#================================================================;
+def get_hp_aggregates(fl_db, hp_name):
+
+    if hp_name not in HP_COLUMNS:
+        raise ValueError("Unknown hyperparameter: " + str(hp_name))
+    #
+    query = "SELECT " + hp_name + ", COUNT(*) AS num_models, MIN(min_val_loss) AS min_val_loss, " \
+            "AVG(min_val_loss) AS mean_val_loss, AVG(test_r2) AS mean_test_r2, " \
+            "AVG(total_time) AS mean_time FROM results GROUP BY " + hp_name + " ORDER BY " + hp_name
+
+    return get_query_rows(fl_db, query)
+
+#***************************************************;
+#  Top-k models and aggregates of a finished sweep  ;
+#***************************************************;
+if __name__ == '__main__':
+
+    fl_db = '/tahoma/emsle60558/test_dl_1/1_ML4GeoDT_v3/1_InvDNNModel_ss_th/Results.db'
+    #
+    for row in get_top_k_results(fl_db, 10):
+        print(row)
+    for hp_name in HP_COLUMNS:
+        for row in get_hp_aggregates(fl_db, hp_name):
+            print(row)
@@ -0,0 +1,346 @@
+# Parallel sensitivity engine (F-test and mutual information)
+#   F-test of all time-steps at once: correlations of the inputs with every
+#   output column from one matrix product (same F and p-values as
+#   f_regression; several outputs, e.g., hpro/pout/dhout, are stacked into
+#   the same product; check_f_regression compares with sklearn in the
+#   tests only, as it runs f_regression column by column)
+#   Mutual information (Kraskov kNN estimator, the dominant cost): inputs
+#   are scaled, perturbed with the noise of mutual_info_regression, and
+#   sorted ONCE; each target column only adds its joint (x, y) kNN queries
+#   (cKDTree) and the marginal counts are binary searches in the shared
+#   sorted columns (no KD-trees per feature and target)
+#   Target columns are fanned out over joblib workers (loky processes;
+#   the calling script is not re-executed by the workers)
+#   Same random_state --> same values as mutual_info_regression of each column
+#   Large datasets (e.g., 46057 realz): MI on stratified subsamples, with
+#   replicates in parallel until the feature ranking is stable; mean MI and
+#   confidence bands per feature/time-step (get_ftest_mi_subsampled)
+#
+# Usage (get_ftest_mi_others.py):
+#	sens_dict = get_ftest_mi_parallel(p_geodt, {'hpro': hpro_geodt, 'pout': pout_geodt})
+#	f_test_hpro_arr, mi_hpro_arr = sens_dict['hpro'] #(63,37) each
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import scipy.stats
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.spatial import cKDTree
+from scipy.special import digamma
+from sklearn.preprocessing import scale
+from sklearn.utils import check_random_state
+from sklearn.feature_selection import f_regression
+
+#=================================================================;
+#  Function-1: F-test of all output columns (one matrix product)  ;
+#              X --> (num_realz, num_params); Y --> (num_realz,   ;
+#              num_ts); F --> (num_params, num_ts)                ;
+#=================================================================;
+def get_f_values(X, Y):
+
+    #--------------------------------------------------------;
+    #  r = corr(X, Y) from centered and normalized columns;  ;
+    #  F = r^2 / (1 - r^2) * (n - 2) (as in f_regression)    ;
+    #--------------------------------------------------------;
+    X      = np.asarray(X, dtype = float)
+    Y      = np.asarray(Y, dtype = float).reshape(X.shape[0], -1)
+    X_c    = X - np.mean(X, axis = 0)
+    Y_c    = Y - np.mean(Y, axis = 0)
+    X_norm = np.sqrt(np.einsum('ij,ij->j', X_c, X_c))
+    Y_norm = np.sqrt(np.einsum('ij,ij->j', Y_c, Y_c))
+    #
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        corr     = (X_c.T @ Y_c) / np.outer(X_norm, Y_norm) #(num_params, num_ts)
+        f_values = corr**2 / (1.0 - corr**2) * (X.shape[0] - 2)
+    #
+    f_values[np.isnan(f_values)] = 0.0 #Constant columns (as f_regression, force_finite = True)
+    f_values[np.isinf(f_values)] = np.finfo(f_values.dtype).max #Perfect correlation
+
+    return f_values
+
+#=========================================================;
+#  Function-2: F-test and p-values of all output columns  ;
+#              (same as f_regression of each column)      ;
+#=========================================================;
+def get_f_regression(X, Y):
+
+    f_values = get_f_values(X, Y)
+    p_values = scipy.stats.f.sf(f_values, 1, np.asarray(X).shape[0] - 2) #Constant --> F = 0, p = 1
+
+    return f_values, p_values
+
+#=============================================================;
+#  Function-3: F-test and p-values of several outputs         ;
+#              (e.g., hpro/pout/dhout in ONE matrix product)  ;
+#=============================================================;
+def get_f_regression_multi(X, y_dict):
+
+    #-------------------------------------------------------------;
+    #  Outputs are stacked column-wise, {name: (F, p)} with each  ;
+    #  (num_params, num_ts) of that output                        ;
+    #-------------------------------------------------------------;
+    y_list   = [np.asarray(y, dtype = float).reshape(np.asarray(X).shape[0], -1) \
+                for y in y_dict.values()]
+    f_values, p_values = get_f_regression(X, np.concatenate(y_list, axis = 1))
+    split_ids = np.cumsum([y.shape[1] for y in y_list])[:-1]
+    #
+    f_list   = np.split(f_values, split_ids, axis = 1)
+    p_list   = np.split(p_values, split_ids, axis = 1)
+
+    return {name: (f, p) for name, f, p in zip(y_dict.keys(), f_list, p_list)}
+
+#================================================================;
+#  Function-4: Check F-test and p-values with sklearn            ;
+#              (f_regression of each column; True if all close)  ;
+#================================================================;
+def check_f_regression(X, Y, rtol = 1e-6, atol = 1e-10):
+
+    f_values, p_values = get_f_regression(X, Y)
+    Y        = np.asarray(Y, dtype = float).reshape(np.asarray(X).shape[0], -1)
+    f_check  = True
+    #
+    for i in range(0,Y.shape[1]):
+        f_sk, p_sk = f_regression(X, Y[:,i])
+        f_check    = f_check and np.allclose(f_values[:,i], f_sk, rtol = rtol, atol = atol) \
+                        and np.allclose(p_values[:,i], p_sk, rtol = rtol, atol = atol)
+    #
+    print('F-test and p-values same as sklearn (all columns) = ', f_check)
+
+    return f_check
+
+#================================================================;
+#  Function-5: Number of points within a radius (1D; sorted)     ;
+#              (|x_j - x_i| <= r, self included; same counts as  ;
+#               KDTree.query_radius with the chebyshev metric)   ;
+#================================================================;
+def get_radius_counts(x_sorted, x, radius):
+
+    #-----------------------------------------------------------;
+    #  Binary search, then exact checks of the boundary points  ;
+    #  (x +/- r may round past a point at distance r)           ;
+    #-----------------------------------------------------------;
+    n  = x_sorted.shape[0]
+    lo = np.searchsorted(x_sorted, x - radius, side = 'left')
+    hi = np.searchsorted(x_sorted, x + radius, side = 'right')
+    #
+    while True:
+        dec_hi = (hi > lo) & (np.abs(x_sorted[np.maximum(hi - 1, 0)] - x) > radius)
+        inc_hi = (hi < n) & (np.abs(x_sorted[np.minimum(hi, n - 1)] - x) <= radius)
+        inc_lo = (lo < hi) & (np.abs(x_sorted[np.minimum(lo, n - 1)] - x) > radius)
+        dec_lo = (lo > 0) & (np.abs(x_sorted[np.maximum(lo - 1, 0)] - x) <= radius)
+        if not (dec_hi.any() or inc_hi.any() or inc_lo.any() or dec_lo.any()):
+            return hi - lo
+        hi = hi - dec_hi + inc_hi
+        lo = lo + inc_lo - dec_lo
+
+#=================================================================;
+#  Function-6: Scaled inputs and noise of mutual_info_regression  ;
+#              (same for all targets with the same random_state)  ;
+#=================================================================;
+def get_mi_inputs(X, random_state = 0):
+
+    #-------------------------------------------------------------;
+    #  Same draws as sklearn: noise of X (num_realz, num_params)  ;
+    #  first, then noise of y (num_realz,)                        ;
+    #-------------------------------------------------------------;
+    rng      = check_random_state(random_state)
+    X_noisy  = scale(np.asarray(X, dtype = np.float64), with_mean = False)
+    X_noisy += 1e-10 * np.maximum(1, np.mean(np.abs(X_noisy), axis = 0)) \
+                * rng.standard_normal(size = X_noisy.shape)
+    y_noise  = rng.standard_normal(size = X_noisy.shape[0])
+
+    return X_noisy, y_noise
+
+#===============================================================;
+#  Function-7: Kraskov MI of all inputs with one target column  ;
+#              (sorted inputs are shared by all targets)        ;
+#===============================================================;
+def get_mi_target(X_noisy, X_sorted, y, y_noise, n_neighbors = 3):
+
+    #---------------------------------------------------------------;
+    #  Joint (x, y) kNN radius --> counts in the x and y marginals  ;
+    #  (sorted y is shared by all inputs)                           ;
+    #---------------------------------------------------------------;
+    num_realz = X_noisy.shape[0]
+    y         = scale(np.asarray(y, dtype = np.float64), with_mean = False)
+    y         = y + 1e-10 * np.maximum(1, np.mean(np.abs(y))) * y_noise
+    y_sorted  = np.sort(y)
+    mi        = np.zeros(X_noisy.shape[1], dtype = float)
+    #
+    for j in range(0,X_noisy.shape[1]):
+        xy      = np.column_stack((X_noisy[:,j], y))
+        dist, _ = cKDTree(xy).query(xy, k = n_neighbors + 1, p = np.inf) #Self + n_neighbors
+        radius  = np.nextafter(dist[:,-1], 0)
+        nx      = get_radius_counts(X_sorted[:,j], X_noisy[:,j], radius) - 1.0
+        ny      = get_radius_counts(y_sorted, y, radius) - 1.0
+        mi[j]   = max(0, digamma(num_realz) + digamma(n_neighbors) \
+                         - np.mean(digamma(nx + 1)) - np.mean(digamma(ny + 1)))
+
+    return mi
+
+#================================================================;
+#  Function-8: Kraskov MI of all inputs with all target columns  ;
+#              (same values as mutual_info_regression of each    ;
+#               column; targets in parallel)                     ;
+#================================================================;
+def get_mi_shared(X, Y, n_neighbors = 3, random_state = 0, n_jobs = -1):
+
+    #--------------------------------------------------------;
+    #  Noise, scaling, and sorting of the inputs done ONCE;  ;
+    #  returns (num_params, num_cols)                        ;
+    #--------------------------------------------------------;
+    X_noisy, y_noise = get_mi_inputs(X, random_state)
+    X_sorted = np.sort(X_noisy, axis = 0)
+    Y        = np.asarray(Y, dtype = float).reshape(X_noisy.shape[0], -1)
+    mi_list  = Parallel(n_jobs = n_jobs)(delayed(get_mi_target)(X_noisy, X_sorted, Y[:,i], \
+                                y_noise, n_neighbors) for i in range(0,Y.shape[1]))
+
+    return np.stack(mi_list, axis = 1)
+
+#==============================================================;
+#  Function-9: F-test and MI of outputs at each time-step      ;
+#              (MI of all outputs and time-steps in parallel)  ;
+#==============================================================;
+def get_ftest_mi_parallel(X, y_dict, ts_start = 1, n_jobs = -1, n_neighbors = 3, \
+                            random_state = 0):
+
+    #-------------------------------------------------------------;
+    #  y_dict --> {name: (num_realz, num_ts)}; time-steps before  ;
+    #  ts_start are zero (as in the serial loop); returns         ;
+    #  {name: (f_test_arr, mi_arr)}, each (num_params, num_ts)    ;
+    #-------------------------------------------------------------;
+    num_params = X.shape[1]
+    y_dict_ts  = {name: y[:,ts_start:] for name, y in y_dict.items()}
+    f_dict     = get_f_regression_multi(X, y_dict_ts)
+    mi_all     = get_mi_shared(X, np.concatenate(list(y_dict_ts.values()), axis = 1), \
+                                n_neighbors, random_state, n_jobs) #(63, 36*3)
+    mi_list    = np.split(mi_all, np.cumsum([y.shape[1] for y in y_dict_ts.values()])[:-1], axis = 1)
+    #
+    sens_dict  = {}
+    for (name, y), mi in zip(y_dict.items(), mi_list):
+        f_test_arr = np.zeros((num_params,y.shape[1]), dtype = float) #(63,37)
+        mi_arr     = np.zeros((num_params,y.shape[1]), dtype = float) #(63,37)
+        f_test_arr[:,ts_start:] = f_dict[name][0]
+        mi_arr[:,ts_start:]     = mi
+        sens_dict[name] = (f_test_arr, mi_arr)
+
+    return sens_dict
+
+#==============================================================;
+#  Function-10: Stratified subsample of realizations           ;
+#               (equal share of each quantile bin of y_strat)  ;
+#==============================================================;
+def get_stratified_subsample(y_strat, num_samples, rng, num_strata = 10):
+
+    #--------------------------------------------------------------;
+    #  Realz are binned by quantiles of y_strat (e.g., time-mean   ;
+    #  of an output); each bin gives num_samples/num_strata realz  ;
+    #  (without replacement; sorted row ids)                       ;
+    #--------------------------------------------------------------;
+    y_strat   = np.asarray(y_strat, dtype = float).reshape(-1)
+    edges     = np.quantile(y_strat, np.linspace(0, 1, num_strata + 1)[1:-1])
+    strata    = np.searchsorted(edges, y_strat, side = 'right') #0 to num_strata-1
+    num_realz = y_strat.shape[0]
+    ids_list  = []
+    #
+    for i in range(0,num_strata):
+        ids_i = np.flatnonzero(strata == i)
+        num_i = int(round(num_samples * len(ids_i) / num_realz))
+        ids_list.append(rng.choice(ids_i, min(num_i, len(ids_i)), replace = False))
+
+    return np.sort(np.concatenate(ids_list))
+
+#============================================================;
+#  Function-11: MI of one subsample replicate (all outputs)  ;
+#============================================================;
+def get_mi_replicate(X, Y, y_strat, num_samples, seed, replicate, n_neighbors = 3):
+
+    rng = np.random.default_rng([seed, replicate]) #Independent stream per replicate
+    ids = get_stratified_subsample(y_strat, num_samples, rng)
+
+    return get_mi_shared(X[ids,:], Y[ids,:], n_neighbors, random_state = seed + replicate, n_jobs = 1)
+
+#==================================================================;
+#  Function-12: Subsampled MI with bootstrap bands                 ;
+#               (replicates in parallel until the feature ranking  ;
+#                of every output is stable)                        ;
+#==================================================================;
+def get_mi_subsampled(X, y_dict, num_samples, n_neighbors = 3, seed = 0, n_jobs = -1, \
+                        min_replicates = 8, max_replicates = 64, top_k = 10, \
+                        confidence = 0.95):
+
+    #--------------------------------------------------------------;
+    #  Each replicate: stratified subsample (without replacement,  ;
+    #  duplicates break kNN MI) of num_samples realz; a round of   ;
+    #  min_replicates replicates (same rounds and result for any   ;
+    #  n_jobs) runs in parallel; stop once the top_k ranking       ;
+    #  of the feature scores (sum of mean MI over time-steps, as   ;
+    #  mi_hpro.argsort()) is the same after two rounds for all     ;
+    #  outputs; returns {name: (mean, lower, upper)} and the       ;
+    #  number of replicates                                        ;
+    #--------------------------------------------------------------;
+    X          = np.asarray(X, dtype = float)
+    y_list     = [np.asarray(y, dtype = float).reshape(X.shape[0], -1) for y in y_dict.values()]
+    Y          = np.concatenate(y_list, axis = 1)
+    y_strat    = np.mean(y_list[0], axis = 1) #Strata of the first output
+    split_ids  = np.cumsum([y.shape[1] for y in y_list])[:-1]
+    #
+    mi_reps    = []
+    scores_old = None
+    num_round  = max(1, int(min_replicates)) #Replicates per round (does not grow with the cores)
+    with Parallel(n_jobs = n_jobs) as parallel:
+        while len(mi_reps) < max_replicates:
+            start   = len(mi_reps)
+            stop    = min(start + num_round, max_replicates)
+            mi_reps = mi_reps + parallel(delayed(get_mi_replicate)(X, Y, y_strat, num_samples, \
+                                            seed, i, n_neighbors) for i in range(start,stop))
+            #
+            mi_mean = np.mean(mi_reps, axis = 0)
+            scores  = [np.sum(mi, axis = 1) for mi in np.split(mi_mean, split_ids, axis = 1)]
+            if scores_old is not None:
+                num_same = min(np.sum(np.argsort(-s_old)[0:top_k] == np.argsort(-s_new)[0:top_k]) \
+                                for s_old, s_new in zip(scores_old, scores))
+                print('MI replicates, same top-k ranks as last round = ', len(mi_reps), num_same)
+                if num_same == min(top_k, X.shape[1]):
+                    break
+            scores_old = scores
+    #
+    mi_reps  = np.asarray(mi_reps) #(num_replicates, num_params, num_cols)
+    q_low    = 0.5 * (1.0 - confidence)
+    mi_bands = [np.mean(mi_reps, axis = 0), np.quantile(mi_reps, q_low, axis = 0), \
+                np.quantile(mi_reps, 1.0 - q_low, axis = 0)]
+    mi_bands = [np.split(mi, split_ids, axis = 1) for mi in mi_bands]
+
+    return {name: tuple(mi[i] for mi in mi_bands) for i, name in enumerate(y_dict.keys())}, \
+            len(mi_reps)
+
+#===========================================================;
+#  Function-13: F-test and subsampled MI at each time-step  ;
+#               (same as Function-9 with MI bands)          ;
+#===========================================================;
+def get_ftest_mi_subsampled(X, y_dict, num_samples, ts_start = 1, n_jobs = -1, \
+                            n_neighbors = 3, random_state = 0, **kwargs):
+
+    #----------------------------------------------------------;
+    #  sens_dict --> {name: (f_test_arr, mi_arr)} (mean MI);   ;
+    #  band_dict --> {name: (mi_lower, mi_upper)}; time-steps  ;
+    #  before ts_start are zero                                ;
+    #----------------------------------------------------------;
+    num_params = X.shape[1]
+    y_dict_ts  = {name: y[:,ts_start:] for name, y in y_dict.items()}
+    f_dict     = get_f_regression_multi(X, y_dict_ts)
+    mi_dict, num_reps = get_mi_subsampled(X, y_dict_ts, num_samples, n_neighbors, \
+                                            random_state, n_jobs, **kwargs)
+    print('MI subsample size and replicates = ', num_samples, num_reps)
+    #
+    sens_dict  = {}
+    band_dict  = {}
+    for name, y in y_dict.items():
+        arr_list = [np.zeros((num_params,y.shape[1]), dtype = float) for i in range(0,4)] #(63,37)
+        arr_list[0][:,ts_start:] = f_dict[name][0] #F-test
+        for i in range(0,3): #Mean, lower, and upper MI
+            arr_list[i+1][:,ts_start:] = mi_dict[name][i]
+        sens_dict[name] = (arr_list[0], arr_list[1])
+        band_dict[name] = (arr_list[2], arr_list[3])
+
+    return sens_dict, band_dict
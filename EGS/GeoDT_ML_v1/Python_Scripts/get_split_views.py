@@ -0,0 +1,102 @@
+# Split-view layer for train/val/test data (one memory-mapped array per quantity)
+#   Each quantity (p/hpro/pout/npv) is saved ONCE for all realizations in the
+#   split order of Total_Realz_<num_realz>.txt, i.e., [train | val | test]
+#   Train/val/test are then contiguous slices of that array (lazy memmap views)
+#   Smaller training sets (5%, 10%, 20%, 40%, 60%) are prefixes of the 80% train split
+#
+# Split order (get_train_val_test_splits.py):
+#	Total_Realz_4078.txt = Train_Realz_3278.txt + Val_Realz_400.txt + Test_Realz_400.txt
+#	Split_Order_4078.npy --> 0-based row ids of the GeoDT data in split order (persisted)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import numpy as np
+
+#=================================================================;
+#  Function-1: Split order (0-based row ids; persisted as *.npy)  ;
+#=================================================================;
+def get_split_order(path_ind, num_realz):
+
+    #----------------------------------------------------------;
+    #  Total_Realz_*.txt is read only once and saved as *.npy  ;
+    #----------------------------------------------------------;
+    order_name = path_ind + "Split_Order_" + str(num_realz) + ".npy"
+    #
+    if os.path.exists(order_name):
+        split_order = np.load(order_name)
+    else:
+        realz_list  = np.genfromtxt(path_ind + "Total_Realz_" + str(num_realz) + ".txt", \
+                                    dtype = int, skip_header = 1) #(4078,)
+        split_order = realz_list - 1 #Realz ids start at 1
+        np.save(order_name, split_order)
+
+    return split_order
+
+#=======================================================;
+#  Function-2: Slices of train/val/test in split order  ;
+#=======================================================;
+def get_split_slices(num_realz, num_train, num_val, num_test):
+
+    #----------------------------------------------------------;
+    #  Val/test are at the end; train is a prefix of the rest  ;
+    #----------------------------------------------------------;
+    split_slices = {'train': slice(0, num_train), \
+                    'val': slice(num_realz - num_val - num_test, num_realz - num_test), \
+                    'test': slice(num_realz - num_test, num_realz)}
+
+    return split_slices
+
+#=======================================================================;
+#  Function-3: Split indices (0-based rows of the original GeoDT data)  ;
+#=======================================================================;
+def get_split_indices(path_ind, num_realz, num_train, num_val, num_test):
+
+    #----------------------------------------------------------;
+    #  Equivalent to *_Realz_*.txt - 1 (without text parsing)  ;
+    #----------------------------------------------------------;
+    split_order  = get_split_order(path_ind, num_realz)
+    split_slices = get_split_slices(num_realz, num_train, num_val, num_test)
+    split_index  = {key: split_order[value] for key, value in split_slices.items()}
+
+    return split_index
+
+#=======================================================================;
+#  Function-4: Save one contiguous array per quantity (in split order)  ;
+#=======================================================================;
+def save_split_array(fl_name, x_data, split_order = None):
+
+    #---------------------------------------------------------------;
+    #  x_data is either in original row order (gathered once using  ;
+    #  split_order) or already in split order (split_order = None)  ;
+    #---------------------------------------------------------------;
+    if split_order is not None:
+        x_data = np.asarray(x_data)[split_order,:]
+    #
+    np.save(fl_name, np.ascontiguousarray(x_data))
+
+#==========================================================================;
+#  Function-5: Load train/val/test as lazy views of a memory-mapped array  ;
+#==========================================================================;
+def load_split_views(fl_name, num_realz, num_train, num_val, num_test, mmap_mode = 'r'):
+
+    #--------------------------------------------------------;
+    #  Slices of a memmap are views (nothing is read/copied  ;
+    #  until the rows are used)                              ;
+    #--------------------------------------------------------;
+    x_data       = np.load(fl_name, mmap_mode = mmap_mode) #(num_realz, num_cols)
+    split_slices = get_split_slices(num_realz, num_train, num_val, num_test)
+    split_views  = {key: x_data[value] for key, value in split_slices.items()}
+
+    return split_views
+
+#========================================================================;
+#  Function-6: Gathered batches of a split (rows are copied batch-wise)  ;
+#========================================================================;
+def get_split_batches(x_data, index, batch_size):
+
+    #--------------------------------------------------------;
+    #  x_data is a memmap (or array); index is 0-based rows  ;
+    #--------------------------------------------------------;
+    for i in range(0, len(index), batch_size):
+        yield np.asarray(x_data[index[i:i+batch_size],:])
@@ -0,0 +1,191 @@
+# Stacked-ensemble training engine for the DNN sweep
+#   Models with the same architecture (neurons), batch size, and epochs are
+#   trained together in ONE batched computation:
+#	weights of layer l --> (num_models, in_units, out_units) tensors
+#	forward pass       --> einsum over all models (same mini-batch)
+#	per-model hps      --> learning rate (Adam), LeakyReLU alpha, dropout rate
+#   Each model is the same as get_dnn_model + Adam + 'mse' of the runners
+#   (Glorot-uniform weights, zero biases, Keras Adam defaults); the models are
+#   independent (loss = sum of per-model losses --> per-model gradients)
+#   Full grid --> 7 architectures x 5 batch sizes x 5 epochs = 175 groups of
+#   125 models (5 dropout x 5 alpha x 5 learning rates)
+#
+# Usage (see runners, search_mode = 'stacked'):
+#	group_list = get_model_groups(hp_table, model_id_list)
+#	ensemble   = train_stacked_ensemble(train_p, train_q, val_p, val_q, hp_list, random_seed)
+#	pred_q     = predict_stacked_ensemble(ensemble, test_p) #(num_models, num_realz, 1)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import time
+import numpy as np
+import tensorflow as tf
+
+from get_hp_inputs import get_hp
+
+#==================================================================;
+#  Function-1: Group model ids (same neurons, batch_size, epochs)  ;
+#==================================================================;
+def get_model_groups(hp_table, model_id_list, max_models = None):
+
+    #-------------------------------------------------------------;
+    #  One group --> one stacked ensemble (max_models per group)  ;
+    #-------------------------------------------------------------;
+    group_dict = {}
+    #
+    for model_id in model_id_list:
+        hp  = get_hp(hp_table, model_id)
+        key = (tuple(hp['neurons']), hp['batch_size'], hp['epochs'])
+        group_dict.setdefault(key, []).append(int(model_id))
+    #
+    group_list = []
+    for key in sorted(group_dict.keys()):
+        ids = group_dict[key]
+        num = len(ids) if max_models is None else max_models
+        group_list.extend([ids[i:i+num] for i in range(0,len(ids),num)])
+
+    return group_list
+
+#=============================================================;
+#  Function-2: Stacked weights (Glorot-uniform; zero biases)  ;
+#=============================================================;
+def get_stacked_weights(layer_units, num_models, rng):
+
+    weights = []
+    #
+    for i in range(0,len(layer_units)-1):
+        n_in, n_out = layer_units[i], layer_units[i+1]
+        limit       = np.sqrt(6.0 / (n_in + n_out))
+        w           = rng.uniform(-limit, limit, size = (num_models, n_in, n_out))
+        weights.append(tf.Variable(w.astype(np.float32), name = "W-" + str(i)))
+        weights.append(tf.Variable(np.zeros((num_models, 1, n_out), dtype = np.float32), \
+                                    name = "b-" + str(i)))
+
+    return weights
+
+#===================================================================;
+#  Function-3: Forward pass of all models (num_models, batch, out)  ;
+#              (Dense --> LeakyReLU --> Dropout; linear output)     ;
+#===================================================================;
+def get_stacked_forward(x, weights, alpha, dropout, training = False, tf_rng = None):
+
+    #-----------------------------------------------------------;
+    #  x is (batch, 117) for all models; alpha/dropout are      ;
+    #  (num_models, 1, 1); dropout is inverted (Keras Dropout)  ;
+    #-----------------------------------------------------------;
+    num_layers = len(weights) // 2
+    h          = tf.einsum('bi,mio->mbo', x, weights[0]) + weights[1]
+    #
+    for i in range(0,num_layers):
+        if i > 0:
+            h = tf.einsum('mbi,mio->mbo', h, weights[2*i]) + weights[2*i+1]
+        if i == num_layers - 1: #Output layer (linear)
+            break
+        h = tf.where(h > 0, h, alpha * h) #LeakyReLU
+        if training:
+            keep = tf_rng.uniform(tf.shape(h)) >= dropout
+            h    = tf.where(keep, h / (1.0 - dropout), tf.zeros_like(h))
+
+    return h
+
+#====================================================================;
+#  Function-4: Train a stacked ensemble (one pass over the data per  ;
+#              epoch for all models; per-model Adam learning rates)  ;
+#====================================================================;
+def train_stacked_ensemble(train_p, train_q, val_p, val_q, hp_list, random_seed = 1337, \
+                            verbose = 1):
+
+    #----------------------------------------------------------;
+    #  hp_list --> same neurons/batch_size/epochs (one group)  ;
+    #----------------------------------------------------------;
+    tic         = time.perf_counter()
+    num_models  = len(hp_list)
+    neurons     = hp_list[0]['neurons']
+    batch_size  = hp_list[0]['batch_size']
+    epochs      = hp_list[0]['epochs']
+    #
+    train_p     = np.asarray(train_p, dtype = np.float32)
+    train_q     = np.asarray(train_q, dtype = np.float32)
+    val_p       = tf.constant(np.asarray(val_p, dtype = np.float32))
+    val_q       = tf.constant(np.asarray(val_q, dtype = np.float32))
+    #
+    layer_units = [train_p.shape[1]] + list(neurons) + [train_q.shape[1]] #117 -> neurons -> 1
+    rng         = np.random.default_rng(random_seed)
+    tf_rng      = tf.random.Generator.from_seed(random_seed)
+    weights     = get_stacked_weights(layer_units, num_models, rng)
+    #
+    lr          = tf.constant(np.array([hp['lr_values'] for hp in hp_list], \
+                                        dtype = np.float32).reshape(-1,1,1))
+    alpha       = tf.constant(np.array([hp['alpha_value'] for hp in hp_list], \
+                                        dtype = np.float32).reshape(-1,1,1))
+    dropout     = tf.constant(np.array([hp['dropout_value'] for hp in hp_list], \
+                                        dtype = np.float32).reshape(-1,1,1))
+
+    #-------------------------------------------------------;
+    #  Adam (Keras defaults) with per-model learning rates  ;
+    #-------------------------------------------------------;
+    beta_1, beta_2, epsilon = 0.9, 0.999, 1e-7
+    m_list = [tf.Variable(tf.zeros_like(w)) for w in weights]
+    v_list = [tf.Variable(tf.zeros_like(w)) for w in weights]
+    step   = tf.Variable(0.0)
+    #
+    @tf.function
+    def train_step(xb, yb):
+        with tf.GradientTape() as tape:
+            pred   = get_stacked_forward(xb, weights, alpha, dropout, True, tf_rng)
+            loss_m = tf.reduce_mean(tf.square(pred - yb[None,:,:]), axis = [1,2]) #(num_models,)
+            loss   = tf.reduce_sum(loss_m) #Models are independent
+        grads = tape.gradient(loss, weights)
+        step.assign_add(1.0)
+        lr_t  = lr * tf.sqrt(1.0 - beta_2**step) / (1.0 - beta_1**step)
+        for w, g, m, v in zip(weights, grads, m_list, v_list):
+            m.assign(beta_1 * m + (1.0 - beta_1) * g)
+            v.assign(beta_2 * v + (1.0 - beta_2) * tf.square(g))
+            w.assign_sub(lr_t * m / (tf.sqrt(v) + epsilon))
+        return loss_m
+    #
+    @tf.function
+    def val_step():
+        pred = get_stacked_forward(val_p, weights, alpha, dropout, False)
+        return tf.reduce_mean(tf.square(pred - val_q[None,:,:]), axis = [1,2])
+
+    #-------------------------------------------------------------;
+    #  Epochs (shuffled mini-batches; same order for all models)  ;
+    #-------------------------------------------------------------;
+    num_train     = train_p.shape[0]
+    loss_hist     = np.zeros((epochs, num_models))
+    val_loss_hist = np.zeros((epochs, num_models))
+    #
+    for epoch in range(0,epochs):
+        index   = rng.permutation(num_train)
+        loss_ep = np.zeros(num_models)
+        for i in range(0,num_train,batch_size):
+            ids     = index[i:i+batch_size]
+            loss_ep = loss_ep + train_step(train_p[ids], train_q[ids]).numpy() * len(ids)
+        loss_hist[epoch,:]     = loss_ep / num_train
+        val_loss_hist[epoch,:] = val_step().numpy()
+        if verbose:
+            print('Epoch, min (loss, val_loss) over models = ', epoch + 1, \
+                    np.min(loss_hist[epoch,:]), np.min(val_loss_hist[epoch,:]))
+    #
+    ensemble = {'weights': [w.numpy() for w in weights], \
+                'alpha': alpha.numpy(), \
+                'loss': loss_hist, \
+                'val_loss': val_loss_hist, \
+                'train_time': time.perf_counter() - tic}
+
+    return ensemble
+
+#===============================================================;
+#  Function-5: Predictions of all models in a stacked ensemble  ;
+#              (num_models, num_realz, 1)                       ;
+#===============================================================;
+def predict_stacked_ensemble(ensemble, x, batch_size = 4096):
+
+    weights = [tf.constant(w) for w in ensemble['weights']]
+    alpha   = tf.constant(ensemble['alpha'])
+    x       = np.asarray(x, dtype = np.float32)
+    pred    = [get_stacked_forward(tf.constant(x[i:i+batch_size]), weights, alpha, None).numpy() \
+                for i in range(0,x.shape[0],batch_size)]
+
+    return np.concatenate(pred, axis = 1)
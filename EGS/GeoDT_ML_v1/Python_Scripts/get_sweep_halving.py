@@ -0,0 +1,175 @@
+# Budget-aware search for the DNN sweep (successive halving and Hyperband)
+#   Successive halving (SH):
+#	rung 0 --> train all models for a few epochs (e.g., 20)
+#	rung i --> keep the best 1/eta models (lowest min val loss) and continue
+#	           their training (from the saved checkpoint) to eta times the epochs
+#	last   --> the remaining models are trained to their own epochs (hp table)
+#   Tasks never exceed the own epochs of a model (model_epochs); a model that
+#   reached them in an earlier rung keeps its result and is not re-run
+#   Hyperband: several SH brackets with different first-rung epochs; models
+#   are split into the brackets (more models --> fewer epochs in rung 0)
+#   Bad configurations (e.g., lr = 1e-6 or lr = 1e-2 with dropout 0.4) are
+#   stopped after a few epochs
+#
+# Usage (map_function trains a list of (model_id, num_epochs) tasks in
+#        parallel and returns their min val losses; see runners):
+#	results = run_successive_halving(model_id_list, map_function, \
+#					get_rung_epochs(20, 500, 3), 3, path_manifest, model_epochs)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import traceback
+import numpy as np
+
+from get_sweep_manifest import save_model_status, get_model_results
+
+#=========================================================;
+#  Function-1: Epochs of each rung (geometric)            ;
+#              e.g., (20, 500, 3) --> [20, 60, 180, 500]  ;
+#=========================================================;
+def get_rung_epochs(min_epochs, max_epochs, eta = 3):
+
+    rung_epochs = [int(min_epochs)]
+    while rung_epochs[-1] * eta < max_epochs:
+        rung_epochs.append(int(rung_epochs[-1] * eta))
+    if rung_epochs[-1] < max_epochs:
+        rung_epochs.append(int(max_epochs))
+
+    return rung_epochs
+
+#==============================================================;
+#  Function-2: Promote the best 1/eta models to the next rung  ;
+#              (failed models, i.e., None/NaN --> never)       ;
+#==============================================================;
+def get_promoted_ids(model_results, eta = 3):
+
+    #--------------------------------------------;
+    #  Sort by min val loss (ties --> model id)  ;
+    #--------------------------------------------;
+    model_ids  = np.asarray(list(model_results.keys()))
+    val_losses = np.asarray([np.inf if v is None or np.isnan(v) else v \
+                                for v in model_results.values()], dtype = float)
+    num_keep   = int(np.ceil(len(model_ids) / eta))
+    ids_sorted = np.lexsort((model_ids, val_losses))[0:num_keep]
+    promoted   = [int(model_ids[i]) for i in ids_sorted if np.isfinite(val_losses[i])]
+
+    return sorted(promoted)
+
+#====================================================================;
+#  Function-3: Tasks of a rung ((model_id, num_epochs) to dispatch)  ;
+#              (epochs capped at the own epochs of each model;       ;
+#               models done in an earlier rung are skipped)          ;
+#====================================================================;
+def get_rung_tasks(model_ids, num_epochs, prev_epochs = 0, model_epochs = None):
+
+    if model_epochs is None: #No own epochs --> every model runs the rung epochs
+        return [(k, num_epochs) for k in model_ids]
+
+    return [(k, min(num_epochs, model_epochs[k])) for k in model_ids \
+            if model_epochs[k] > prev_epochs]
+
+#============================================================;
+#  Function-4: Successive halving over a list of model ids   ;
+#              (one manifest folder per rung --> resumable;  ;
+#               model_epochs --> epochs of each model)       ;
+#============================================================;
+def run_successive_halving(model_id_list, map_function, rung_epochs, eta = 3, \
+                            path_manifest = None, model_epochs = None):
+
+    #-----------------------------------------------------------;
+    #  map_function([(model_id, num_epochs), ...]) --> min val  ;
+    #  losses (same order); models continue from checkpoints    ;
+    #-----------------------------------------------------------;
+    alive_ids    = list(model_id_list)
+    history      = []
+    last_results = {} #Latest min val loss of each model (finished models keep it)
+    prev_epochs  = 0
+    #
+    for rung, num_epochs in enumerate(rung_epochs):
+        model_results = {}
+        if path_manifest is not None: #Results of this rung from an earlier (preempted) run
+            path_rung     = path_manifest + "Rung_" + str(rung) + "/"
+            alive_set     = set(alive_ids)
+            model_results = {k: v for k, v in get_model_results(path_rung).items() if k in alive_set}
+        #
+        task_list = get_rung_tasks([k for k in alive_ids if k not in model_results], \
+                                    num_epochs, prev_epochs, model_epochs)
+        todo_ids  = [k for k, e in task_list]
+        todo_set  = set(todo_ids)
+        for model_id in alive_ids: #Reached its own epochs in an earlier rung (no re-run)
+            if model_id not in model_results and model_id not in todo_set:
+                model_results[model_id] = last_results.get(model_id)
+        val_list  = map_function(task_list) if task_list else []
+        #
+        for model_id, min_val_loss in zip(todo_ids, val_list):
+            model_results[model_id] = min_val_loss
+            if path_manifest is not None:
+                save_model_status(path_rung, model_id, 'failed' if min_val_loss is None else 'done', \
+                                    min_val_loss = min_val_loss)
+        #
+        history.append(model_results)
+        last_results.update(model_results)
+        print('Rung, epochs, models, trained = ', rung, num_epochs, len(alive_ids), len(task_list))
+        #
+        prev_epochs = num_epochs
+        if rung < len(rung_epochs) - 1:
+            alive_ids = get_promoted_ids(model_results, eta)
+
+    return history
+
+#===============================================================;
+#  Function-5: Hyperband brackets (model ids and rung epochs)   ;
+#              (bracket s: n ~ eta^s/(s+1) models; rung 0 with  ;
+#               max_epochs/eta^s epochs)                        ;
+#===============================================================;
+def get_hyperband_brackets(model_id_list, min_epochs, max_epochs, eta = 3, seed = 1337):
+
+    #-----------------------------------------------------------;
+    #  Models are shuffled once and split in proportion to the  ;
+    #  number of configurations of each bracket                 ;
+    #-----------------------------------------------------------;
+    s_max       = len(get_rung_epochs(min_epochs, max_epochs, eta)) - 1
+    weights     = np.asarray([eta**s / (s + 1) for s in range(s_max,-1,-1)])
+    num_bracket = np.floor(len(model_id_list) * weights / np.sum(weights)).astype(int)
+    num_bracket[0] = num_bracket[0] + len(model_id_list) - np.sum(num_bracket) #Rest --> most aggressive
+    #
+    rng       = np.random.default_rng(seed)
+    model_ids = rng.permutation(np.asarray(model_id_list))
+    brackets  = []
+    counter   = 0
+    for s, num_b in zip(range(s_max,-1,-1), num_bracket):
+        rung_0 = max(int(min_epochs), int(round(max_epochs / eta**s)))
+        brackets.append((sorted(int(i) for i in model_ids[counter:counter+num_b]), \
+                         get_rung_epochs(rung_0, max_epochs, eta)))
+        counter = counter + num_b
+
+    return brackets
+
+#==============================================;
+#  Function-6: Hyperband (SH in each bracket)  ;
+#==============================================;
+def run_hyperband(model_id_list, map_function, min_epochs, max_epochs, eta = 3, \
+                    path_manifest = None, seed = 1337, model_epochs = None):
+
+    history_list = []
+    #
+    for i, (bracket_ids, rung_epochs) in enumerate(get_hyperband_brackets(model_id_list, \
+                                            min_epochs, max_epochs, eta, seed)):
+        print('Bracket, models, rung epochs = ', i, len(bracket_ids), rung_epochs)
+        path_bracket = None if path_manifest is None else path_manifest + "Bracket_" + str(i) + "/"
+        history_list.append(run_successive_halving(bracket_ids, map_function, \
+                                rung_epochs, eta, path_bracket, model_epochs))
+
+    return history_list
+
+#===============================================================;
+#  Function-7: Min val loss of one task (None if it failed)     ;
+#              (a failed model is not promoted; sweep goes on)  ;
+#===============================================================;
+def get_rung_result(train_function, *args):
+
+    try:
+        return train_function(*args)
+    except Exception:
+        traceback.print_exc()
+        return None
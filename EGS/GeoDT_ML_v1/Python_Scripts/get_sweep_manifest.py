@@ -0,0 +1,161 @@
+# Completion manifest for the DNN sweep (resumable runs)
+#   One small status record per model in a manifest folder, e.g.,
+#	1_InvDNNModel_ss_th/Manifest/<model_id>_done.json
+#	1_InvDNNModel_ss_th/Manifest/<model_id>_failed.json
+#   Each record has model_id, status, min val loss, wall time, host, and pid
+#   Records are written atomically (temporary file + rename) and the status is
+#   part of the file name, so a single directory scan gives all finished models
+#   Runners only schedule models without a 'done' record (unfinished or failed)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import json
+import time
+import socket
+import traceback
+
+#======================================================;
+#  Function-1: Save status record of a model           ;
+#              (status = 'running', 'done', 'failed')  ;
+#======================================================;
+def save_model_status(path_manifest, model_id, status, min_val_loss = None, \
+                        wall_time = None, error = None):
+
+    #--------------------------------------------------------;
+    #  Atomic write; older records of the model are removed  ;
+    #--------------------------------------------------------;
+    if not os.path.exists(path_manifest): #Create if they dont exist
+        os.makedirs(path_manifest, exist_ok = True)
+    #
+    record   = {'model_id': int(model_id), \
+                'status': status, \
+                'min_val_loss': None if min_val_loss is None else float(min_val_loss), \
+                'wall_time': wall_time, \
+                'host': socket.gethostname(), \
+                'pid': os.getpid(), \
+                'time_stamp': time.strftime('%Y-%m-%d %H:%M:%S'), \
+                'error': error}
+    #
+    fl_name  = path_manifest + str(model_id) + "_" + status + ".json"
+    tmp_name = fl_name + "." + str(os.getpid()) + ".tmp"
+    with open(tmp_name, 'w') as fl_id:
+        json.dump(record, fl_id)
+    os.replace(tmp_name, fl_name)
+    #
+    for old_status in ['running', 'done', 'failed']:
+        old_name = path_manifest + str(model_id) + "_" + old_status + ".json"
+        if old_status != status and os.path.exists(old_name):
+            try:
+                os.remove(old_name)
+            except FileNotFoundError: #Removed by another process
+                pass
+
+#=========================================================;
+#  Function-2: Status of all models (one directory scan)  ;
+#=========================================================;
+def get_model_status(path_manifest):
+
+    #--------------------------------------------;
+    #  {model_id: status} from the record names  ;
+    #--------------------------------------------;
+    model_status = {}
+    #
+    if not os.path.exists(path_manifest):
+        return model_status
+    #
+    with os.scandir(path_manifest) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            model_id, status = entry.name[:-5].split("_", 1)
+            if model_status.get(int(model_id)) != 'done': #'done' wins over stale records
+                model_status[int(model_id)] = status
+
+    return model_status
+
+#=======================================================;
+#  Function-3: Model ids that still need to be trained  ;
+#              (never started, running, or failed)      ;
+#=======================================================;
+def get_unfinished_model_ids(path_manifest, model_id_list):
+
+    #------------------------------------;
+    #  Skip models with a 'done' record  ;
+    #------------------------------------;
+    model_status = get_model_status(path_manifest)
+    unfinished   = [k for k in model_id_list if model_status.get(k) != 'done']
+    print('Done, unfinished models = ', len(model_id_list) - len(unfinished), len(unfinished))
+
+    return unfinished
+
+#===========================================================;
+#  Function-4: Train a model and record its status          ;
+#              (train_function() returns the min val loss)  ;
+#===========================================================;
+def run_with_manifest(path_manifest, model_id, train_function):
+
+    #----------------------------------------------------------;
+    #  A failed model is recorded and does not stop the sweep  ;
+    #----------------------------------------------------------;
+    tic = time.perf_counter()
+    save_model_status(path_manifest, model_id, 'running')
+    #
+    try:
+        min_val_loss = train_function()
+    except Exception:
+        save_model_status(path_manifest, model_id, 'failed', \
+                            wall_time = time.perf_counter() - tic, \
+                            error = traceback.format_exc())
+        print('Failed: ' + str(model_id) + '_model/')
+        return None
+    #
+    save_model_status(path_manifest, model_id, 'done', min_val_loss = min_val_loss, \
+                        wall_time = time.perf_counter() - tic)
+
+    return min_val_loss
+
+#=============================================================;
+#  Function-5: Min val loss of the models with a done record  ;
+#              (reads the json records)                       ;
+#=============================================================;
+def get_model_results(path_manifest):
+
+    model_results = {}
+    #
+    for model_id, status in get_model_status(path_manifest).items():
+        if status == 'done':
+            with open(path_manifest + str(model_id) + "_done.json", 'r') as fl_id:
+                model_results[model_id] = json.load(fl_id)['min_val_loss']
+
+    return model_results
+
+#===================================================================;
+#  Function-6: Train a group of models and record their status      ;
+#              (train_function() returns a list of min val losses)  ;
+#===================================================================;
+def run_group_with_manifest(path_manifest, model_id_list, train_function):
+
+    #-----------------------------------------------------------;
+    #  Stacked ensemble: one failure fails all models of group  ;
+    #-----------------------------------------------------------;
+    tic = time.perf_counter()
+    for model_id in model_id_list:
+        save_model_status(path_manifest, model_id, 'running')
+    #
+    try:
+        min_val_list = train_function()
+    except Exception:
+        error = traceback.format_exc()
+        for model_id in model_id_list:
+            save_model_status(path_manifest, model_id, 'failed', \
+                                wall_time = time.perf_counter() - tic, error = error)
+        print('Failed: ' + str(len(model_id_list)) + ' models (stacked ensemble)')
+        return [None for model_id in model_id_list]
+    #
+    wall_time = (time.perf_counter() - tic) / len(model_id_list) #Shared by the models
+    for model_id, min_val_loss in zip(model_id_list, min_val_list):
+        save_model_status(path_manifest, model_id, 'done', min_val_loss = min_val_loss, \
+                            wall_time = wall_time)
+
+    return min_val_list
@@ -0,0 +1,356 @@
+# Shared sweep logic of the DNN runners (get_dnn_results_*.py)
+#   The runners keep their machine paths, the DNN model (get_dnn_model), and
+#   the training of one model (get_trained_models); the rest of a sweep is here:
+#	grid         --> all models (completion manifest; failed models re-run)
+#	stacked      --> models with the same neurons/batch_size/epochs in one
+#	                 stacked ensemble (get_stacked_ensemble.py)
+#	sh/hyperband --> budget-aware search (models continue training between rungs)
+#   on a multiprocessing pool (run_pool_sweep) or on MPI ranks (run_mpi_sweep)
+#   train_function(args_inp_list) trains one model, args_inp_list =
+#   (random_seed, model_id) or (random_seed, model_id, num_epochs) for a rung
+#   Pool tasks are module-level functions bound with functools.partial, so they
+#   are pickled to the pool workers like plain functions
+#
+# Usage (see runners):
+#	sweep_cfg = get_sweep_config(dataset_args, path_models, id_list, search_mode = 'sh')
+#	results   = run_pool_sweep(sweep_cfg, train_function, get_dnn_model) #multiprocessing
+#	run_mpi_sweep(comm, node_comm, sweep_cfg, train_function) #mpi4py
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import time
+import functools
+import numpy as np
+import pandas as pd
+
+from get_dataset_cache import get_cached_dataset, publish_shared_dataset, remove_shared_dataset
+from get_hp_inputs import load_hp_table, get_hp, get_model_dir, get_model_cost
+from get_sweep_manifest import get_unfinished_model_ids, run_with_manifest, run_group_with_manifest
+from get_stacked_ensemble import get_model_groups, train_stacked_ensemble, predict_stacked_ensemble
+from get_input_pipeline import get_train_dataset
+from get_plot_renderer import save_diagnostics, render_model_plots
+from get_results_store import save_model_result, get_r2_score
+from get_train_history import save_history, get_best_epoch
+from get_worker_pool import get_warm_pool, run_warm_map, run_calibration
+from get_launcher import get_threads_per_proc, get_core_set, set_process_resources
+from get_sweep_halving import get_rung_epochs, run_successive_halving, run_hyperband, get_rung_result
+
+#=======================================================================;
+#  Function-1: Run config of a sweep (dict; same keys for all runners)  ;
+#              (dataset_args = args of get_cached_dataset; id_list =    ;
+#               None --> all models of HP_Table.npy; max_epochs =       ;
+#               None --> largest epochs in HP_Table.npy)                ;
+#=======================================================================;
+def get_sweep_config(dataset_args, path_models, id_list = None, search_mode = 'grid', \
+                        min_epochs = 20, max_epochs = None, eta = 3, random_seed = 131, \
+                        plot_mode = 'deferred', num_procs = 1, pool_mode = 'warm', \
+                        num_threads = 1, cores_per_node = None, calibrate = False, \
+                        calib_models = 64, calib_epochs = 5, share_dataset = True):
+
+    sweep_cfg                  = dict(locals())
+    sweep_cfg['dataset_args']  = tuple(dataset_args)
+    sweep_cfg['path_hp_table'] = path_models + "HP_Table.npy"
+    sweep_cfg['path_manifest'] = path_models + "Manifest/" #Completion manifest (done/failed models)
+
+    return sweep_cfg
+
+#=========================================================================;
+#  Function-2: Train a model and record its status (completion manifest)  ;
+#=========================================================================;
+def get_trained_models_manifest(sweep_cfg, train_function, args_inp_list):
+
+    #-------------------------------------------------------;
+    #  Failed models are recorded and re-run on next start  ;
+    #-------------------------------------------------------;
+    random_seed, counter = args_inp_list
+
+    return run_with_manifest(sweep_cfg['path_manifest'], counter, \
+                                lambda: train_function(args_inp_list))
+
+#=======================================================================;
+#  Function-3: Train a model for a rung (successive halving/Hyperband)  ;
+#=======================================================================;
+def get_trained_models_rung(train_function, args_inp_list):
+
+    #------------------------------------------------------;
+    #  args_inp_list = (random_seed, counter, num_epochs)  ;
+    #  Failed models return None (they are not promoted)   ;
+    #------------------------------------------------------;
+    return get_rung_result(train_function, args_inp_list)
+
+#===============================================================;
+#  Function-4: Train a group of models as one stacked ensemble  ;
+#              (same neurons, batch_size, and epochs; see       ;
+#               get_stacked_ensemble.py)                        ;
+#===============================================================;
+def get_trained_ensemble(sweep_cfg, group_ids, random_seed):
+
+    #------------------------------------------------;
+    #  1. Get pre-processed data (all realizations)  ;
+    #------------------------------------------------;
+    path_models = sweep_cfg['path_models']
+    tic_group   = time.perf_counter() #Wall time of the group (results store)
+    dataset     = get_cached_dataset(*sweep_cfg['dataset_args']) #Loaded once per rank/worker (read-only arrays)
+    qq_scalar   = dataset['qq_scalar'] #Already created q-data pre-processing model
+    #
+    hp_table    = load_hp_table(sweep_cfg['path_hp_table'])
+    hp_list     = [get_hp(hp_table, k) for k in group_ids]
+
+    #------------------------------------------------;
+    #  2. Train all models of the group in one pass  ;
+    #------------------------------------------------;
+    ensemble    = train_stacked_ensemble(dataset['train_p'], dataset['train_q'], \
+                            dataset['val_p'], dataset['val_q'], hp_list, random_seed)
+    print('Stacked ensemble: models, time in seconds = ', len(group_ids), ensemble['train_time'])
+
+    #-----------------------------------------------------------;
+    #  3. Predictions of all models (train/val/test) and their  ;
+    #     inverse transform (GeoDT npv)                         ;
+    #-----------------------------------------------------------;
+    split_list  = ['train', 'val', 'test']
+    q_dict      = {split: dataset[split + '_q'] for split in split_list}
+    q_it_dict   = {split: qq_scalar.inverse_transform(q_dict[split]) for split in split_list}
+    pred_dict   = {split: predict_stacked_ensemble(ensemble, dataset[split + '_p']) \
+                            for split in split_list} #(num_models, num_realz, 1)
+
+    #---------------------------------------------------------;
+    #  4. Loss (*.npz), stats, and diagnostics of each model  ;
+    #     (same outputs as get_trained_models)                ;
+    #---------------------------------------------------------;
+    min_val_list = []
+    #
+    for i, counter in enumerate(group_ids):
+        path_fl_sav = get_model_dir(path_models, counter, create = True) #i-th hp-dl-model folder (outputs below)
+        df_hist     = pd.DataFrame({'epoch': np.arange(0,ensemble['loss'].shape[0]), \
+                                    'loss': ensemble['loss'][:,i], \
+                                    'val_loss': ensemble['val_loss'][:,i]})
+        save_history(path_fl_sav + "FwdDNNModel_Loss.npz", df_hist)
+        min_epoch, min_val_loss = get_best_epoch(df_hist['val_loss']) #NaN if the model diverged
+        min_val_list.append(min_val_loss)
+        #
+        save_diagnostics(path_fl_sav, df_hist['loss'], df_hist['val_loss'], \
+                        {split: (q_dict[split], pred_dict[split][i], q_it_dict[split], \
+                            qq_scalar.inverse_transform(pred_dict[split][i])) for split in split_list})
+        save_model_result(path_models + "Results.db", counter, hp_list[i], min_val_loss, min_epoch, \
+                        {split: get_r2_score(q_dict[split], pred_dict[split][i]) for split in split_list}, \
+                        ensemble['train_time'] / len(group_ids), \
+                        (time.perf_counter() - tic_group) / len(group_ids)) #Shared training/wall time
+        if sweep_cfg['plot_mode'] == 'now': #Plots while training (otherwise get_plot_renderer.py)
+            render_model_plots(path_fl_sav)
+
+    return min_val_list
+
+#========================================================================;
+#  Function-5: Train a stacked ensemble and record the status of models  ;
+#              (args_inp_list = (random_seed, group_ids))                ;
+#========================================================================;
+def get_trained_ensemble_manifest(sweep_cfg, args_inp_list):
+
+    random_seed, group_ids = args_inp_list
+
+    return run_group_with_manifest(sweep_cfg['path_manifest'], list(group_ids), \
+                                lambda: get_trained_ensemble(sweep_cfg, list(group_ids), random_seed))
+
+#====================================================================;
+#  Function-6: Warm-up of a pool worker (runs once per worker)       ;
+#              (dataset and HP table into the process-level caches)  ;
+#====================================================================;
+def get_warm_worker(sweep_cfg):
+
+    get_cached_dataset(*sweep_cfg['dataset_args']) #Memory-mapped shared copy (if published)
+    load_hp_table(sweep_cfg['path_hp_table'])
+
+#=================================================================;
+#  Function-7: Short training run of a model (calibration only)   ;
+#              (no files are written; returns the training time)  ;
+#=================================================================;
+def get_calibration_model(sweep_cfg, get_dnn_model, args_inp_list):
+
+    import tensorflow.keras.backend as K
+    from tensorflow.keras.optimizers import Adam
+    #
+    random_seed, counter, num_epochs = args_inp_list
+    dataset   = get_cached_dataset(*sweep_cfg['dataset_args'])
+    hp        = get_hp(load_hp_table(sweep_cfg['path_hp_table']), counter)
+    #
+    K.clear_session()
+    tic       = time.perf_counter()
+    fwd_model = get_dnn_model(dataset['train_q'].shape[1], dataset['train_p'].shape[1], hp['num_layers'], \
+                            hp['neurons'], hp['alpha_value'], hp['dropout_value'])
+    fwd_model.compile(Adam(learning_rate = hp['lr_values']), loss = "mse")
+    fwd_model.fit(x = get_train_dataset(dataset['train_p'], dataset['train_q'], hp['batch_size'], random_seed), \
+                    epochs = num_epochs, verbose = 0)
+
+    return time.perf_counter() - tic
+
+#=====================================================================;
+#  Function-8: Model ids of a sweep (done models of grid/stacked are  ;
+#              skipped; failed ones are re-run)                       ;
+#=====================================================================;
+def get_sweep_model_ids(sweep_cfg, hp_table):
+
+    model_id_list = sweep_cfg['id_list']
+    if model_id_list is None: #Full grid or a subsample (get_dir_hp_dnn_*.py)
+        model_id_list = [int(i) for i in hp_table['model_id']]
+    if sweep_cfg['search_mode'] in ['grid', 'stacked']:
+        model_id_list = get_unfinished_model_ids(sweep_cfg['path_manifest'], list(model_id_list))
+
+    return list(model_id_list)
+
+#======================================================================;
+#  Function-9: Budget-aware search of the models (sh or hyperband)     ;
+#              (map_function(task_list) trains (model_id, num_epochs)  ;
+#               tasks of a rung and returns their val losses)          ;
+#======================================================================;
+def run_budget_search(sweep_cfg, hp_table, model_id_list, map_function):
+
+    max_epochs   = sweep_cfg['max_epochs']
+    if max_epochs is None:
+        max_epochs = int(np.max(hp_table['epochs'])) #500
+    model_epochs = {k: get_hp(hp_table, k)['epochs'] for k in model_id_list} #Rung epochs capped per model
+    #
+    if sweep_cfg['search_mode'] == 'sh':
+        return run_successive_halving(model_id_list, map_function, \
+                    get_rung_epochs(sweep_cfg['min_epochs'], max_epochs, sweep_cfg['eta']), \
+                    sweep_cfg['eta'], sweep_cfg['path_manifest'] + "Halving/", model_epochs)
+
+    return run_hyperband(model_id_list, map_function, sweep_cfg['min_epochs'], max_epochs, \
+                sweep_cfg['eta'], sweep_cfg['path_manifest'] + "Hyperband/", model_epochs = model_epochs)
+
+#======================================================================;
+#  Function-10: Sweep on a multiprocessing pool (one node)             ;
+#               (pool_mode = 'warm' --> get_worker_pool.py; 'map' -->  ;
+#                pool.map; both set threads/cores of each worker;      ;
+#                calibrate --> procs x threads of the node)            ;
+#======================================================================;
+def run_pool_sweep(sweep_cfg, train_function, get_dnn_model):
+
+    #=======================================================;
+    #  1. Create args and pack args for DNN model training  ;
+    #=======================================================;
+    random_seed   = sweep_cfg['random_seed']
+    hp_table      = load_hp_table(sweep_cfg['path_hp_table'])
+    id_list       = get_sweep_model_ids(sweep_cfg, hp_table)
+    args_inp_list = [(random_seed, k) for k in id_list] #Args list for embarassingly parallel function -- train_function
+
+    #================================================;
+    #  2. Create processor pool and save DNN models  ;
+    #================================================;
+    path_shared    = publish_shared_dataset(*sweep_cfg['dataset_args']) \
+                        if sweep_cfg['share_dataset'] else None #Workers memory-map it
+    num_procs      = sweep_cfg['num_procs']
+    num_threads    = sweep_cfg['num_threads']
+    cores_per_node = sweep_cfg['cores_per_node']
+    warm_worker    = functools.partial(get_warm_worker, sweep_cfg)
+    #
+    if sweep_cfg['calibrate'] and cores_per_node is not None: #Short runs for each procs x threads split (no outputs)
+        calib_list = [(random_seed, k, sweep_cfg['calib_epochs']) for k in id_list[0:sweep_cfg['calib_models']]]
+        (num_procs, num_threads), rates = run_calibration(functools.partial(get_calibration_model, \
+                                            sweep_cfg, get_dnn_model), calib_list, cores_per_node, warm_worker)
+    elif cores_per_node is not None:
+        num_threads = get_threads_per_proc(cores_per_node, num_procs) #No oversubscription
+    #
+    if sweep_cfg['pool_mode'] == 'warm': #Long-lived workers: TF, threads, cores, and dataset set up once
+        pool     = get_warm_pool(num_procs, num_threads, warm_worker, \
+                                bind_cores = cores_per_node is not None)
+        pool_map = lambda function, task_list: run_warm_map(pool, function, task_list)
+    else: #Same threads/cores (and calibrated split) per worker; no warm-up
+        pool     = get_warm_pool(num_procs, num_threads, None, \
+                                bind_cores = cores_per_node is not None)
+        pool_map = lambda function, task_list: pool.map(function, task_list, chunksize = 1)
+    #
+    if sweep_cfg['search_mode'] == 'grid':
+        results = pool_map(functools.partial(get_trained_models_manifest, sweep_cfg, train_function), \
+                            args_inp_list)
+    elif sweep_cfg['search_mode'] == 'stacked': #Models with the same neurons/batch_size/epochs in one stacked ensemble
+        results = pool_map(functools.partial(get_trained_ensemble_manifest, sweep_cfg), \
+                            [(random_seed, group) for group in get_model_groups(hp_table, id_list)])
+    else: #Budget-aware search (models continue training between rungs)
+        rung_function = functools.partial(get_trained_models_rung, train_function)
+        results       = run_budget_search(sweep_cfg, hp_table, id_list, \
+                            lambda task_list: pool_map(rung_function, [(random_seed, k, e) for k, e in task_list]))
+    print(results)
+    pool.close()
+    pool.join()
+    pool.terminate()
+    remove_shared_dataset(path_shared)
+
+    return results
+
+#======================================================================;
+#  Function-11: Sweep on MPI ranks (rank 0 = master; ranks 1 to        ;
+#               size-1 = workers; node_comm = ranks of the same node,  ;
+#               one read-only copy of the dataset per node)            ;
+#======================================================================;
+def run_mpi_sweep(comm, node_comm, sweep_cfg, train_function):
+
+    from get_sweep_scheduler import run_master, run_worker, map_master
+    #
+    size        = comm.Get_size()
+    rank        = comm.Get_rank()
+    random_seed = sweep_cfg['random_seed']
+
+    #===========================================================;
+    #  1. Threads/cores of this rank and the shared dataset     ;
+    #     (ranks of the node split its cores; get_launcher.py)  ;
+    #===========================================================;
+    if sweep_cfg['cores_per_node'] is not None: #TF intra-op/OpenMP threads and own cores of this rank
+        num_threads = get_threads_per_proc(sweep_cfg['cores_per_node'], node_comm.Get_size())
+        set_process_resources(num_threads, get_core_set(node_comm.Get_rank(), num_threads))
+    #
+    path_shared = None
+    if sweep_cfg['share_dataset'] and node_comm.Get_rank() == 0:
+        path_shared = publish_shared_dataset(*sweep_cfg['dataset_args'])
+    node_comm.Barrier() #Published before any rank trains
+
+    #======================================;
+    #  2. Model ids (hp-dl-model folders)  ;
+    #======================================;
+    hp_table      = load_hp_table(sweep_cfg['path_hp_table'])
+    model_id_list = get_sweep_model_ids(sweep_cfg, hp_table) if rank == 0 else []
+
+    #========================================================;
+    #  3. Dynamic scheduling: idle ranks request next model  ;
+    #========================================================;
+    if sweep_cfg['search_mode'] == 'stacked': #Models with the same neurons/batch_size/epochs in one stacked ensemble
+        train_group = lambda group: get_trained_ensemble_manifest(sweep_cfg, (random_seed, group))
+        #
+        if rank == 0:
+            group_list = [tuple(group) for group in get_model_groups(hp_table, model_id_list)]
+            cost_list  = [np.sum([get_model_cost(get_hp(hp_table, k)) for k in group]) for group in group_list]
+            if size == 1:
+                for group in group_list:
+                    train_group(group)
+            else:
+                run_master(comm, group_list, cost_list)
+        else:
+            run_worker(comm, train_group)
+    elif sweep_cfg['search_mode'] != 'grid': #Budget-aware search (models continue training between rungs)
+        train_task = lambda task: get_trained_models_rung(train_function, (random_seed, task[0], task[1]))
+        #
+        if rank == 0:
+            if size == 1:
+                map_function = lambda task_list: [train_task(task) for task in task_list]
+            else:
+                map_function = lambda task_list: map_master(comm, task_list, \
+                                    [get_model_cost(dict(get_hp(hp_table, k), epochs = e)) for k, e in task_list])
+            run_budget_search(sweep_cfg, hp_table, model_id_list, map_function)
+            #
+            if size > 1:
+                run_master(comm, [], []) #Stop workers
+        else:
+            run_worker(comm, train_task)
+    else:
+        train_model = lambda k: get_trained_models_manifest(sweep_cfg, train_function, (random_seed, k)) #counter = k
+        #
+        if size == 1: #No workers; train all models on rank 0
+            for k in model_id_list:
+                train_model(k)
+        elif rank == 0:
+            cost_list = [get_model_cost(get_hp(hp_table, k)) for k in model_id_list] #epochs/batch_size x weights
+            run_master(comm, model_id_list, cost_list)
+        else:
+            run_worker(comm, train_model)
+    #
+    node_comm.Barrier() #All ranks of the node are done
+    remove_shared_dataset(path_shared) #Only the publishing rank of each node
@@ -0,0 +1,123 @@
+# Dynamic (master/worker) scheduler for the mpi4py hyperparameter sweep
+#   Rank 0 is the master: it orders the model ids by estimated cost (largest
+#   first) and hands the next model id to whichever rank asks for work
+#   Ranks 1 to size-1 are workers: they request a model id, train it, and
+#   request again until the master says stop
+#   (fixed blocks of model ids per rank finish at very different times as
+#    the runtime of the 21875 models differs by more than 100x)
+#
+# Usage (get_dnn_results_mpi4py.py):
+#	if rank == 0: run_master(comm, model_id_list, cost_list)
+#	else:         run_worker(comm, train_function)
+#   A work item is a model id or any picklable task (e.g., (model_id, num_epochs));
+#   run_master returns {work item: result of train_function}. With
+#   stop_workers = False, workers wait for the next call of run_master
+#   (e.g., next rung of successive halving)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import time
+import numpy as np
+from mpi4py import MPI
+
+TAG_READY = 1 #Worker --> master: ready for a model id (with stats of the last one)
+TAG_WORK  = 2 #Master --> worker: model id to train
+TAG_STOP  = 3 #Master --> worker: no more models
+#
+_idle_ranks = [] #Workers waiting on the master (kept between run_master calls)
+
+#=======================================================;
+#  Function-1: Order model ids by cost (largest first)  ;
+#=======================================================;
+def get_work_order(model_id_list, cost_list):
+
+    #----------------------------------------------------------;
+    #  Longest-processing-time-first keeps the makespan close  ;
+    #  to total-work/num_workers                               ;
+    #----------------------------------------------------------;
+    ids_sorted = np.argsort(-np.asarray(cost_list, dtype = float), kind = 'stable')
+
+    return [model_id_list[i] for i in ids_sorted]
+
+#===================================================;
+#  Function-2: Master (rank 0) -- dynamic dispatch  ;
+#===================================================;
+def run_master(comm, model_id_list, cost_list, stop_workers = True):
+
+    #------------------------------------------------------;
+    #  Hand out model ids on request; stop (or park) idle  ;
+    #  workers once all results are in                     ;
+    #------------------------------------------------------;
+    size         = comm.Get_size()
+    work_list    = get_work_order(model_id_list, cost_list)
+    num_workers  = size - 1
+    worker_stats = {i: [0, 0.0] for i in range(1,size)} #rank: [num_models, busy time (s)]
+    results      = {}
+    status       = MPI.Status()
+    #
+    counter      = 0
+    pending      = list(_idle_ranks) #Parked by the previous call
+    _idle_ranks.clear()
+    #
+    while True:
+        if pending:
+            source = pending.pop()
+        elif len(results) < len(work_list) or (stop_workers and num_workers > 0):
+            stats  = comm.recv(source = MPI.ANY_SOURCE, tag = TAG_READY, status = status)
+            source = status.Get_source()
+            #
+            if stats is not None: #Stats of the model trained last (work item, seconds, result)
+                worker_stats[source][0] = worker_stats[source][0] + 1
+                worker_stats[source][1] = worker_stats[source][1] + stats[1]
+                results[stats[0]]       = stats[2]
+        else:
+            break
+        #
+        if counter < len(work_list):
+            comm.send(work_list[counter], dest = source, tag = TAG_WORK)
+            counter = counter + 1
+        elif stop_workers:
+            comm.send(None, dest = source, tag = TAG_STOP)
+            num_workers = num_workers - 1
+        else:
+            _idle_ranks.append(source) #Wait for the next call
+
+    #-----------------------------------------------;
+    #  Load balance summary (busy time per worker)  ;
+    #-----------------------------------------------;
+    for i in range(1,size):
+        print('rank, num_models, busy time in seconds = ', i, worker_stats[i][0], worker_stats[i][1])
+
+    return results
+
+#======================================================;
+#  Function-3: Worker (rank > 0) -- request and train  ;
+#======================================================;
+def run_worker(comm, train_function):
+
+    #---------------------------------------------------------;
+    #  train_function(work item) trains one model (blocking)  ;
+    #---------------------------------------------------------;
+    status = MPI.Status()
+    stats  = None
+    #
+    while True:
+        comm.send(stats, dest = 0, tag = TAG_READY)
+        model_id = comm.recv(source = 0, tag = MPI.ANY_TAG, status = status)
+        #
+        if status.Get_tag() == TAG_STOP:
+            break
+        #
+        tic    = time.perf_counter()
+        result = train_function(model_id)
+        stats  = (model_id, time.perf_counter() - tic, result)
+
+#====================================================================;
+#  Function-4: Master -- results of a list of work items (in order)  ;
+#              (workers are kept for the next call)                  ;
+#====================================================================;
+def map_master(comm, work_list, cost_list):
+
+    results = run_master(comm, work_list, cost_list, stop_workers = False)
+
+    return [results[item] for item in work_list]
@@ -0,0 +1,102 @@
+# In-memory training history of a DNN model (replaces CSVLogger + re-read)
+#   A Keras callback keeps loss/val_loss of every epoch in memory and tracks the
+#   best epoch (min val_loss) online; the history is written ONCE at the end of
+#   fit as a small binary file (atomic write), e.g.,
+#	1_InvDNNModel_ss_th/<model_id>_model/FwdDNNModel_Loss.npz (epoch, loss, val_loss)
+#   Successive halving: a rung continues the history of the earlier rungs
+#   (append = True), so the best epoch is over all epochs of the model
+#
+# Usage (inside get_trained_models):
+#	hist_logger = BestEpochHistory(path_fl_sav + "FwdDNNModel_Loss.npz", append = initial_epoch > 0)
+#	fwd_model.fit(..., callbacks = [hist_logger])
+#	hist_logger.best_epoch, hist_logger.best_val_loss, hist_logger.history['loss']
+#	(NaN val_loss epochs are skipped; best_* stay NaN if no epoch is finite)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import numpy as np
+import tensorflow as tf
+
+#======================================================;
+#  Function-1: Load the history of a model (or None)   ;
+#              ({'epoch', 'loss', 'val_loss'} arrays)  ;
+#======================================================;
+def load_history(fl_hist):
+
+    if not os.path.exists(fl_hist):
+        return None
+    #
+    with np.load(fl_hist) as data:
+        history = {name: data[name] for name in data.files}
+
+    return history
+
+#====================================================;
+#  Function-2: Save the history of a model (atomic)  ;
+#====================================================;
+def save_history(fl_hist, history):
+
+    tmp_name = fl_hist[:-4] + "." + str(os.getpid()) + ".tmp.npz"
+    np.savez(tmp_name, epoch = np.asarray(history['epoch'], dtype = np.int32), \
+                loss = np.asarray(history['loss'], dtype = np.float64), \
+                val_loss = np.asarray(history['val_loss'], dtype = np.float64))
+    os.replace(tmp_name, fl_hist)
+
+#===============================================================;
+#  Function-3: Best epoch and min val loss of a loss history    ;
+#              (NaN epochs skipped; (NaN, NaN) if none finite)  ;
+#===============================================================;
+def get_best_epoch(val_loss):
+
+    val_loss = np.asarray(val_loss, dtype = np.float64)
+    if not np.any(~np.isnan(val_loss)): #Diverged model (pandas idxmin raises here)
+        return np.nan, np.nan
+    best_epoch = int(np.nanargmin(val_loss))
+
+    return best_epoch, float(val_loss[best_epoch])
+
+#===========================================================;
+#  Function-4: Callback -- history and best epoch (online)  ;
+#===========================================================;
+class BestEpochHistory(tf.keras.callbacks.Callback):
+
+    def __init__(self, fl_hist, append = False):
+
+        #-----------------------------------------------------;
+        #  append --> continue the saved history (next rung)  ;
+        #-----------------------------------------------------;
+        super().__init__()
+        self.fl_hist       = fl_hist
+        self.history       = {'epoch': [], 'loss': [], 'val_loss': []}
+        self.best_epoch    = np.nan #NaN until an epoch has a finite val_loss (diverged model)
+        self.best_val_loss = np.nan
+        self.best_loss     = np.nan
+        #
+        old_history = load_history(fl_hist) if append else None
+        if old_history is not None:
+            for epoch, loss, val_loss in zip(old_history['epoch'], old_history['loss'], \
+                                            old_history['val_loss']):
+                self.add_epoch(int(epoch), float(loss), float(val_loss))
+
+    def add_epoch(self, epoch, loss, val_loss):
+
+        self.history['epoch'].append(epoch)
+        self.history['loss'].append(loss)
+        self.history['val_loss'].append(val_loss)
+        if np.isnan(val_loss): #Skipped, like np.nanargmin and pandas idxmin/min
+            return
+        if np.isnan(self.best_val_loss) or val_loss < self.best_val_loss: #First epoch of the min
+            self.best_epoch    = epoch
+            self.best_val_loss = val_loss
+            self.best_loss     = loss
+
+    def on_epoch_end(self, epoch, logs = None):
+
+        logs = logs or {}
+        self.add_epoch(int(epoch), float(logs.get('loss', np.nan)), \
+                        float(logs.get('val_loss', np.nan)))
+
+    def on_train_end(self, logs = None):
+
+        save_history(self.fl_hist, self.history) #One write per fit
@@ -0,0 +1,125 @@
+# Warm worker pool for the multiprocessing runners (get_dnn_results_nodataug_*.py)
+#   Each pool worker is started ONCE and kept for the whole sweep:
+#	initializer --> pins TF/OpenMP threads (and cores, see get_launcher.py)
+#	                and runs a warm-up function (e.g., dataset and HP table
+#	                into the process caches)
+#	tasks       --> pulled one at a time from the task queue (imap_unordered)
+#   Every task reports its wall time and worker pid, so the per-task overhead
+#   of the pool (dispatch, result transfer, idle workers) is printed at the end
+#   Calibration: the same short tasks are run for every procs x threads split
+#   of a node and the split with the highest models/hour is returned
+#
+# Usage (see run_pool_sweep of get_sweep_runner.py, pool_mode = 'warm'):
+#	pool    = get_warm_pool(num_procs, num_threads, get_warm_worker, bind_cores = True)
+#	results = run_warm_map(pool, get_trained_models_manifest, args_inp_list)
+#	(num_procs, num_threads), rates = run_calibration(get_calibration_model, calib_list, 64)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import time
+import multiprocessing
+
+from get_launcher import set_process_resources, get_core_set, get_worker_slot, get_calibration_splits
+
+_warm_time = None #Seconds spent in the initializer of this worker
+
+#==============================================================;
+#  Function-1: Initializer of a worker (runs once per worker)  ;
+#              (counter --> worker slot --> block of cores)    ;
+#==============================================================;
+def init_warm_worker(num_threads, warm_function, counter = None):
+
+    global _warm_time
+    #
+    tic      = time.perf_counter()
+    core_set = None if counter is None else get_core_set(get_worker_slot(counter), num_threads)
+    set_process_resources(num_threads, core_set)
+    import tensorflow #Imported once per worker (no-op if inherited by fork)
+    if warm_function is not None:
+        warm_function()
+    _warm_time = time.perf_counter() - tic
+
+#================================================================;
+#  Function-2: Run one task in a worker (with its wall time)     ;
+#              (args = (position in task list, function, task))  ;
+#================================================================;
+def run_warm_task(args):
+
+    i, function, task = args
+    tic               = time.perf_counter()
+    result            = function(task)
+
+    return i, result, time.perf_counter() - tic, os.getpid(), _warm_time
+
+#=================================================;
+#  Function-3: Pool of warm (long-lived) workers  ;
+#              (bind_cores --> one core block     ;
+#               of num_threads cores per worker)  ;
+#=================================================;
+def get_warm_pool(num_procs, num_threads = 1, warm_function = None, bind_cores = False):
+
+    counter = multiprocessing.Value('i', 0) if bind_cores and num_threads is not None else None
+
+    return multiprocessing.Pool(processes = num_procs, initializer = init_warm_worker, \
+                                initargs = (num_threads, warm_function, counter))
+
+#==================================================================;
+#  Function-4: Map a function over tasks on a warm pool            ;
+#              (results in the order of task_list, like pool.map)  ;
+#==================================================================;
+def run_warm_map(pool, function, task_list):
+
+    #--------------------------------------------------------;
+    #  Idle workers pull the next task (chunksize = 1); the  ;
+    #  overhead is the pool time not spent inside the tasks  ;
+    #--------------------------------------------------------;
+    tic        = time.perf_counter()
+    results    = [None for task in task_list]
+    busy_time  = 0.0
+    warm_times = {}
+    #
+    for i, result, task_time, pid, warm_time in pool.imap_unordered(run_warm_task, \
+            [(i, function, task) for i, task in enumerate(task_list)], chunksize = 1):
+        results[i]      = result
+        busy_time       = busy_time + task_time
+        warm_times[pid] = warm_time
+    #
+    wall_time  = time.perf_counter() - tic
+    num_tasks  = max(len(task_list), 1)
+    overhead   = (wall_time * len(warm_times) - busy_time) / num_tasks #Workers that ran tasks
+    #
+    print('Tasks, workers, wall time, busy time in seconds = ', len(task_list), \
+            len(warm_times), wall_time, busy_time)
+    print('Per-task overhead, mean worker warm-up in seconds = ', overhead, \
+            sum([t for t in warm_times.values() if t is not None]) / max(len(warm_times), 1))
+
+    return results
+
+#=====================================================================;
+#  Function-5: Calibrate procs x threads of a node (models per hour)  ;
+#              (same tasks for every split; use at least as many      ;
+#               tasks as cores, e.g., short runs of sampled models)   ;
+#=====================================================================;
+def run_calibration(function, task_list, cores_per_node, warm_function = None, max_threads = None):
+
+    #-------------------------------------------------------;
+    #  One pool per split (workers bound to core blocks);   ;
+    #  pool start-up and warm-up are part of the wall time  ;
+    #-------------------------------------------------------;
+    rates = {}
+    #
+    for num_procs, num_threads in get_calibration_splits(cores_per_node, max_threads):
+        tic  = time.perf_counter()
+        pool = get_warm_pool(num_procs, num_threads, warm_function, bind_cores = True)
+        run_warm_map(pool, function, task_list)
+        pool.close()
+        pool.join()
+        rates[(num_procs, num_threads)] = len(task_list) * 3600.0 / (time.perf_counter() - tic)
+        print('Calibration: procs, threads, models/hour = ', num_procs, num_threads, \
+                rates[(num_procs, num_threads)])
+    #
+    best_split = max(rates, key = rates.get)
+    print('Best split: procs, threads = ', best_split)
+
+    return best_split, rates
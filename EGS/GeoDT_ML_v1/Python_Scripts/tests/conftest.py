@@ -0,0 +1,47 @@
+# Tests of the helper modules of the DNN sweep (pytest)
+#   The scripts import each other as top-level modules (from get_launcher import ...),
+#   so the Python_Scripts folder is put on the path
+#
+# Usage (from Python_Scripts/):
+#	python -m pytest -q tests
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import sys
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#================================================================;
+#  Function-1: Small GeoDT data tree (path/Data/...) for tests   ;
+#              (20 realz = 12 train + 4 val + 4 test; 5 params;  ;
+#               NPV outliers (<= -1) in train and test)          ;
+#================================================================;
+@pytest.fixture
+def geodt_path(tmp_path):
+
+    num_realz, num_train, num_params = 20, 12, 5
+    path           = str(tmp_path) + "/"
+    path_pp_models = path + 'Data/PreProcess_Models/'
+    path_pp_data   = path + 'Data/PreProcessed_Data/'
+    for path_dir in [path_pp_models, path_pp_data, path + 'Data/Train_Val_Test_Indices/']:
+        os.makedirs(path_dir, exist_ok = True)
+    #
+    rng            = np.random.default_rng(0)
+    p_data         = rng.normal(size = (num_realz, num_params))
+    npv_data       = rng.uniform(-0.5, 0.5, size = (num_realz, 1))
+    npv_data[[2, 17],0] = -1.5 #Outliers (train row 2, test row 1)
+    #
+    pd.DataFrame(p_data, columns = ['p' + str(i) for i in range(0,num_params)]).to_csv(path + 'Data/geodt_params.csv')
+    np.save(path_pp_data + "ss_p_" + str(num_realz) + ".npy", p_data)
+    np.save(path_pp_data + "ss_npv_" + str(num_realz) + ".npy", npv_data)
+    for fl_name, x_data in [("p_ss_", p_data), ("npv_ss_", npv_data)]:
+        with open(path_pp_models + fl_name + str(num_train) + ".sav", 'wb') as fl_id:
+            pickle.dump(StandardScaler().fit(x_data[0:num_train]), fl_id)
+
+    return path
@@ -0,0 +1,72 @@
+# Tests of get_arch_registry.py (architecture diagrams rendered once per layout)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import pytest
+import tensorflow as tf
+
+import get_arch_registry
+from get_arch_registry import get_arch_key, get_arch_diagrams, link_arch_diagrams
+
+#=============================================================;
+#  Function-1: plot_model that writes a small file (counted)  ;
+#              (no pydot/graphviz needed)                     ;
+#=============================================================;
+@pytest.fixture
+def plot_calls(monkeypatch):
+
+    calls = []
+    #
+    def plot_model(model, fl_name, show_shapes = False):
+        calls.append((os.path.basename(fl_name), show_shapes))
+        with open(fl_name, 'w') as fl_id:
+            fl_id.write(str(show_shapes))
+    #
+    monkeypatch.setattr(tf.keras.utils, 'plot_model', plot_model)
+    monkeypatch.setattr(get_arch_registry, '_arch_cache', {})
+
+    return calls
+
+def test_arch_key():
+
+    assert get_arch_key([117, 50, 20, 1]) == '117-50-20-1'
+    assert get_arch_key([117.0, 1000, 1]) == '117-1000-1'
+
+def test_diagrams_rendered_once_per_layout(tmp_path, plot_calls):
+
+    path_registry = str(tmp_path) + "/Architectures/"
+    arch_files    = get_arch_diagrams(None, path_registry, [117, 50, 1])
+    #
+    assert arch_files == {'Full-Fwd-DNN-Model-a.png': path_registry + "117-50-1/Full-Fwd-DNN-Model-a.png", \
+                          'Full-Fwd-DNN-Model-b.png': path_registry + "117-50-1/Full-Fwd-DNN-Model-b.png"}
+    assert sorted(os.listdir(path_registry + "117-50-1/")) == sorted(arch_files.keys()) #No tmp files
+    assert get_arch_diagrams(None, path_registry, [117, 50, 1]) == arch_files #Cache of this process
+    get_arch_registry._arch_cache.clear()
+    assert get_arch_diagrams(None, path_registry, [117, 50, 1]) == arch_files #Registry on disk
+    assert len(plot_calls) == 2
+    get_arch_diagrams(None, path_registry, [117, 250, 1])
+    assert len(plot_calls) == 4
+
+def test_no_diagrams_without_graphviz(tmp_path, monkeypatch):
+
+    def plot_model(model, fl_name, show_shapes = False):
+        raise ImportError('You must install pydot')
+    #
+    monkeypatch.setattr(tf.keras.utils, 'plot_model', plot_model)
+    monkeypatch.setattr(get_arch_registry, '_arch_cache', {})
+    assert get_arch_diagrams(None, str(tmp_path) + "/", [117, 1]) == {}
+
+def test_link_diagrams(tmp_path, plot_calls):
+
+    arch_files  = get_arch_diagrams(None, str(tmp_path) + "/Architectures/", [117, 50, 1])
+    path_fl_sav = str(tmp_path) + "/1_model/"
+    os.makedirs(path_fl_sav)
+    link_arch_diagrams(path_fl_sav, arch_files)
+    link_arch_diagrams(path_fl_sav, arch_files) #Existing links are kept
+    #
+    fl_link = path_fl_sav + "Full-Fwd-DNN-Model-a.png"
+    assert os.path.islink(fl_link)
+    assert os.readlink(fl_link) == "../Architectures/117-50-1/Full-Fwd-DNN-Model-a.png"
+    with open(fl_link, 'r') as fl_id:
+        assert fl_id.read() == 'True'
@@ -0,0 +1,47 @@
+# Tests of get_columnar_store.py (binary column groups)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from get_columnar_store import save_column_group, save_column_groups, is_column_group, \
+                                load_column_group, load_csv_column_group
+
+def test_column_group_roundtrip(tmp_path):
+
+    path_store = str(tmp_path) + "/Columnar_Data/"
+    save_column_group(path_store, 'npv', np.arange(0,5), ['npv']) #1D --> (5, 1)
+    x_data, column_names = load_column_group(path_store, 'npv')
+    #
+    assert isinstance(x_data, np.memmap) and x_data.shape == (5, 1) and x_data.dtype == np.float64
+    assert column_names == ['npv']
+    assert sorted(os.listdir(path_store)) == ['npv.json', 'npv.npy'] #No temporary files left
+    with pytest.raises(FileNotFoundError):
+        load_column_group(path_store, 'hpro')
+
+def test_column_groups_of_dataframe(tmp_path):
+
+    path_store = str(tmp_path) + "/"
+    df         = pd.DataFrame(np.arange(0,24).reshape(4, 6), columns = list('abcdef'))
+    save_column_groups(path_store, df, {'params': range(0,4), 'npv': [4], 'hpro': [5]})
+    #
+    for name, columns in [('params', list('abcd')), ('npv', ['e']), ('hpro', ['f'])]:
+        x_data, column_names = load_column_group(path_store, name)
+        assert column_names == columns
+        np.testing.assert_array_equal(x_data, df[columns].values)
+
+def test_csv_parsed_once(tmp_path):
+
+    path_store = str(tmp_path) + "/store/"
+    csv_name   = str(tmp_path) + "/geodt_params.csv"
+    df         = pd.DataFrame({'pin': [1.0, 2.0], 'size': [3.0, 4.0]}, index = [0, 1])
+    df.to_csv(csv_name)
+    x_data, column_names = load_csv_column_group(path_store, 'params', csv_name)
+    os.remove(csv_name) #Second load reads the store only
+    #
+    assert is_column_group(path_store, 'params')
+    assert load_csv_column_group(path_store, 'params', csv_name)[1] == ['pin', 'size']
+    np.testing.assert_array_equal(x_data, df.values)
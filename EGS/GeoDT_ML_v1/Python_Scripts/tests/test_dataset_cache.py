@@ -0,0 +1,84 @@
+# Tests of get_dataset_cache.py (process-level dataset cache, shared copy per node)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import numpy as np
+import pytest
+
+import get_dataset_cache
+from get_dataset_cache import get_cached_dataset, load_dataset, get_shared_path, \
+                                publish_shared_dataset, load_shared_dataset, remove_shared_dataset, \
+                                get_source_stamp
+
+def test_dataset_splits_and_outliers(geodt_path):
+
+    dataset = load_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4)
+    npv     = np.load(geodt_path + "Data/PreProcessed_Data/ss_npv_20.npy")
+    #
+    assert dataset['train_p'].shape == (11, 5) and dataset['val_p'].shape == (4, 5)
+    assert dataset['test_q'].shape == (3, 1)
+    np.testing.assert_array_equal(dataset['train_q'], np.delete(npv[0:12], 2, axis = 0))
+    np.testing.assert_array_equal(dataset['test_q'], np.delete(npv[16:20], 1, axis = 0))
+    assert dataset['p_list'] == ['p0', 'p1', 'p2', 'p3', 'p4']
+    assert dataset['qq_scalar'].mean_.shape == (1,)
+
+def test_cached_once_and_read_only(geodt_path):
+
+    dataset = get_cached_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4)
+    #
+    assert get_cached_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4) is dataset
+    assert get_cached_dataset(geodt_path, "ss", "npv_", 20, 12, 3, 5) is not dataset #Other key
+    with pytest.raises(ValueError):
+        dataset['train_p'][0,0] = 1.0
+
+def test_shared_dataset_publish_load_remove(geodt_path, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(get_dataset_cache, '_shared_root', str(tmp_path) + "/shm/")
+    monkeypatch.setattr(get_dataset_cache, '_dataset_cache', {})
+    path_shared = publish_shared_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4)
+    dataset     = load_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4)
+    #
+    assert path_shared == get_shared_path(geodt_path, "ss", "npv_", 20, 12, 4, 4)
+    assert path_shared != get_shared_path(geodt_path, "ss", "npv_", 20, 12, 3, 5)
+    assert not any(fl_name.endswith('.tmp') or '.tmp.' in fl_name for fl_name in os.listdir(path_shared))
+    shared = get_cached_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4) #Attached, not loaded
+    assert sorted(shared.keys()) == sorted(dataset.keys())
+    for name, value in dataset.items():
+        if isinstance(value, np.ndarray):
+            assert isinstance(shared[name], np.memmap) and not shared[name].flags.writeable
+            np.testing.assert_array_equal(shared[name], value)
+    assert shared['p_list'] == dataset['p_list']
+    np.testing.assert_array_equal(shared['qq_scalar'].mean_, dataset['qq_scalar'].mean_)
+    #
+    remove_shared_dataset(path_shared)
+    remove_shared_dataset(None)
+    assert not os.path.exists(path_shared)
+    np.testing.assert_array_equal(shared['train_p'], dataset['train_p']) #Mapped pages stay valid
+
+def test_shared_dataset_republish_replaces(geodt_path, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(get_dataset_cache, '_shared_root', str(tmp_path) + "/")
+    path_shared = publish_shared_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4)
+    with open(path_shared + "stale.npy", 'w') as fl_id:
+        fl_id.write('old copy')
+    #
+    assert publish_shared_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4) == path_shared
+    assert not os.path.exists(path_shared + "stale.npy")
+    assert load_shared_dataset(path_shared)['val_q'].shape == (4, 1)
+
+def test_stale_shared_dataset_not_attached(geodt_path, tmp_path, monkeypatch):
+
+    monkeypatch.setattr(get_dataset_cache, '_shared_root', str(tmp_path) + "/shm/")
+    monkeypatch.setattr(get_dataset_cache, '_dataset_cache', {})
+    path_shared = publish_shared_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4)
+    fl_npv      = geodt_path + "Data/PreProcessed_Data/ss_npv_20.npy"
+    npv_data    = np.load(fl_npv)
+    np.save(fl_npv, npv_data * 0.5) #Data/ changed after the copy was published
+    os.utime(fl_npv, ns = (0, os.stat(fl_npv).st_mtime_ns + 10**9))
+    #
+    assert load_shared_dataset(path_shared, get_source_stamp(geodt_path, "ss", "npv_", 20, 12, 4, 4)) is None
+    assert load_shared_dataset(path_shared)['val_q'].shape == (4, 1) #No stamp given --> attached
+    dataset = get_cached_dataset(geodt_path, "ss", "npv_", 20, 12, 4, 4) #Loaded from Data/
+    assert not isinstance(dataset['val_q'], np.memmap)
+    np.testing.assert_allclose(dataset['val_q'][:,0], 0.5 * npv_data[12:16,0])
@@ -0,0 +1,70 @@
+# Tests of get_hp_grid.py (declarative hyperparameter grid)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import itertools
+import numpy as np
+import pytest
+
+from get_hp_grid import hp_grid_spec, hp_common, get_block_sizes, get_block_offsets, \
+                        iter_hp_grid, get_hp_grid_row, get_hp_subsample
+
+#===========================================================;
+#  Function-1: hp rows of the old nested loops (one block)  ;
+#              (neurons outer, ..., batch_size inner)       ;
+#===========================================================;
+def get_nested_loop_rows(neurons_list, counter):
+
+    hp_rows = []
+    for neurons in neurons_list:
+        for dropout_value in hp_common['dropout_value']:
+            for alpha_value in hp_common['alpha_value']:
+                for lr_values in hp_common['lr_values']:
+                    for epochs in hp_common['epochs']:
+                        for batch_size in hp_common['batch_size']:
+                            hp_rows.append([counter, len(neurons), list(neurons), dropout_value, \
+                                            alpha_value, lr_values, epochs, batch_size])
+                            counter = counter + 1
+
+    return hp_rows
+
+def test_grid_same_as_nested_loops():
+
+    hp_list = list(iter_hp_grid(hp_grid_spec))
+    #
+    assert len(hp_list) == 21875
+    assert get_block_sizes(hp_grid_spec) == [9375, 9375, 3125]
+    assert get_block_offsets(hp_grid_spec) == [1, 9376, 18751]
+    assert hp_list == get_nested_loop_rows([[1000], [500], [250]], 1) + \
+                        get_nested_loop_rows([[1000, 500], [1000, 250], [500, 250]], 9376) + \
+                        get_nested_loop_rows([[1000, 500, 250]], 18751)
+
+def test_grid_row_unranking():
+
+    for hp_row in itertools.islice(iter_hp_grid(hp_grid_spec), 0, 21875, 997):
+        assert get_hp_grid_row(hp_grid_spec, hp_row[0] - 1) == hp_row
+    assert get_hp_grid_row(hp_grid_spec, 21874)[0] == 21875
+    with pytest.raises(IndexError):
+        get_hp_grid_row(hp_grid_spec, 21875)
+
+@pytest.mark.parametrize("method", ['random', 'lhs'])
+def test_subsample_keeps_grid_ids(method):
+
+    hp_list   = get_hp_subsample(hp_grid_spec, 200, method = method, seed = 0)
+    model_ids = [hp_row[0] for hp_row in hp_list]
+    #
+    assert len(set(model_ids)) == 200
+    for hp_row in hp_list:
+        assert get_hp_grid_row(hp_grid_spec, hp_row[0] - 1) == hp_row
+    assert get_hp_subsample(hp_grid_spec, 200, method = method, seed = 0) == hp_list #Seeded
+
+def test_lhs_covers_levels():
+
+    hp_list = get_hp_subsample(hp_grid_spec, 500, method = 'lhs', seed = 1)
+    #
+    assert [np.sum([hp_row[1] == i for hp_row in hp_list]) for i in [1, 2, 3]] == [214, 214, 72]
+    for name, column in [('epochs', 6), ('batch_size', 7), ('lr_values', 5)]:
+        assert set(hp_row[column] for hp_row in hp_list) == set(hp_common[name]) #Every level sampled
+    assert len(get_hp_subsample(hp_grid_spec, 30000)) == 21875 #Larger than the grid
+    with pytest.raises(ValueError):
+        get_hp_subsample(hp_grid_spec, 10, method = 'sobol')
@@ -0,0 +1,57 @@
+# Tests of get_hp_inputs.py (HP table instead of hp_input_deck.txt files)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import pytest
+
+from get_hp_inputs import read_hp_input_deck, get_hp_hash, save_hp_table, load_hp_table, \
+                            get_hp_row, get_hp, get_model_dir
+
+HP_LIST = [[3, 2, [50, 20], 0.1, 0.2, 1e-3, 100, 64], \
+           [1, 1, 40, 0.0, 0.1, 1e-4, 500, 32], \
+           [2, 3, [30, 20, 10], 0.4, 0.3, 1e-2, 200, 128]]
+
+def test_hp_same_as_input_deck(tmp_path):
+
+    fl_deck  = tmp_path / "hp_input_deck.txt"
+    fl_deck.write_text("num_layers = 2\nneurons = 50,20\ndropout_value = 0.1\nalpha_value = 0.2\n" \
+                        "lr_values = 0.001\nepochs = 100\nbatch_size = 64\n")
+    hp_table = save_hp_table(str(tmp_path) + "/HP_Table.npy", HP_LIST)
+    hp       = get_hp(hp_table, 3)
+    #
+    assert list(hp_table['model_id']) == [1, 2, 3] #Sorted by model id
+    assert hp.pop('hp_hash') == get_hp_hash(2, [50, 20], 0.1, 0.2, 1e-3, 100, 64)
+    assert hp == read_hp_input_deck(str(fl_deck))
+    assert get_hp(hp_table, 1)['neurons'] == [40] #1-DNN-layer (int in hp_list)
+
+def test_hp_table_memmap_cached(tmp_path):
+
+    fl_name  = str(tmp_path) + "/Models/HP_Table.npy" #Folder created
+    save_hp_table(fl_name, HP_LIST)
+    hp_table = load_hp_table(fl_name)
+    #
+    assert load_hp_table(fl_name) is hp_table
+    assert get_hp(hp_table, 2)['neurons'] == [30, 20, 10]
+
+def test_hp_row_lookup(tmp_path):
+
+    hp_table  = save_hp_table(str(tmp_path) + "/HP_Table.npy", [HP_LIST[0], HP_LIST[2]]) #Ids 2, 3
+    sub_table = save_hp_table(str(tmp_path) + "/HP_Sub.npy", \
+                                [[10, 1, 5, 0.0, 0.1, 1e-3, 10, 8], [40, 1, 5, 0.0, 0.1, 1e-3, 10, 8]])
+    #
+    assert get_hp_row(hp_table, 3) == 1 #Contiguous ids (offset)
+    assert get_hp_row(sub_table, 40) == 1 #Binary search
+    for table, model_id in [(hp_table, 1), (hp_table, 4), (sub_table, 20)]:
+        with pytest.raises(KeyError):
+            get_hp_row(table, model_id)
+
+def test_hp_table_errors_and_hash(tmp_path):
+
+    with pytest.raises(ValueError):
+        save_hp_table(str(tmp_path) + "/HP_Table.npy", [HP_LIST[0], HP_LIST[0]])
+    assert get_hp_hash(1, 40, 0.0, 0.1, 1e-4, 500, 32) == get_hp_hash(1, [40], 0, 0.1, 0.0001, 500, 32)
+    assert get_hp_hash(1, 40, 0.0, 0.1, 1e-4, 500, 32) != get_hp_hash(1, 40, 0.0, 0.1, 1e-4, 500, 64)
+    assert get_model_dir(str(tmp_path) + "/", 7).endswith("/7_model/")
+    assert not (tmp_path / "7_model").exists() #Path only
+    assert get_model_dir(str(tmp_path) + "/", 7, create = True) == str(tmp_path) + "/7_model/"
+    assert (tmp_path / "7_model").is_dir()
@@ -0,0 +1,73 @@
+# Tests of get_input_pipeline.py (tf.data datasets, one predict call)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+import tensorflow as tf
+
+from get_input_pipeline import get_eval_dataset, get_mixup_dataset, get_train_dataset, \
+                                predict_splits
+
+#===================================================;
+#  Function-1: Rows of all batches of one epoch     ;
+#              (concatenated x and y of a dataset)  ;
+#===================================================;
+def get_epoch_rows(dataset):
+
+    batch_list = [(x.numpy(), y.numpy()) for x, y in dataset]
+
+    return np.concatenate([x for x, _ in batch_list]), np.concatenate([y for _, y in batch_list])
+
+def test_eval_dataset_in_order():
+
+    x = np.arange(30, dtype = float).reshape(10, 3)
+    y = np.arange(20, dtype = float).reshape(10, 2)
+    x_ds, y_ds = get_epoch_rows(get_eval_dataset(x, y, 4))
+    #
+    assert [len(x_b) for x_b in get_eval_dataset(x, batch_size = 4)] == [4, 4, 2]
+    assert x_ds.dtype == np.float32
+    np.testing.assert_array_equal(x_ds, x)
+    np.testing.assert_array_equal(y_ds, y)
+
+def test_train_dataset_reshuffles_each_epoch():
+
+    x        = np.arange(64, dtype = float).reshape(32, 2)
+    y        = x[:,:1] * 10.0
+    train_ds = get_train_dataset(x, y, 8, seed = 3)
+    x_1, y_1 = get_epoch_rows(train_ds)
+    x_2, _   = get_epoch_rows(train_ds)
+    #
+    np.testing.assert_array_equal(np.sort(x_1[:,0]), x[:,0]) #One pass over all realz
+    np.testing.assert_array_equal(y_1, x_1[:,:1] * 10.0) #Rows stay paired
+    assert not np.array_equal(x_1, x_2)
+    np.testing.assert_array_equal(get_epoch_rows(get_train_dataset(x, y, 8, seed = 3))[0], x_1)
+
+def test_train_dataset_with_mixup_rows():
+
+    x        = np.random.default_rng(0).random((16, 3))
+    y        = x.sum(axis = 1, keepdims = True) #Linear --> mixed y = sum of mixed x
+    train_ds = get_train_dataset(x, y, 8, mixup_ratio = 0.5)
+    #
+    batch_list = [(x_b.numpy(), y_b.numpy()) for x_b, y_b in train_ds]
+    assert [len(x_b) for x_b, _ in batch_list] == [12, 12]
+    for x_b, y_b in batch_list:
+        np.testing.assert_allclose(y_b, x_b.sum(axis = 1, keepdims = True), rtol = 1e-5)
+
+def test_mixup_dataset_is_endless():
+
+    x      = np.random.default_rng(1).random((6, 2))
+    mix_ds = get_mixup_dataset(x, x, 5)
+    #
+    assert len(list(mix_ds.take(20))) == 20
+
+def test_predict_splits_same_as_separate_calls():
+
+    tf.keras.utils.set_random_seed(0)
+    model  = tf.keras.Sequential([tf.keras.Input(shape = (3,)), tf.keras.layers.Dense(2)])
+    rng    = np.random.default_rng(2)
+    x_list = [rng.random((7, 3)), rng.random((2, 3)), rng.random((4, 3))]
+    #
+    pred_list = predict_splits(model, x_list, batch_size = 5)
+    assert [pred.shape for pred in pred_list] == [(7, 2), (2, 2), (4, 2)]
+    for x, pred in zip(x_list, pred_list):
+        np.testing.assert_allclose(pred, model.predict(x, verbose = 0), rtol = 1e-5, atol = 1e-6)
@@ -0,0 +1,55 @@
+# Tests of get_launcher.py (threads and CPU affinity per process)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import multiprocessing
+import pytest
+
+from get_launcher import get_threads_per_proc, get_core_set, set_process_resources, \
+                            get_worker_slot, get_calibration_splits
+
+def test_threads_per_proc():
+
+    assert get_threads_per_proc(68, 17) == 4
+    assert get_threads_per_proc(64, 6) == 10
+    assert get_threads_per_proc(4, 8) == 1 #Oversubscribed --> one thread each
+    assert get_threads_per_proc(36, 0) == 36
+
+def test_core_set_blocks(monkeypatch):
+
+    monkeypatch.setattr(os, 'sched_getaffinity', lambda pid: {0, 1, 2, 3, 8, 9}, raising = False)
+    #
+    assert get_core_set(0, 2) == [0, 1]
+    assert get_core_set(1, 2) == [2, 3]
+    assert get_core_set(2, 2) == [8, 9] #Cores allowed for the job (not 4, 5)
+    assert get_core_set(3, 2) == [0, 1] #Wraps
+    assert get_core_set(1, 4) == [8, 9, 0, 1]
+
+def test_worker_slots_unique():
+
+    counter = multiprocessing.Value('i', 0)
+    #
+    assert [get_worker_slot(counter) for i in range(0,4)] == [0, 1, 2, 3]
+    assert counter.value == 4
+
+def test_calibration_splits():
+
+    assert get_calibration_splits(12) == [(1, 12), (2, 6), (3, 4), (4, 3), (6, 2), (12, 1)]
+    assert get_calibration_splits(68, max_threads = 4) == [(17, 4), (34, 2), (68, 1)]
+
+@pytest.mark.skipif(not hasattr(os, 'sched_setaffinity'), reason = "no CPU affinity control")
+def test_set_process_resources(monkeypatch):
+
+    for env_name in ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', \
+                        'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS']:
+        monkeypatch.delenv(env_name, raising = False)
+    core_set = get_core_set(0, 1)
+    old_set  = os.sched_getaffinity(0)
+    #
+    try:
+        set_process_resources(1, core_set)
+        assert os.sched_getaffinity(0) == set(core_set)
+        assert os.environ['OMP_NUM_THREADS'] == '1' and os.environ['TF_NUM_INTEROP_THREADS'] == '1'
+    finally:
+        os.sched_setaffinity(0, old_set)
@@ -0,0 +1,212 @@
+# Tests of get_mixup.py (pair unranking, batched kernel, shard materializer)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import json
+from itertools import combinations
+import numpy as np
+import pytest
+
+from get_mixup import mixup_data_twosamples, get_all_unique_pairs, get_num_pairs, \
+                        get_pairs_from_ranks, iter_pair_chunks, iter_mixup_batches, \
+                        get_mixup_rng, get_mixup_lambdas, mixup_batch, get_shard_name, \
+                        run_mixup_materializer, iter_mixup_shards
+
+@pytest.mark.parametrize("num_realz", [2, 3, 7, 50, 523])
+def test_pairs_same_as_combinations(num_realz):
+
+    comb_list = np.array(list(combinations(range(num_realz), 2)))
+    #
+    assert get_num_pairs(num_realz) == len(comb_list)
+    np.testing.assert_array_equal(get_all_unique_pairs(num_realz, 2), comb_list)
+
+def test_pairs_k3_uses_combinations():
+
+    np.testing.assert_array_equal(get_all_unique_pairs(6, 3), \
+                                    np.array(list(combinations(range(6), 3))))
+
+def test_pairs_from_ranks_large_num_realz():
+
+    num_realz = 10439 #54,481,141 pairs --> ranks near the row boundaries
+    num_pairs = get_num_pairs(num_realz)
+    rows      = np.array([0, 1, 2, 5000, num_realz - 3, num_realz - 2], dtype = np.int64)
+    offsets   = rows * (2 * num_realz - rows - 1) // 2
+    ranks     = np.concatenate([offsets, offsets - 1, offsets + 1, [num_pairs - 1]])
+    ranks     = ranks[(ranks >= 0) & (ranks < num_pairs)]
+    i, j      = get_pairs_from_ranks(ranks, num_realz)
+    #
+    assert np.all((0 <= i) & (i < j) & (j < num_realz))
+    np.testing.assert_array_equal(i * (2 * num_realz - i - 1) // 2 + (j - i - 1), ranks)
+    assert (i[-1], j[-1]) == (num_realz - 2, num_realz - 1)
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 10, 100])
+def test_pair_chunks_cover_all_ranks(chunk_size):
+
+    chunk_list = list(iter_pair_chunks(11, chunk_size))
+    #
+    assert all(chunk.shape[0] <= chunk_size for chunk in chunk_list)
+    np.testing.assert_array_equal(np.concatenate(chunk_list), get_all_unique_pairs(11, 2))
+
+def test_pair_chunks_start_stop():
+
+    chunk_list = list(iter_pair_chunks(11, 4, start = 7, stop = 30))
+    #
+    np.testing.assert_array_equal(np.concatenate(chunk_list), get_all_unique_pairs(11, 2)[7:30])
+    assert list(iter_pair_chunks(11, 4, start = 55)) == []
+
+def test_lambdas_constant():
+
+    lam_ids = get_mixup_lambdas(get_mixup_rng(), 5, 2, lam = 0.3)
+    #
+    np.testing.assert_allclose(lam_ids, np.tile([0.3, 0.7], (5, 1)))
+    np.testing.assert_allclose(get_mixup_lambdas(get_mixup_rng(), 4, 3), np.full((4, 3), 1.0 / 3))
+
+@pytest.mark.parametrize("k", [2, 4])
+def test_lambdas_beta_dirichlet(k):
+
+    lam_ids = get_mixup_lambdas(get_mixup_rng(1337, 2), 1000, k, alpha = 0.4, beta = 0.4)
+    #
+    assert lam_ids.shape == (1000, k)
+    assert np.all((lam_ids >= 0.0) & (lam_ids <= 1.0))
+    np.testing.assert_allclose(lam_ids.sum(axis = 1), 1.0)
+    assert np.std(lam_ids[:,0]) > 0.1 #Not a constant lam
+
+def test_rng_per_worker():
+
+    lam_0 = get_mixup_lambdas(get_mixup_rng(1337, 0), 10, 2, alpha = 1.0)
+    #
+    np.testing.assert_array_equal(lam_0, get_mixup_lambdas(get_mixup_rng(1337, 0), 10, 2, alpha = 1.0))
+    assert not np.allclose(lam_0, get_mixup_lambdas(get_mixup_rng(1337, 1), 10, 2, alpha = 1.0))
+
+def test_mixup_batch_same_as_twosamples():
+
+    rng      = np.random.default_rng(0)
+    x_p      = rng.random((9, 5))
+    y_npv    = rng.random(9) #1D arrays stay 1D
+    pair_ids = get_all_unique_pairs(9, 2)
+    lam_ids  = get_mixup_lambdas(rng, len(pair_ids), 2)
+    x_lam, y_lam = mixup_batch([x_p, y_npv], pair_ids, lam_ids)
+    #
+    assert x_lam.shape == (36, 5) and y_lam.shape == (36,)
+    for b, (i, j) in enumerate(pair_ids):
+        x_ref, y_ref, _ = mixup_data_twosamples(x_p[i], x_p[j], y_npv[i], y_npv[j], None, None)
+        np.testing.assert_allclose(x_lam[b], x_ref)
+        np.testing.assert_allclose(y_lam[b], y_ref)
+
+def test_mixup_batch_k3_weights():
+
+    x_p     = np.arange(12, dtype = float).reshape(4, 3)
+    index   = np.array([[0, 1, 3], [2, 2, 1]])
+    lam_ids = np.array([[0.2, 0.3, 0.5], [1.0, 0.0, 0.0]])
+    x_lam,  = mixup_batch([x_p], index, lam_ids)
+    #
+    np.testing.assert_allclose(x_lam, np.einsum('bk,bkd->bd', lam_ids, x_p[index]))
+
+def test_mixup_batches_stream_all_pairs():
+
+    x_p = np.random.default_rng(1).random((8, 3))
+    y_p = np.random.default_rng(2).random((8, 2))
+    batch_list = list(iter_mixup_batches(x_p, y_p, 5))
+    pair_ids   = get_all_unique_pairs(8, 2)
+    #
+    assert [len(x_lam) for x_lam, _ in batch_list] == [5, 5, 5, 5, 5, 3]
+    np.testing.assert_allclose(np.concatenate([x_lam for x_lam, _ in batch_list]), \
+                                0.5 * (x_p[pair_ids[:,0]] + x_p[pair_ids[:,1]]))
+    assert len(list(iter_mixup_batches(x_p, y_p, 4, shuffle = True, num_batches = 3))) == 3
+
+#===========================================================;
+#  Function-1: Data arrays of a small materializer run      ;
+#              (13 realz --> 78 pairs; 1D and 2D outputs)   ;
+#===========================================================;
+def get_mixup_data_dict():
+
+    rng = np.random.default_rng(7)
+
+    return {'p': rng.random((13, 4)), 'hpro': rng.random((13, 3)), 'npv': rng.random(13)}
+
+#============================================================;
+#  Function-2: All shards of a run (concatenated per name)   ;
+#============================================================;
+def load_all_shards(path_shards, names):
+
+    return [np.concatenate(x_list) for x_list in \
+            zip(*iter_mixup_shards(path_shards, names))]
+
+@pytest.mark.parametrize("alpha", [None, 0.4])
+def test_materializer_same_for_any_num_procs(tmp_path, alpha):
+
+    data_dict = get_mixup_data_dict()
+    names     = ['p', 'hpro', 'npv', 'pair_ids', 'lam']
+    path_1    = str(tmp_path / "Shards_1") + "/"
+    path_2    = str(tmp_path / "Shards_2") + "/"
+    manifest  = run_mixup_materializer(path_1, data_dict, shard_size = 10, num_procs = 1, alpha = alpha)
+    run_mixup_materializer(path_2, data_dict, shard_size = 10, num_procs = 2, alpha = alpha)
+    #
+    assert manifest['num_pairs'] == 78 and manifest['num_shards'] == 8
+    assert [info['shard_id'] for info in manifest['shards']] == list(range(8))
+    assert manifest['shards'][-1] == {'shard_id': 7, 'start': 70, 'stop': 78}
+    with open(path_1 + "Mixup_Manifest.json", 'r') as fl_id:
+        assert json.load(fl_id) == manifest
+    for x_1, x_2 in zip(load_all_shards(path_1, names), load_all_shards(path_2, names)):
+        np.testing.assert_array_equal(x_1, x_2)
+
+def test_materializer_mixup_values(tmp_path):
+
+    data_dict = get_mixup_data_dict()
+    path_sh   = str(tmp_path / "Shards") + "/"
+    run_mixup_materializer(path_sh, data_dict, shard_size = 32, alpha = 1.0)
+    p_lam, npv_lam, pair_ids, lam = load_all_shards(path_sh, ['p', 'npv', 'pair_ids', 'lam'])
+    #
+    np.testing.assert_array_equal(pair_ids, get_all_unique_pairs(13, 2))
+    np.testing.assert_allclose(p_lam, lam[:,None] * data_dict['p'][pair_ids[:,0]] + \
+                                (1.0 - lam[:,None]) * data_dict['p'][pair_ids[:,1]])
+    np.testing.assert_allclose(npv_lam, lam * data_dict['npv'][pair_ids[:,0]] + \
+                                (1.0 - lam) * data_dict['npv'][pair_ids[:,1]])
+
+def test_materializer_keeps_existing_shards(tmp_path):
+
+    data_dict = get_mixup_data_dict()
+    path_sh   = str(tmp_path / "Shards") + "/"
+    run_mixup_materializer(path_sh, data_dict, shard_size = 10)
+    fl_name   = get_shard_name(path_sh, 'p', 3)
+    mtime     = os.path.getmtime(fl_name)
+    os.remove(get_shard_name(path_sh, 'npv', 5))
+    run_mixup_materializer(path_sh, data_dict, shard_size = 10) #Resume --> only shard 5
+    #
+    assert os.path.getmtime(fl_name) == mtime
+    assert os.path.exists(get_shard_name(path_sh, 'npv', 5))
+
+def test_materializer_regenerates_other_params(tmp_path):
+
+    data_dict = get_mixup_data_dict()
+    path_sh   = str(tmp_path / "Shards") + "/"
+    path_new  = str(tmp_path / "Shards_new") + "/"
+    run_mixup_materializer(path_sh, data_dict, shard_size = 10, alpha = 0.5, seed = 1)
+    lam_old,  = load_all_shards(path_sh, ['lam'])
+    manifest  = run_mixup_materializer(path_sh, data_dict, shard_size = 10, alpha = 0.2, seed = 1)
+    run_mixup_materializer(path_new, data_dict, shard_size = 10, alpha = 0.2, seed = 1)
+    lam_sh,   = load_all_shards(path_sh, ['lam'])
+    lam_new,  = load_all_shards(path_new, ['lam'])
+    #
+    assert manifest['alpha'] == 0.2 and manifest['seed'] == 1
+    assert not np.array_equal(lam_sh, lam_old)
+    np.testing.assert_array_equal(lam_sh, lam_new)
+    run_mixup_materializer(path_sh, data_dict, shard_size = 10) #alpha = None --> lam = 0.5
+    np.testing.assert_array_equal(load_all_shards(path_sh, ['lam'])[0], np.full(78, 0.5))
+
+def test_stream_shards_in_batches(tmp_path):
+
+    data_dict  = get_mixup_data_dict()
+    path_sh    = str(tmp_path / "Shards") + "/"
+    run_mixup_materializer(path_sh, data_dict, shard_size = 10)
+    p_all,     = load_all_shards(path_sh, ['p'])
+    batch_list = [x_list[0] for x_list in iter_mixup_shards(path_sh, ['p'], batch_size = 4)]
+    shuf_list  = [x_list[0] for x_list in iter_mixup_shards(path_sh, ['p'], batch_size = 4, \
+                                                                shuffle = True)]
+    #
+    assert max(len(x_p) for x_p in batch_list) == 4
+    np.testing.assert_array_equal(np.concatenate(batch_list), p_all)
+    x_shuf = np.concatenate(shuf_list)
+    assert x_shuf.shape == p_all.shape
+    np.testing.assert_array_equal(np.sort(x_shuf, axis = 0), np.sort(p_all, axis = 0))
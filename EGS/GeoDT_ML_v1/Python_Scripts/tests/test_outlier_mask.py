@@ -0,0 +1,38 @@
+# Tests of get_outlier_mask.py (non-outlier masks of the splits)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+import pytest
+
+from get_outlier_mask import get_outlier_mask, get_mask_name, save_outlier_mask, load_outlier_mask
+
+def test_mask_same_as_neglect_loop():
+
+    rng        = np.random.default_rng(0)
+    q_data     = rng.normal(size = (500, 1)) - 0.5
+    neglect    = [i for i in range(0,q_data.shape[0]) if q_data[i,0] <= -1.0] #Old per-row loop
+    mask       = get_outlier_mask(q_data)
+    #
+    assert mask.shape == (500,) and mask.dtype == bool
+    assert list(np.where(~mask)[0]) == neglect
+    np.testing.assert_array_equal(q_data[mask], np.delete(q_data, neglect, axis = 0)) #Row order kept
+
+def test_mask_all_outputs():
+
+    q_data = np.array([[0.0, 0.0], [0.0, -2.0], [-1.0, 5.0], [3.0, 1.0]])
+    #
+    assert list(get_outlier_mask(q_data)) == [True, False, False, True] #-1 itself is an outlier
+
+def test_mask_file_roundtrip(tmp_path):
+
+    path_ind = str(tmp_path) + "/"
+    mask     = np.array([True, False, True])
+    save_outlier_mask(path_ind, 'train', 'ss', 'npv_', 3, mask)
+    #
+    assert get_mask_name(path_ind, 'train', 'ss', 'npv_', 3).endswith("Train_Mask_ss_npv_3.npy")
+    np.testing.assert_array_equal(load_outlier_mask(path_ind, 'train', 'ss', 'npv_', 3), mask)
+    np.testing.assert_array_equal(load_outlier_mask(path_ind, 'val', 'ss', 'npv_', 2, \
+                                    np.array([[0.5], [-3.0]])), [True, False]) #Computed in memory
+    with pytest.raises(FileNotFoundError):
+        load_outlier_mask(path_ind, 'test', 'ss', 'npv_', 2)
@@ -0,0 +1,65 @@
+# Tests of get_plot_renderer.py (deferred plotting of top-k models)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import numpy as np
+
+from get_sweep_manifest import save_model_status
+from get_plot_renderer import save_diagnostics, render_model_plots, get_top_k_model_ids, \
+                                run_renderer
+
+#===================================================;
+#  Function-1: Diagnostics of a model (train/test)  ;
+#===================================================;
+def save_test_diagnostics(path_fl_sav, splits = ('train', 'test')):
+
+    os.makedirs(path_fl_sav, exist_ok = True)
+    rng        = np.random.default_rng(0)
+    split_dict = {split: (rng.random((6, 1)), rng.random((6, 1)), rng.random((6, 1)), \
+                            rng.random((6, 1))) for split in splits}
+    save_diagnostics(path_fl_sav, [1.0, 0.5, 0.25], [1.2, 0.6, 0.4], split_dict)
+
+    return split_dict
+
+def test_diagnostics_float32_arrays(tmp_path):
+
+    path_fl_sav = str(tmp_path) + "/1_model/"
+    split_dict  = save_test_diagnostics(path_fl_sav)
+    #
+    assert os.listdir(path_fl_sav) == ['Diagnostics.npz'] #No tmp files left
+    with np.load(path_fl_sav + "Diagnostics.npz") as data:
+        assert sorted(data.files) == sorted(['loss', 'val_loss'] + [name + split \
+                    for split in ['train', 'test'] for name in ['q_', 'pred_q_', 'q_it_', 'pred_q_it_']])
+        assert all(data[name].dtype == np.float32 for name in data.files)
+        np.testing.assert_allclose(data['pred_q_it_test'], split_dict['test'][3], rtol = 1e-6)
+
+def test_render_model_plots(tmp_path):
+
+    path_fl_sav = str(tmp_path) + "/1_model/"
+    save_test_diagnostics(path_fl_sav)
+    #
+    assert render_model_plots(path_fl_sav) == 5
+    assert sorted(f for f in os.listdir(path_fl_sav) if f.endswith('.png')) == \
+            ['IT_test_0.png', 'IT_train_0.png', 'Loss.png', 'Q_test_0.png', 'Q_train_0.png']
+    assert render_model_plots(str(tmp_path) + "/2_model/") == 0 #Not trained
+
+def test_top_k_model_ids(tmp_path):
+
+    path_manifest = str(tmp_path) + "/Manifest/"
+    for model_id, min_val_loss in [(1, 0.3), (2, 0.1), (3, float('nan')), (4, 0.3), (5, 0.05)]:
+        save_model_status(path_manifest, model_id, 'done', min_val_loss = min_val_loss)
+    save_model_status(path_manifest, 6, 'failed')
+    save_model_status(path_manifest, 7, 'running')
+    #
+    assert get_top_k_model_ids(path_manifest, 3) == [5, 2, 1]
+    assert get_top_k_model_ids(path_manifest, 10) == [5, 2, 1, 4] #Diverged/unfinished not ranked
+
+def test_run_renderer_pool(tmp_path):
+
+    path_models = str(tmp_path) + "/"
+    for model_id in [1, 2, 3]:
+        save_test_diagnostics(path_models + str(model_id) + "_model/", splits = ('val',))
+    #
+    assert run_renderer(path_models, [1, 2, 3, 4], num_procs = 2) == [3, 3, 3, 0]
+    assert os.path.exists(path_models + "3_model/IT_val_0.png")
@@ -0,0 +1,103 @@
+# Tests of get_results_store.py (SQLite results store)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import multiprocessing
+import numpy as np
+import pytest
+
+from get_results_store import save_model_result, get_r2_score, get_top_k_results, \
+                                get_hp_aggregates, get_query_rows
+
+#===========================================;
+#  Function-1: hp dict of a model (get_hp)  ;
+#===========================================;
+def get_test_hp(batch_size = 32, epochs = 100):
+
+    return {'num_layers': 2, 'neurons': [50, 20], 'dropout_value': 0.1, 'alpha_value': 0.2, \
+            'lr_values': 1e-3, 'epochs': epochs, 'batch_size': batch_size}
+
+#===============================================;
+#  Function-2: Write records from a subprocess  ;
+#===============================================;
+def save_worker_results(args):
+
+    fl_db, model_ids = args
+    for model_id in model_ids:
+        save_model_result(fl_db, model_id, get_test_hp(), 0.1 * model_id, 3, \
+                            {'train': 0.9, 'val': 0.8, 'test': 0.7})
+
+def test_record_roundtrip(tmp_path):
+
+    fl_db = str(tmp_path / "Results.db")
+    save_model_result(fl_db, 7, get_test_hp(), np.float32(0.25), np.int64(12), \
+                        {'train': 0.9, 'val': 0.8, 'test': 0.7}, 1.5, 2.0)
+    row = get_query_rows(fl_db, "SELECT * FROM results")[0]
+    #
+    assert row['model_id'] == 7 and row['neurons'] == "50-20"
+    assert row['min_val_loss'] == pytest.approx(0.25) and row['min_epoch'] == 12
+    assert row['test_r2'] == 0.7 and row['total_time'] == 2.0
+
+@pytest.mark.parametrize("min_val_loss, min_epoch", [(np.nan, np.nan), (None, None), \
+                                                    (float('nan'), None)])
+def test_diverged_model_recorded(tmp_path, min_val_loss, min_epoch):
+
+    fl_db = str(tmp_path / "Results.db")
+    save_model_result(fl_db, 1, get_test_hp(), min_val_loss, min_epoch, \
+                        {'train': np.nan, 'val': np.nan, 'test': np.nan}, 1.0, 1.0)
+    row = get_query_rows(fl_db, "SELECT * FROM results")[0]
+    #
+    assert row['min_val_loss'] is None and row['min_epoch'] is None and row['test_r2'] is None
+
+def test_rerun_replaces_record(tmp_path):
+
+    fl_db = str(tmp_path / "Results.db")
+    save_model_result(fl_db, 3, get_test_hp(), 0.5, 1, {})
+    save_model_result(fl_db, 3, get_test_hp(), 0.4, 2, {})
+    rows  = get_query_rows(fl_db, "SELECT model_id, min_val_loss FROM results")
+    #
+    assert rows == [{'model_id': 3, 'min_val_loss': 0.4}]
+
+def test_top_k_diverged_last(tmp_path):
+
+    fl_db = str(tmp_path / "Results.db")
+    save_model_result(fl_db, 1, get_test_hp(batch_size = 32), np.nan, np.nan, {})
+    save_model_result(fl_db, 2, get_test_hp(batch_size = 32), 0.3, 4, {})
+    save_model_result(fl_db, 3, get_test_hp(batch_size = 64), 0.1, 9, {})
+    #
+    assert [row['model_id'] for row in get_top_k_results(fl_db, 3)] == [3, 2, 1]
+    assert [row['model_id'] for row in get_top_k_results(fl_db, 1, "batch_size = 32")] == [2]
+
+def test_hp_aggregates(tmp_path):
+
+    fl_db = str(tmp_path / "Results.db")
+    for model_id, batch_size, min_val_loss in [(1, 32, 0.2), (2, 32, 0.4), (3, 64, 0.1)]:
+        save_model_result(fl_db, model_id, get_test_hp(batch_size = batch_size), min_val_loss, 0, \
+                            {'test': 0.5}, 1.0, 2.0)
+    agg_list = get_hp_aggregates(fl_db, 'batch_size')
+    #
+    assert [row['batch_size'] for row in agg_list] == [32, 64]
+    assert agg_list[0]['num_models'] == 2
+    assert agg_list[0]['mean_val_loss'] == pytest.approx(0.3)
+    with pytest.raises(ValueError):
+        get_hp_aggregates(fl_db, 'model_id; DROP TABLE results')
+
+def test_concurrent_writers(tmp_path):
+
+    fl_db     = str(tmp_path / "Results.db")
+    task_list = [(fl_db, list(range(i * 50, (i + 1) * 50))) for i in range(0,4)]
+    with multiprocessing.get_context('spawn').Pool(4) as pool:
+        pool.map(save_worker_results, task_list)
+    #
+    assert get_query_rows(fl_db, "SELECT COUNT(*) AS n FROM results")[0]['n'] == 200
+
+def test_r2_score():
+
+    rng    = np.random.default_rng(0)
+    y_true = rng.normal(size = (40, 1))
+    y_pred = y_true + 0.1 * rng.normal(size = (40, 1))
+    ss_res = np.sum((y_true - y_pred)**2)
+    ss_tot = np.sum((y_true - y_true.mean())**2)
+    #
+    assert get_r2_score(y_true, y_pred) == pytest.approx(1.0 - ss_res / ss_tot)
+    assert np.isnan(get_r2_score(np.ones(5), np.zeros(5))) #Constant ground truth
@@ -0,0 +1,47 @@
+# Tests of the DNN sweep runners (get_dnn_results_*.py); import only
+#   Training functions are called from pool workers, MPI ranks, and the plot
+#   renderer, so every global name they read must exist after an import
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import ast
+import builtins
+import importlib
+import pytest
+
+RUNNER_LIST = ['get_dnn_results_mpi4py', 'get_dnn_results_nodataug_mac', 'get_dnn_results_nodataug_pl', \
+                'get_dnn_results_nodataug_th', 'get_dnn_results_nodataug_we']
+
+#================================================================;
+#  Function-1: Global names read by the functions of a module    ;
+#              ({function name: set of names}; locals excluded)  ;
+#================================================================;
+def get_global_loads(fl_name):
+
+    with open(fl_name, 'r') as fl_id:
+        tree = ast.parse(fl_id.read())
+    global_loads = {}
+    #
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        local_names = {arg.arg for arg in ast.walk(node) if isinstance(arg, ast.arg)}
+        local_names.update(name.id for name in ast.walk(node) \
+                            if isinstance(name, ast.Name) and not isinstance(name.ctx, ast.Load))
+        global_loads[node.name] = {name.id for name in ast.walk(node) \
+                                    if isinstance(name, ast.Name) and isinstance(name.ctx, ast.Load) \
+                                    and name.id not in local_names and not hasattr(builtins, name.id)}
+
+    return global_loads
+
+@pytest.mark.parametrize("runner", RUNNER_LIST)
+def test_runner_globals_defined_on_import(runner):
+
+    if runner.endswith('mpi4py'):
+        pytest.importorskip('mpi4py')
+    module = importlib.import_module(runner)
+    #
+    assert module.plot_mode in ['deferred', 'now']
+    for function_name, names in get_global_loads(module.__file__).items():
+        missing = [name for name in names if not hasattr(module, name)]
+        assert missing == [], function_name
@@ -0,0 +1,144 @@
+# Tests of get_sensitivity.py (F-test and mutual information, parallel engine)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+import pytest
+from sklearn.feature_selection import f_regression, mutual_info_regression
+
+from get_sensitivity import get_f_regression, get_f_regression_multi, check_f_regression, \
+                            get_ftest_mi_parallel, get_radius_counts, get_mi_shared, \
+                            get_stratified_subsample, get_ftest_mi_subsampled, get_mi_subsampled
+
+#==============================================================;
+#  Function-1: Inputs and outputs (one constant input column)  ;
+#==============================================================;
+def get_test_data(num_realz = 200, num_params = 6, num_ts = 5, seed = 0):
+
+    rng     = np.random.default_rng(seed)
+    X       = rng.normal(size = (num_realz, num_params))
+    X[:,0]  = 1.0 #Constant --> F = 0, p = 1
+    Y       = X[:,1:2] * np.linspace(0.5, 2.0, num_ts) + rng.normal(size = (num_realz, num_ts))
+
+    return X, Y
+
+def test_f_regression_same_as_sklearn():
+
+    X, Y = get_test_data()
+    f_values, p_values = get_f_regression(X, Y)
+    #
+    assert f_values.shape == (6, 5) and p_values.shape == (6, 5)
+    assert check_f_regression(X, Y)
+    assert np.all(f_values[0,:] == 0.0) and np.all(p_values[0,:] == 1.0)
+
+def test_f_regression_single_output():
+
+    X, Y = get_test_data(num_ts = 1)
+    f_values, p_values = get_f_regression(X, Y[:,0]) #(num_realz,) target, as in get_ftest_mi_npv.py
+    f_sk, p_sk         = f_regression(X, Y[:,0])
+    #
+    np.testing.assert_allclose(f_values[:,0], f_sk, rtol = 1e-6)
+    np.testing.assert_allclose(p_values[:,0], p_sk, rtol = 1e-6, atol = 1e-12)
+
+def test_f_regression_multi_split():
+
+    X, Y     = get_test_data(num_ts = 7)
+    sens     = get_f_regression_multi(X, {'hpro': Y[:,0:3], 'pout': Y[:,3:7]})
+    f_values, p_values = get_f_regression(X, Y)
+    #
+    assert list(sens.keys()) == ['hpro', 'pout']
+    np.testing.assert_array_equal(sens['hpro'][0], f_values[:,0:3])
+    np.testing.assert_array_equal(sens['pout'][1], p_values[:,3:7])
+
+#=========================================================;
+#  Function-2: F-test and MI at each time-step (serial)   ;
+#              (loop of the old get_ftest_mi_others.py)   ;
+#=========================================================;
+def get_ftest_mi_values(num_params, num_ts, X, y):
+
+    f_test_arr = np.zeros((num_params,num_ts), dtype = float)
+    mi_arr     = np.zeros((num_params,num_ts), dtype = float)
+    for i in range(1,num_ts):
+        f_test_arr[:,i], _ = f_regression(X, y[:,i])
+        mi_arr[:,i]        = mutual_info_regression(X, y[:,i], n_neighbors = 3, random_state = 0)
+
+    return f_test_arr, mi_arr
+
+def test_ftest_mi_parallel_same_as_serial_loop():
+
+    X, Y      = get_test_data(num_realz = 120, num_ts = 7, seed = 1)
+    y_dict    = {'hpro': Y[:,0:4], 'pout': Y[:,4:7] ** 2}
+    sens_dict = get_ftest_mi_parallel(X, y_dict, n_jobs = 2)
+    #
+    assert list(sens_dict.keys()) == ['hpro', 'pout']
+    for name, y in y_dict.items():
+        f_test_arr, mi_arr = get_ftest_mi_values(X.shape[1], y.shape[1], X, y)
+        assert sens_dict[name][0].shape == (6, y.shape[1])
+        assert np.all(sens_dict[name][0][:,0] == 0.0) and np.all(sens_dict[name][1][:,0] == 0.0)
+        np.testing.assert_allclose(sens_dict[name][0], f_test_arr, rtol = 1e-6)
+        np.testing.assert_allclose(sens_dict[name][1], mi_arr, rtol = 1e-6, atol = 1e-12)
+
+def test_radius_counts_same_as_brute_force():
+
+    rng      = np.random.default_rng(3)
+    x        = np.round(rng.normal(size = 300), 1) #Ties at distance == radius
+    radius   = np.abs(np.round(rng.normal(size = 300), 1))
+    counts   = get_radius_counts(np.sort(x), x, radius)
+    #
+    np.testing.assert_array_equal(counts, np.sum(np.abs(x[None,:] - x[:,None]) <= radius[:,None], axis = 1))
+
+@pytest.mark.parametrize("random_state", [0, 5])
+def test_mi_shared_same_as_sklearn(random_state):
+
+    X, Y  = get_test_data(num_realz = 150, num_ts = 4, seed = 2)
+    Y     = np.column_stack([Y, np.sin(3.0 * X[:,2])]) #Non-linear target
+    mi    = get_mi_shared(X, Y, n_neighbors = 3, random_state = random_state, n_jobs = 1)
+    #
+    assert mi.shape == (6, 5)
+    for i in range(0,Y.shape[1]):
+        mi_sk = mutual_info_regression(X, Y[:,i], n_neighbors = 3, random_state = random_state)
+        np.testing.assert_allclose(mi[:,i], mi_sk, rtol = 1e-8, atol = 1e-12)
+    assert np.argmax(mi[:,4]) == 2
+
+def test_stratified_subsample():
+
+    y_strat = np.random.default_rng(4).exponential(size = 1000)
+    ids     = get_stratified_subsample(y_strat, 200, np.random.default_rng(0))
+    edges   = np.quantile(y_strat, np.linspace(0, 1, 11)[1:-1])
+    #
+    assert len(ids) == 200 and len(np.unique(ids)) == 200
+    assert np.all(np.diff(ids) > 0)
+    np.testing.assert_array_equal(np.bincount(np.searchsorted(edges, y_strat[ids], side = 'right')), \
+                                    np.full(10, 20))
+    np.testing.assert_array_equal(ids, get_stratified_subsample(y_strat, 200, np.random.default_rng(0)))
+
+def test_ftest_mi_subsampled_bands():
+
+    X, Y   = get_test_data(num_realz = 400, num_ts = 5, seed = 5)
+    y_dict = {'hpro': Y, 'pout': -Y[:,0:3]}
+    sens_dict, band_dict = get_ftest_mi_subsampled(X, y_dict, 200, n_jobs = 2, min_replicates = 4, \
+                                                    max_replicates = 12, top_k = 3)
+    sens_full = get_ftest_mi_parallel(X, y_dict, n_jobs = 2)
+    #
+    for name, y in y_dict.items():
+        f_test_arr, mi_arr = sens_dict[name]
+        mi_lower, mi_upper = band_dict[name]
+        assert mi_arr.shape == (6, y.shape[1])
+        np.testing.assert_array_equal(f_test_arr, sens_full[name][0]) #F-test of all realz
+        assert np.all(mi_arr[:,0] == 0.0) and np.all(mi_upper[:,0] == 0.0)
+        assert np.all((mi_lower <= mi_arr + 1e-12) & (mi_arr <= mi_upper + 1e-12))
+        assert np.argmax(np.sum(mi_arr, axis = 1)) == 1 #Same top feature as the full data
+        assert np.argmax(np.sum(sens_full[name][1], axis = 1)) == 1
+
+def test_mi_subsampled_rounds_independent_of_cores():
+
+    X, Y   = get_test_data(num_realz = 300, num_ts = 3, seed = 7)
+    y_dict = {'hpro': Y}
+    band_1, num_1 = get_mi_subsampled(X, y_dict, 150, n_jobs = 1, min_replicates = 4, \
+                                        max_replicates = 64, top_k = 2)
+    band_4, num_4 = get_mi_subsampled(X, y_dict, 150, n_jobs = 4, min_replicates = 4, \
+                                        max_replicates = 64, top_k = 2)
+    #
+    assert num_1 == num_4 and num_1 % 4 == 0 and num_1 < 64 #Stops early (stable ranks)
+    for x_1, x_4 in zip(band_1['hpro'], band_4['hpro']):
+        np.testing.assert_array_equal(x_1, x_4)
@@ -0,0 +1,57 @@
+# Tests of get_split_views.py (memory-mapped train/val/test views)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+
+from get_split_views import get_split_order, get_split_slices, get_split_indices, \
+                            save_split_array, load_split_views, get_split_batches
+
+#====================================================================;
+#  Function-1: Split index files (Total_Realz = train + val + test)  ;
+#====================================================================;
+def save_test_indices(path_ind, num_realz, seed = 0):
+
+    realz_list = np.random.default_rng(seed).permutation(num_realz) + 1 #Realz ids start at 1
+    np.savetxt(path_ind + "Total_Realz_" + str(num_realz) + ".txt", realz_list, fmt = '%d', \
+                header = 'realz', comments = '')
+
+    return realz_list
+
+def test_split_order_persisted(tmp_path):
+
+    path_ind   = str(tmp_path) + "/"
+    realz_list = save_test_indices(path_ind, 10)
+    #
+    np.testing.assert_array_equal(get_split_order(path_ind, 10), realz_list - 1)
+    assert (tmp_path / "Split_Order_10.npy").exists()
+    indices = get_split_indices(path_ind, 10, 6, 2, 2)
+    np.testing.assert_array_equal(indices['val'], realz_list[6:8] - 1)
+
+def test_split_slices_prefix_train():
+
+    split_slices = get_split_slices(10, 4, 2, 2) #Smaller train set --> prefix of the 80% split
+    #
+    assert split_slices['train'] == slice(0, 4)
+    assert split_slices['val'] == slice(6, 8) and split_slices['test'] == slice(8, 10)
+
+def test_split_views_same_as_gather(tmp_path):
+
+    path_ind    = str(tmp_path) + "/"
+    realz_list  = save_test_indices(path_ind, 10)
+    x_data      = np.arange(0,30, dtype = float).reshape(10, 3)
+    fl_name     = path_ind + "ss_p_10.npy"
+    save_split_array(fl_name, x_data, get_split_order(path_ind, 10))
+    views       = load_split_views(fl_name, 10, 6, 2, 2)
+    #
+    assert isinstance(views['train'], np.memmap)
+    for name, rows in [('train', realz_list[0:6]), ('val', realz_list[6:8]), ('test', realz_list[8:10])]:
+        np.testing.assert_array_equal(views[name], x_data[rows - 1,:]) #Old *_Realz_*.txt gather
+
+def test_split_batches():
+
+    x_data  = np.arange(0,20).reshape(10, 2)
+    batches = list(get_split_batches(x_data, np.array([9, 0, 3, 4, 5]), 2))
+    #
+    assert [batch.shape[0] for batch in batches] == [2, 2, 1]
+    np.testing.assert_array_equal(np.concatenate(batches), x_data[[9, 0, 3, 4, 5]])
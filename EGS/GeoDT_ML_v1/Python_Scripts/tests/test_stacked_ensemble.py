@@ -0,0 +1,93 @@
+# Tests of get_stacked_ensemble.py (many small DNNs in one graph)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+import tensorflow as tf
+
+from get_hp_inputs import save_hp_table
+from get_stacked_ensemble import get_model_groups, get_stacked_weights, get_stacked_forward, \
+                                    train_stacked_ensemble, predict_stacked_ensemble
+
+#=====================================================;
+#  Function-1: Small regression data (train and val)  ;
+#=====================================================;
+def get_test_data(num_realz = 64, num_params = 6, seed = 0):
+
+    rng = np.random.default_rng(seed)
+    p   = rng.normal(size = (num_realz, num_params)).astype(np.float32)
+    q   = (p @ rng.normal(size = (num_params, 1)) / num_params).astype(np.float32)
+
+    return p[0:48], q[0:48], p[48:], q[48:]
+
+#===============================================================;
+#  Function-2: hp dicts of a group (same neurons/batch/epochs)  ;
+#===============================================================;
+def get_test_hp_list(lr_list, alpha_list, dropout_list, neurons = [8, 4], epochs = 2, batch_size = 16):
+
+    return [{'num_layers': len(neurons), 'neurons': neurons, 'lr_values': lr, 'alpha_value': alpha, \
+             'dropout_value': dropout, 'epochs': epochs, 'batch_size': batch_size} \
+            for lr, alpha, dropout in zip(lr_list, alpha_list, dropout_list)]
+
+def test_model_groups(tmp_path):
+
+    hp_table = save_hp_table(str(tmp_path) + "/HP_Table.npy", \
+                    [[1, 1, 50, 0.0, 0.1, 1e-3, 100, 32], [2, 1, 50, 0.1, 0.2, 1e-4, 100, 32], \
+                     [3, 1, 50, 0.0, 0.1, 1e-3, 100, 64], [4, 2, [50, 20], 0.0, 0.1, 1e-3, 100, 32], \
+                     [5, 1, 50, 0.2, 0.0, 1e-2, 100, 32]])
+    #
+    assert get_model_groups(hp_table, [1, 2, 3, 4, 5]) == [[1, 2, 5], [3], [4]]
+    assert get_model_groups(hp_table, [1, 2, 3, 4, 5], max_models = 2) == [[1, 2], [5], [3], [4]]
+
+def test_forward_same_as_dense_layers():
+
+    rng     = np.random.default_rng(0)
+    weights = get_stacked_weights([6, 8, 4, 1], 3, rng)
+    alpha   = tf.constant(np.array([0.0, 0.1, 0.3], dtype = np.float32).reshape(-1,1,1))
+    x       = rng.normal(size = (5, 6)).astype(np.float32)
+    pred    = get_stacked_forward(tf.constant(x), weights, alpha, None).numpy()
+    #
+    assert pred.shape == (3, 5, 1)
+    for m, alpha_m in enumerate([0.0, 0.1, 0.3]):
+        h = x
+        for i in range(0,3):
+            h = h @ weights[2*i].numpy()[m] + weights[2*i+1].numpy()[m]
+            h = np.where(h > 0, h, alpha_m * h) if i < 2 else h #LeakyReLU (hidden layers)
+        np.testing.assert_allclose(pred[m], h, rtol = 1e-5, atol = 1e-6)
+
+def test_training_same_as_keras_adam():
+
+    #--------------------------------------------------------------;
+    #  One model, no dropout: same initial weights and batches     ;
+    #  as the ensemble (same rng stream) --> same losses as Keras  ;
+    #--------------------------------------------------------------;
+    train_p, train_q, val_p, val_q = get_test_data()
+    hp_list  = get_test_hp_list([1e-2], [0.1], [0.0])
+    ensemble = train_stacked_ensemble(train_p, train_q, val_p, val_q, hp_list, 7, verbose = 0)
+    #
+    rng      = np.random.default_rng(7)
+    weights  = [w.numpy()[0] for w in get_stacked_weights([6, 8, 4, 1], 1, rng)]
+    model    = tf.keras.Sequential([tf.keras.Input(shape = (6,)), tf.keras.layers.Dense(8), \
+                    tf.keras.layers.LeakyReLU(negative_slope = 0.1), tf.keras.layers.Dense(4), \
+                    tf.keras.layers.LeakyReLU(negative_slope = 0.1), tf.keras.layers.Dense(1)])
+    model.set_weights([w.reshape(-1) if w.shape[0] == 1 else w for w in weights])
+    model.compile(tf.keras.optimizers.Adam(learning_rate = 1e-2), loss = "mse")
+    for epoch in range(0,2):
+        index = rng.permutation(48)
+        for i in range(0,48,16):
+            model.train_on_batch(train_p[index[i:i+16]], train_q[index[i:i+16]])
+        val_loss = model.evaluate(val_p, val_q, verbose = 0)
+        np.testing.assert_allclose(ensemble['val_loss'][epoch,0], val_loss, rtol = 1e-4)
+    np.testing.assert_allclose(predict_stacked_ensemble(ensemble, val_p)[0], \
+                                model.predict(val_p, verbose = 0), rtol = 1e-4, atol = 1e-6)
+
+def test_models_are_independent():
+
+    train_p, train_q, val_p, val_q = get_test_data()
+    hp_list  = get_test_hp_list([0.0, 1e-2, 1e-2], [0.1, 0.1, 0.2], [0.0, 0.0, 0.3], epochs = 5)
+    ensemble = train_stacked_ensemble(train_p, train_q, val_p, val_q, hp_list, 3, verbose = 0)
+    #
+    assert ensemble['loss'].shape == (5, 3) and ensemble['val_loss'].shape == (5, 3)
+    assert np.all(ensemble['val_loss'][:,0] == ensemble['val_loss'][0,0]) #lr = 0 --> no updates
+    assert ensemble['val_loss'][-1,1] < ensemble['val_loss'][0,1]
+    assert predict_stacked_ensemble(ensemble, val_p, batch_size = 5).shape == (3, 16, 1)
@@ -0,0 +1,89 @@
+# Tests of get_sweep_halving.py (successive halving and Hyperband)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+
+from get_sweep_halving import get_rung_epochs, get_promoted_ids, get_rung_tasks, \
+                                run_successive_halving, get_hyperband_brackets, get_rung_result
+
+#===================================================================;
+#  Function-1: Fake map_function (min val loss = 1/(id x epochs);   ;
+#              dispatched tasks are recorded in task_log)           ;
+#===================================================================;
+def get_fake_map(task_log, failed_ids = ()):
+
+    def map_function(task_list):
+        task_log.append(list(task_list))
+        return [None if k in failed_ids else 1.0 / (k * e) for k, e in task_list]
+
+    return map_function
+
+def test_rung_epochs():
+
+    assert get_rung_epochs(20, 500, 3) == [20, 60, 180, 500]
+    assert get_rung_epochs(20, 540, 3) == [20, 60, 180, 540]
+    assert get_rung_epochs(50, 50, 3) == [50]
+
+def test_promoted_ids_skip_failed():
+
+    model_results = {1: 0.5, 2: None, 3: np.nan, 4: 0.1, 5: 0.1, 6: 0.9}
+    #
+    assert get_promoted_ids(model_results, 2) == [1, 4, 5] #ceil(6/2) = 3
+    assert get_promoted_ids({1: None, 2: np.nan}, 1) == []
+
+def test_rung_tasks_capped():
+
+    model_epochs = {1: 100, 2: 50, 3: 500}
+    #
+    assert get_rung_tasks([1, 2, 3], 60) == [(1, 60), (2, 60), (3, 60)]
+    assert get_rung_tasks([1, 2, 3], 60, 20, model_epochs) == [(1, 60), (2, 50), (3, 60)]
+    assert get_rung_tasks([1, 2, 3], 180, 60, model_epochs) == [(1, 100), (3, 180)] #2 is done
+
+def test_halving_never_exceeds_own_epochs():
+
+    task_log     = []
+    model_epochs = {k: (50 if k % 2 else 500) for k in range(1,10)}
+    history      = run_successive_halving(list(range(1,10)), get_fake_map(task_log), \
+                                            [20, 60, 180, 500], 1, None, model_epochs)
+    #
+    for task_list in task_log:
+        assert all(e <= model_epochs[k] for k, e in task_list)
+    assert [len(task_list) for task_list in task_log] == [9, 9, 4, 4] #Odd ids done at 50 epochs
+    assert history[-1][1] == 1.0 / 50 #Finished models keep their last result
+    assert len(history[-1]) == 9
+
+def test_halving_promotes_best():
+
+    task_log = []
+    history  = run_successive_halving(list(range(1,10)), get_fake_map(task_log, failed_ids = (9,)), \
+                                        [1, 3, 9], 3)
+    #
+    assert [sorted(k for k, e in task_list) for task_list in task_log] == [list(range(1,10)), \
+                                                                         [6, 7, 8], [8]]
+    assert history[0][9] is None
+
+def test_halving_resumes_from_manifest(tmp_path):
+
+    path_manifest = str(tmp_path) + "/Halving/"
+    run_successive_halving(list(range(1,7)), get_fake_map([]), [1, 3], 2, path_manifest)
+    task_log      = []
+    history       = run_successive_halving(list(range(1,7)), get_fake_map(task_log), \
+                                            [1, 3], 2, path_manifest)
+    #
+    assert task_log == [] #All rungs done
+    assert sorted(history[1].keys()) == [4, 5, 6]
+
+def test_hyperband_brackets_partition():
+
+    brackets = get_hyperband_brackets(list(range(1,101)), 20, 500, 3, seed = 0)
+    all_ids  = [k for bracket_ids, rung_epochs in brackets for k in bracket_ids]
+    #
+    assert sorted(all_ids) == list(range(1,101))
+    assert [rung_epochs[0] for bracket_ids, rung_epochs in brackets] == [20, 56, 167, 500]
+    assert all(rung_epochs[-1] == 500 for bracket_ids, rung_epochs in brackets)
+
+def test_rung_result_failure():
+
+    assert get_rung_result(lambda x: x * 2, 3) == 6
+    assert get_rung_result(lambda x: 1 / x, 0) is None
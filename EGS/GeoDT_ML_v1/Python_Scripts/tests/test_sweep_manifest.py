@@ -0,0 +1,50 @@
+# Tests of get_sweep_manifest.py (completion manifest)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import json
+import numpy as np
+
+from get_sweep_manifest import save_model_status, get_model_status, get_unfinished_model_ids, \
+                                run_with_manifest, get_model_results, run_group_with_manifest
+
+def test_status_replaces_older_records(tmp_path):
+
+    path_manifest = str(tmp_path) + "/Manifest/"
+    save_model_status(path_manifest, 1, 'running')
+    save_model_status(path_manifest, 1, 'done', min_val_loss = 0.5)
+    save_model_status(path_manifest, 2, 'failed', error = 'Traceback')
+    #
+    assert sorted(p.name for p in (tmp_path / "Manifest").iterdir()) == ['1_done.json', '2_failed.json']
+    assert get_model_status(path_manifest) == {1: 'done', 2: 'failed'}
+    assert get_model_status(str(tmp_path) + "/Missing/") == {}
+
+def test_unfinished_ids_skip_done(tmp_path):
+
+    path_manifest = str(tmp_path) + "/"
+    save_model_status(path_manifest, 2, 'done', min_val_loss = 0.1)
+    save_model_status(path_manifest, 3, 'failed')
+    save_model_status(path_manifest, 4, 'running') #Preempted
+    #
+    assert get_unfinished_model_ids(path_manifest, [1, 2, 3, 4]) == [1, 3, 4]
+
+def test_run_with_manifest(tmp_path):
+
+    path_manifest = str(tmp_path) + "/"
+    #
+    assert run_with_manifest(path_manifest, 1, lambda: 0.25) == 0.25
+    assert run_with_manifest(path_manifest, 2, lambda: 1 / 0) is None #Sweep goes on
+    assert np.isnan(run_with_manifest(path_manifest, 3, lambda: float('nan'))) #Diverged model is done
+    assert get_model_status(path_manifest) == {1: 'done', 2: 'failed', 3: 'done'}
+    with open(path_manifest + "2_failed.json", 'r') as fl_id:
+        assert 'ZeroDivisionError' in json.load(fl_id)['error']
+    model_results = get_model_results(path_manifest)
+    assert model_results[1] == 0.25 and np.isnan(model_results[3])
+
+def test_run_group_with_manifest(tmp_path):
+
+    path_manifest = str(tmp_path) + "/"
+    #
+    assert run_group_with_manifest(path_manifest, [1, 2], lambda: [0.1, 0.2]) == [0.1, 0.2]
+    assert run_group_with_manifest(path_manifest, [3, 4], lambda: 1 / 0) == [None, None]
+    assert get_model_status(path_manifest) == {1: 'done', 2: 'done', 3: 'failed', 4: 'failed'}
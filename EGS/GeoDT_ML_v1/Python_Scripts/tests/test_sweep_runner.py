@@ -0,0 +1,87 @@
+# Tests of get_sweep_runner.py (shared sweep logic of the runners)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+
+from get_hp_inputs import save_hp_table
+from get_sweep_manifest import get_unfinished_model_ids, save_model_status
+from get_sweep_runner import get_sweep_config, get_sweep_model_ids, run_pool_sweep
+
+HP_LIST = [[1, 1, [8], 0.0, 0.1, 1e-3, 9, 4], \
+           [2, 1, [8], 0.0, 0.1, 1e-3, 9, 4], \
+           [3, 1, [8], 0.0, 0.1, 1e-3, 9, 4]]
+
+#=============================================================;
+#  Function-1: Train function of a pool worker (no training)  ;
+#              (model 2 fails; loss drops with rung epochs)   ;
+#=============================================================;
+def get_fake_loss(args_inp_list):
+
+    random_seed, counter = args_inp_list[0:2]
+    num_epochs           = args_inp_list[2] if len(args_inp_list) > 2 else 9
+    if counter == 2 and len(args_inp_list) == 2:
+        raise ValueError("diverged")
+
+    return counter / float(num_epochs)
+
+#==============================================================;
+#  Function-2: Train function that returns the worker threads  ;
+#==============================================================;
+def get_worker_threads(args_inp_list):
+
+    return float(os.environ.get('OMP_NUM_THREADS', 0))
+
+#===========================================================;
+#  Function-3: Sweep config of the test models (pool of 2)  ;
+#===========================================================;
+def get_test_config(geodt_path, path_models, search_mode, pool_mode):
+
+    save_hp_table(path_models + "HP_Table.npy", HP_LIST)
+
+    return get_sweep_config((geodt_path, "ss", "npv_", 20, 12, 4, 4), path_models, \
+                            search_mode = search_mode, min_epochs = 1, eta = 3, \
+                            num_procs = 2, pool_mode = pool_mode, share_dataset = False)
+
+def test_sweep_config_paths(tmp_path):
+
+    sweep_cfg = get_sweep_config(["/data/", "ss", "npv_", 20, 12, 4, 4], str(tmp_path) + "/")
+    #
+    assert sweep_cfg['dataset_args'] == ("/data/", "ss", "npv_", 20, 12, 4, 4)
+    assert sweep_cfg['path_hp_table'] == str(tmp_path) + "/HP_Table.npy"
+    assert sweep_cfg['path_manifest'] == str(tmp_path) + "/Manifest/"
+    assert sweep_cfg['id_list'] is None and sweep_cfg['random_seed'] == 131
+
+def test_sweep_model_ids_skip_done(geodt_path, tmp_path):
+
+    sweep_cfg = get_test_config(geodt_path, str(tmp_path) + "/", 'grid', 'map')
+    hp_table  = save_hp_table(sweep_cfg['path_hp_table'], HP_LIST)
+    save_model_status(sweep_cfg['path_manifest'], 1, 'done', min_val_loss = 0.1)
+    #
+    assert get_sweep_model_ids(sweep_cfg, hp_table) == [2, 3]
+    sweep_cfg['search_mode'] = 'sh' #Rungs decide from the rung manifest
+    assert get_sweep_model_ids(sweep_cfg, hp_table) == [1, 2, 3]
+
+def test_grid_sweep_records_manifest(geodt_path, tmp_path):
+
+    sweep_cfg = get_test_config(geodt_path, str(tmp_path) + "/", 'grid', 'warm')
+    results   = run_pool_sweep(sweep_cfg, get_fake_loss, None)
+    #
+    assert results == [1 / 9.0, None, 3 / 9.0] #Failed model does not stop the sweep
+    assert get_unfinished_model_ids(sweep_cfg['path_manifest'], [1, 2, 3]) == [2]
+
+def test_rung_sweep_on_map_pool(geodt_path, tmp_path):
+
+    sweep_cfg = get_test_config(geodt_path, str(tmp_path) + "/", 'sh', 'map')
+    results   = run_pool_sweep(sweep_cfg, get_fake_loss, None)
+    #
+    assert results[0] == {1: 1.0, 2: 2.0, 3: 3.0}
+    assert list(results[-1].keys()) == [1] and results[-1][1] == 1 / 9.0
+    assert not os.path.exists(str(tmp_path) + "/1_model/") #No outputs of the fake train function
+
+def test_map_pool_sets_worker_threads(geodt_path, tmp_path):
+
+    sweep_cfg = get_test_config(geodt_path, str(tmp_path) + "/", 'grid', 'map')
+    sweep_cfg['num_threads'] = 2
+    #
+    assert run_pool_sweep(sweep_cfg, get_worker_threads, None) == [2.0, 2.0, 2.0]
@@ -0,0 +1,55 @@
+# Tests of get_sweep_scheduler.py (dynamic master/worker dispatch)
+#   The MPI test runs 3 ranks with mpiexec (skipped without it)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import sys
+import shutil
+import subprocess
+import pytest
+
+pytest.importorskip('mpi4py')
+from get_sweep_scheduler import get_work_order
+from get_hp_inputs import get_model_cost
+
+MPI_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from mpi4py import MPI
+from get_sweep_scheduler import run_master, run_worker, map_master
+comm = MPI.COMM_WORLD
+if comm.Get_rank() == 0:
+    rung_1 = map_master(comm, [(k, 1) for k in range(0,7)], [k for k in range(0,7)])
+    rung_2 = map_master(comm, [(k, 3) for k in [5, 6]], [1, 1]) #Same (parked) workers
+    run_master(comm, [], []) #Stop workers
+    print('RESULTS', rung_1, rung_2)
+else:
+    run_worker(comm, lambda task: task[0] * 10 + task[1])
+"""
+
+def test_work_order_largest_first():
+
+    assert get_work_order([11, 12, 13, 14], [1.0, 5.0, 5.0, 2.0]) == [12, 13, 14, 11] #Stable ties
+
+def test_model_cost():
+
+    hp_small = {'num_layers': 1, 'neurons': [10], 'epochs': 100, 'batch_size': 50}
+    hp_deep  = {'num_layers': 2, 'neurons': [10, 10, 99], 'epochs': 100, 'batch_size': 50}
+    #
+    assert get_model_cost(hp_small) == 100 / 50 * ((117 + 1) * 10 + (10 + 1) * 1)
+    assert get_model_cost(hp_deep) == 100 / 50 * ((117 + 1) * 10 + (10 + 1) * 10 + (10 + 1) * 1)
+    assert get_model_cost(dict(hp_small, batch_size = 25)) == 2 * get_model_cost(hp_small)
+
+@pytest.mark.skipif(shutil.which('mpiexec') is None, reason = 'mpiexec not found')
+def test_master_workers_mpi(tmp_path):
+
+    fl_script = tmp_path / "run_scheduler.py"
+    fl_script.write_text(MPI_SCRIPT)
+    env       = dict(os.environ, OMPI_ALLOW_RUN_AS_ROOT = '1', OMPI_ALLOW_RUN_AS_ROOT_CONFIRM = '1')
+    output    = subprocess.run(['mpiexec', '-n', '3', '--oversubscribe', sys.executable, str(fl_script), \
+                                os.path.dirname(os.path.dirname(os.path.abspath(__file__)))], \
+                                capture_output = True, text = True, timeout = 300, env = env)
+    #
+    assert output.returncode == 0, output.stderr
+    assert "RESULTS [1, 11, 21, 31, 41, 51, 61] [53, 63]" in output.stdout
@@ -0,0 +1,77 @@
+# Tests of get_train_history.py (history callback and npz files)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import numpy as np
+import pandas as pd
+
+from get_train_history import BestEpochHistory, load_history, save_history, get_best_epoch
+
+#===========================================================;
+#  Function-1: Feed (loss, val_loss) pairs to the callback  ;
+#===========================================================;
+def get_fed_callback(fl_hist, loss_list, val_loss_list, append = False):
+
+    hist_logger = BestEpochHistory(fl_hist, append = append)
+    start       = len(hist_logger.history['epoch'])
+    for i, (loss, val_loss) in enumerate(zip(loss_list, val_loss_list)):
+        hist_logger.on_epoch_end(start + i, {'loss': loss, 'val_loss': val_loss})
+    hist_logger.on_train_end()
+
+    return hist_logger
+
+def test_best_epoch_first_min(tmp_path):
+
+    hist_logger = get_fed_callback(str(tmp_path / "FwdDNNModel_Loss.npz"), [4.0, 3.0, 2.0, 1.0], [0.5, 0.2, 0.2, 0.3])
+    assert hist_logger.best_epoch == 1
+    assert hist_logger.best_val_loss == 0.2
+    assert hist_logger.best_loss == 3.0
+
+def test_nan_epochs_skipped(tmp_path):
+
+    val_loss_list = [np.nan, 0.4, np.nan, 0.1, np.inf]
+    hist_logger   = get_fed_callback(str(tmp_path / "FwdDNNModel_Loss.npz"), \
+                                        [1.0] * 5, val_loss_list)
+    #
+    assert hist_logger.best_epoch == np.nanargmin(val_loss_list)
+    assert hist_logger.best_epoch == pd.Series(val_loss_list).idxmin()
+    assert hist_logger.best_val_loss == 0.1
+
+def test_all_nan_history(tmp_path):
+
+    fl_hist     = str(tmp_path / "FwdDNNModel_Loss.npz")
+    hist_logger = get_fed_callback(fl_hist, [np.nan] * 3, [np.nan] * 3)
+    #
+    assert np.isnan(hist_logger.best_epoch) #Not None
+    assert np.isnan(hist_logger.best_val_loss) #Not inf
+    assert np.isnan(hist_logger.best_loss)
+    assert np.isnan(pd.Series([np.nan] * 3).min())
+    assert list(load_history(fl_hist)['epoch']) == [0, 1, 2]
+
+def test_append_continues_history(tmp_path):
+
+    fl_hist = str(tmp_path / "FwdDNNModel_Loss.npz")
+    get_fed_callback(fl_hist, [2.0, 1.5], [0.3, 0.25]) #Rung 1
+    hist_logger = get_fed_callback(fl_hist, [1.0, 0.5], [0.35, 0.2], append = True) #Rung 2
+    #
+    history = load_history(fl_hist)
+    assert list(history['epoch']) == [0, 1, 2, 3]
+    assert hist_logger.best_epoch == 3
+    assert hist_logger.best_val_loss == 0.2
+
+def test_save_load_roundtrip(tmp_path):
+
+    fl_hist = str(tmp_path / "FwdDNNModel_Loss.npz")
+    save_history(fl_hist, {'epoch': [0, 1], 'loss': [1.0, 0.5], 'val_loss': [np.nan, 0.7]})
+    history = load_history(fl_hist)
+    #
+    assert history['epoch'].dtype == np.int32
+    assert np.isnan(history['val_loss'][0]) and history['val_loss'][1] == 0.7
+    assert load_history(str(tmp_path / "missing.npz")) is None
+    assert [p.name for p in tmp_path.iterdir()] == ["FwdDNNModel_Loss.npz"] #No temporary files left
+
+def test_get_best_epoch():
+
+    assert get_best_epoch([0.3, np.nan, 0.1, 0.1]) == (2, 0.1)
+    best_epoch, min_val_loss = get_best_epoch(pd.Series([np.nan, np.nan]))
+    assert np.isnan(best_epoch) and np.isnan(min_val_loss) #pandas idxmin raises here
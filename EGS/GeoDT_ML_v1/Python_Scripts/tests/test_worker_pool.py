@@ -0,0 +1,75 @@
+# Tests of get_worker_pool.py (warm worker pool and calibration)
+#
+# AUTHOR: Maruti Kumar Mudunuru
+
+import os
+import time
+
+import get_worker_pool
+from get_worker_pool import get_warm_pool, run_warm_map, run_calibration
+
+_warm_pids = [] #Workers that ran the warm-up function (per process)
+
+#====================================================;
+#  Function-1: Warm-up of a worker (runs once each)  ;
+#====================================================;
+def warm_up():
+
+    _warm_pids.append(os.getpid())
+
+#=======================================================;
+#  Function-2: Task of a worker (slow for small tasks)  ;
+#=======================================================;
+def get_square(task):
+
+    time.sleep(0.02 * (3 - task % 3)) #Tasks finish out of order
+
+    return task * task, os.getpid(), len(_warm_pids), os.environ.get('OMP_NUM_THREADS')
+
+def test_warm_map_keeps_task_order():
+
+    with get_warm_pool(2, 1, warm_up) as pool:
+        results = run_warm_map(pool, get_square, list(range(0,12)))
+    #
+    assert [r[0] for r in results] == [i * i for i in range(0,12)]
+    assert len(set(r[1] for r in results)) <= 2
+    assert all(r[2] == 1 for r in results) #Warm-up once per worker, not per task
+    assert all(r[3] == '1' for r in results)
+
+def test_warm_map_empty_task_list():
+
+    with get_warm_pool(1) as pool:
+        assert run_warm_map(pool, get_square, []) == []
+
+#=============================================================;
+#  Function-3: Pool of a calibration split (no processes)     ;
+#              (tasks take longer with more threads)          ;
+#=============================================================;
+class SplitPool:
+
+    def __init__(self, num_procs, num_threads, warm_function = None, bind_cores = False):
+
+        self.num_threads = num_threads
+        self.bind_cores  = bind_cores
+
+    def close(self):
+
+        pass
+
+    def join(self):
+
+        pass
+
+def test_calibration_picks_fastest_split(monkeypatch):
+
+    def run_split_map(pool, function, task_list):
+        assert pool.bind_cores
+        time.sleep(0.05 * pool.num_threads * len(task_list))
+    #
+    monkeypatch.setattr(get_worker_pool, 'get_warm_pool', SplitPool)
+    monkeypatch.setattr(get_worker_pool, 'run_warm_map', run_split_map)
+    best_split, rates = run_calibration(get_square, [0, 1], 4, max_threads = 2)
+    #
+    assert sorted(rates.keys()) == [(2, 2), (4, 1)]
+    assert best_split == (4, 1)
+    assert rates[(4, 1)] > rates[(2, 2)]